@@ -3,16 +3,21 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 from base64 import urlsafe_b64encode, urlsafe_b64decode
 
+from common.constants import SECRET_CACHE_SIZE, SECRET_CACHE_TTL
+from common.lru import TTLCache
+
 
 class AESCipher:
     HASH_SALT = getenv("HASH_SALT")
     key = str.encode(HASH_SALT)
+    # key 검증과 backend 조회는 한 번만 하고, IV가 매번 다른 Cipher만 새로 만든다
+    algorithm = algorithms.AES(key)
+    backend = default_backend()
 
     @staticmethod
     def encrypt(plaintext):
         iv = urandom(16)
-        cipher = Cipher(algorithms.AES(AESCipher.key), modes.CFB(iv), backend=default_backend())
-        encryptor = cipher.encryptor()
+        encryptor = Cipher(AESCipher.algorithm, modes.CFB(iv), AESCipher.backend).encryptor()
         ciphertext = encryptor.update(plaintext.encode()) + encryptor.finalize()
         return urlsafe_b64encode(iv + ciphertext).decode("utf-8")
 
@@ -20,7 +25,38 @@ class AESCipher:
     def decrypt(ciphertext):
         ciphertext = urlsafe_b64decode(ciphertext.encode("utf-8"))
         iv = ciphertext[:16]
-        cipher = Cipher(algorithms.AES(AESCipher.key), modes.CFB(iv), backend=default_backend())
-        decryptor = cipher.decryptor()
+        decryptor = Cipher(AESCipher.algorithm, modes.CFB(iv), AESCipher.backend).decryptor()
         plaintext = decryptor.update(ciphertext[16:]) + decryptor.finalize()
         return plaintext.decode("utf-8")
+
+
+class SecretCache:
+    """
+    유저별로 복호화한 OTP secret을 프로세스 내부 LRU에 보관
+
+    값은 (암호문, 평문)이며 조회한 암호문이 다르면 secret이 바뀐 것이므로 다시 복호화한다
+    따라서 secret이 변경될 때 별도로 무효화하지 않아도 이전 값이 반환되지 않는다
+    """
+
+    def __init__(self, maxsize=SECRET_CACHE_SIZE, ttl=SECRET_CACHE_TTL):
+        self.secrets = TTLCache(maxsize, ttl)
+
+    def decrypt(self, user_id, ciphertext):
+        item = self.secrets.get(user_id)
+        if item is not None and item[0] == ciphertext:
+            return item[1]
+        plaintext = AESCipher.decrypt(ciphertext)
+        self.secrets.set(user_id, (ciphertext, plaintext))
+        return plaintext
+
+    def forget(self, user_id):
+        self.secrets.pop(user_id)
+
+    def clear(self):
+        self.secrets.clear()
+
+    def get_metrics(self):
+        return self.secrets.get_metrics()
+
+
+secret_cache = SecretCache()
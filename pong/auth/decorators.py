@@ -1,13 +1,17 @@
 from asgiref.sync import sync_to_async
 from django.http import JsonResponse, HttpResponseRedirect
+from django.utils import timezone
 from functools import wraps
-from datetime import datetime
+from datetime import timedelta
 from os import getenv
+import asyncio
 import aiohttp
+import time
 import jwt
 
 from .models import User
 from .utils import get_user_data
+from .tokens import jwt_cache
 from common.constants import (
     INTRA_SECRET_KEY,
     INTRA_UID,
@@ -16,7 +20,14 @@ from common.constants import (
     JWT_SECRET,
     REDIRECT_URI,
     API_URL,
+    TOKEN_REFRESH_REUSE,
 )
+from common.http_client import http_client
+from common.singleflight import SingleFlight
+
+
+# 같은 유저의 만료된 요청들이 동시에 들어오면 42 API refresh와 DB 저장을 한 번만 실행
+token_refreshes = SingleFlight(result_ttl=TOKEN_REFRESH_REUSE)
 
 
 def auth_decorator_factory(check_otp=False):
@@ -36,7 +47,7 @@ def auth_decorator_factory(check_otp=False):
                 return JsonResponse({"error": "No jwt in request"}, status=401)
 
             try:
-                decoded_jwt = jwt.decode(encoded_jwt, JWT_SECRET, algorithms=["HS256"])
+                decoded_jwt = jwt_cache.decode(encoded_jwt)
             except:
                 return JsonResponse({"error": "Decoding jwt failed"}, status=401)
 
@@ -44,10 +55,8 @@ def auth_decorator_factory(check_otp=False):
             if not all(key in decoded_jwt for key in expected_keys):
                 return JsonResponse({"error": "Invalid jwt error"}, status=401)
 
-            custom_exp = decoded_jwt.get("custom_exp")
-            expiration_time = datetime.fromtimestamp(custom_exp)
             # 토큰이 만료되지 않은 경우
-            if expiration_time > datetime.now():
+            if decoded_jwt.get("custom_exp") > time.time():
                 return await func(self, request, decoded_jwt, *args, **kwargs)
 
             # 토큰이 만료된 경우
@@ -90,10 +99,9 @@ def check_user_authorization(check_otp, decoded_jwt, user_data):
 
 async def refresh_access_token(request, decoded_jwt):
     user_id = decoded_jwt.get("user_id")
-    tokens = await fetch_new_tokens(user_id)
-    await set_refresh_token_in_db(user_id, tokens["refresh_token"])
+    tokens = await token_refreshes.do(user_id, refresh_tokens, user_id)
     update_jwt_data = {
-        "custom_exp": timezone.now() + timedelta(seconds=JWT_EXPIRED),
+        "custom_exp": (timezone.now() + timedelta(seconds=JWT_EXPIRED)).timestamp(),
         "access_token": tokens["access_token"],
         "user_id": decoded_jwt.get("user_id"),
         "otp_verified": decoded_jwt.get("otp_verified"),
@@ -101,6 +109,16 @@ async def refresh_access_token(request, decoded_jwt):
     return update_jwt_data
 
 
+async def refresh_tokens(user_id):
+    """
+    refresh token으로 새 토큰을 받아서 DB에 저장
+    42 API는 사용한 refresh token을 무효화하므로 유저마다 동시에 하나만 실행되어야 한다
+    """
+    tokens = await fetch_new_tokens(user_id)
+    await set_refresh_token_in_db(user_id, tokens["refresh_token"])
+    return tokens
+
+
 async def fetch_new_tokens(user_id):
     refresh_token = await get_refresh_token_from_db(user_id)
     data = {
@@ -112,16 +130,15 @@ async def fetch_new_tokens(user_id):
         "state": STATE,
     }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{API_URL}/oauth/token", data=data) as response:
-                response_data = await response.json()
-                if response.status != 200:
-                    raise Exception("42auth fetch failed")
-                return {
-                    "access_token": response_data.get("access_token"),
-                    "refresh_token": response_data.get("refresh_token"),
-                }
-    except aiohttp.ClientError:
+        async with http_client.post(f"{API_URL}/oauth/token", data=data) as response:
+            response_data = await response.json()
+            if response.status != 200:
+                raise Exception("42auth fetch failed")
+            return {
+                "access_token": response_data.get("access_token"),
+                "refresh_token": response_data.get("refresh_token"),
+            }
+    except (aiohttp.ClientError, asyncio.TimeoutError):
         raise Exception("aiohttp error")
 
 
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.backends import default_backend
+from base64 import urlsafe_b64decode
+import pyotp
+import time
+
+from auth.crypto import AESCipher, SecretCache
+
+
+def decrypt_legacy(ciphertext):
+    """이전 방식: 호출마다 AES key 객체와 backend를 새로 만든다"""
+    ciphertext = urlsafe_b64decode(ciphertext.encode("utf-8"))
+    iv = ciphertext[:16]
+    cipher = Cipher(algorithms.AES(AESCipher.key), modes.CFB(iv), backend=default_backend())
+    decryptor = cipher.decryptor()
+    plaintext = decryptor.update(ciphertext[16:]) + decryptor.finalize()
+    return plaintext.decode("utf-8")
+
+
+class Command(BaseCommand):
+    help = "OTP 검증 한 번에 드는 secret 복호화 + TOTP 검증 비용 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verifies", type=int, default=20000)
+        parser.add_argument("--users", type=int, default=100)
+
+    def handle(self, *args, **options):
+        verifies, users = options["verifies"], options["users"]
+        secrets = [pyotp.random_base32() for _ in range(users)]
+        ciphertexts = [AESCipher.encrypt(secret) for secret in secrets]
+        codes = [pyotp.TOTP(secret).now() for secret in secrets]
+        cache = SecretCache(maxsize=users)
+
+        cases = {
+            "legacy": lambda i: decrypt_legacy(ciphertexts[i]),
+            "cipher": lambda i: AESCipher.decrypt(ciphertexts[i]),
+            "cached": lambda i: cache.decrypt(i, ciphertexts[i]),
+        }
+        for name, decrypt in cases.items():
+            decrypt_seconds = total_seconds = 0.0
+            for n in range(verifies):
+                i = n % users
+                start = time.perf_counter()
+                secret = decrypt(i)
+                decrypted = time.perf_counter()
+                assert pyotp.TOTP(secret).verify(codes[i])
+                end = time.perf_counter()
+                decrypt_seconds += decrypted - start
+                total_seconds += end - start
+            self.stdout.write(
+                f"{name:<8} decrypt {decrypt_seconds / verifies * 1e6:6.2f} us "
+                f"verify total {total_seconds / verifies * 1e6:6.2f} us"
+            )
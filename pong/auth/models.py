@@ -19,7 +19,7 @@ class OTPSecret(models.Model):
 
     @property
     def secret(self):
-        return crypto.AESCipher.decrypt(self.encrypted_secret)
+        return crypto.secret_cache.decrypt(self.user_id, self.encrypted_secret)
 
     @secret.setter
     def secret(self, value):
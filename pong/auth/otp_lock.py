@@ -0,0 +1,135 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Q, F, Case, When, Value
+from django.db.models.lookups import GreaterThanOrEqual
+from datetime import timedelta
+
+from .models import OTPSecret, OTPLockInfo
+from .crypto import secret_cache
+from common.constants import LOCK_ACCOUNT, MAX_ATTEMPTS, OTP_STATE_CACHE_TTL
+
+
+"""
+OTP 시도 횟수와 계정 잠금 처리
+시도마다 OTPLockInfo에 조건부 UPDATE 한 번만 실행하고 값이 바뀌지 않으면 쓰지 않는다
+시도 횟수 증가와 잠금 여부는 DB가 한 문장에서 계산하므로 동시에 들어온 시도도 잠금을 넘을 수 없다
+
+상태는 get_otp_data와 같은 dict
+{"secret", "attempts", "last_attempt", "is_locked", "is_verified"}
+OTP_STATE_CACHE_TTL > 0 이면 상태를 cache에 두고 UPDATE 결과로 갱신한다
+"""
+
+
+def otp_state_key(user_id):
+    return f"otp_state_{user_id}"
+
+
+def unlocked(now):
+    """잠기지 않았거나 잠금 시간이 지난 행"""
+    return Q(is_locked=False) | Q(last_attempt__lt=now - timedelta(seconds=LOCK_ACCOUNT))
+
+
+def is_lock_expired(otp_data, now):
+    return bool(
+        otp_data["last_attempt"]
+        and (now - otp_data["last_attempt"]).total_seconds() > LOCK_ACCOUNT
+    )
+
+
+def load_otp_state(user_id):
+    """OTPSecret과 OTPLockInfo를 쿼리 한 번으로 조회, 없으면 None"""
+    row = (
+        OTPSecret.objects.filter(user_id=user_id)
+        .values(
+            "encrypted_secret",
+            "is_verified",
+            attempts=F("otplockinfo__attempts"),
+            last_attempt=F("otplockinfo__last_attempt"),
+            is_locked=F("otplockinfo__is_locked"),
+        )
+        .first()
+    )
+    if row is None or row["attempts"] is None:
+        return None
+    if OTP_STATE_CACHE_TTL:
+        cache.set(otp_state_key(user_id), row, OTP_STATE_CACHE_TTL)
+    return to_otp_data(user_id, row)
+
+
+@sync_to_async
+def get_otp_state(user_id):
+    row = cache.get(otp_state_key(user_id)) if OTP_STATE_CACHE_TTL else None
+    if row is None:
+        return load_otp_state(user_id)
+    return to_otp_data(user_id, row)
+
+
+def to_otp_data(user_id, row):
+    otp_data = dict(row)
+    otp_data["secret"] = secret_cache.decrypt(user_id, row["encrypted_secret"])
+    return otp_data
+
+
+def save_otp_state(user_id, otp_data):
+    if OTP_STATE_CACHE_TTL:
+        row = {key: value for key, value in otp_data.items() if key != "secret"}
+        cache.set(otp_state_key(user_id), row, OTP_STATE_CACHE_TTL)
+
+
+@sync_to_async
+def reload_otp_state(user_id):
+    """cache와 DB가 어긋난 경우 DB 기준으로 다시 읽는다"""
+    cache.delete(otp_state_key(user_id))
+    return load_otp_state(user_id)
+
+
+@sync_to_async
+def record_failure(user_id, otp_data, now):
+    """
+    실패한 시도를 기록하고 MAX_ATTEMPTS에 도달하면 잠근다
+    잠금 시간이 지난 경우 시도 횟수는 1부터 다시 센다
+
+    :return: 갱신된 상태, 이미 잠겨 있거나(다른 요청이 먼저 잠근 경우 포함) 정보가 없으면 None
+    """
+    attempts = Case(When(is_locked=True, then=Value(1)), default=F("attempts") + 1)
+    # UPDATE의 우변은 갱신 전 값을 참조하므로 잠금 여부도 같은 문장에서 계산할 수 있다
+    updated = OTPLockInfo.objects.filter(unlocked(now), otp_secret__user_id=user_id).update(
+        attempts=attempts,
+        is_locked=Case(
+            When(GreaterThanOrEqual(attempts, MAX_ATTEMPTS), then=Value(True)),
+            default=Value(False),
+        ),
+        last_attempt=now,
+    )
+    if not updated:
+        cache.delete(otp_state_key(user_id))
+        return None
+    otp_data["attempts"] = 1 if otp_data["is_locked"] else otp_data["attempts"] + 1
+    otp_data["is_locked"] = otp_data["attempts"] >= MAX_ATTEMPTS
+    otp_data["last_attempt"] = now
+    save_otp_state(user_id, otp_data)
+    return otp_data
+
+
+@sync_to_async
+def record_success(user_id, otp_data, now):
+    """
+    시도 횟수를 초기화하고 OTP 등록을 완료 처리, 이미 같은 값이면 쓰지 않는다
+
+    :return: 갱신된 상태, 그 사이에 다른 요청이 잠근 경우 None
+    """
+    if otp_data["attempts"] or otp_data["is_locked"]:
+        updated = OTPLockInfo.objects.filter(unlocked(now), otp_secret__user_id=user_id).update(
+            attempts=0, is_locked=False, last_attempt=now
+        )
+        if not updated:
+            cache.delete(otp_state_key(user_id))
+            return None
+        otp_data.update(attempts=0, is_locked=False, last_attempt=now)
+    if not otp_data["is_verified"]:
+        OTPSecret.objects.filter(user_id=user_id).update(is_verified=True)
+        otp_data["is_verified"] = True
+        # QRcode 표시 여부에 사용하는 user_data의 is_verified도 다시 읽도록 한다
+        cache.delete(f"user_data_{user_id}")
+    save_otp_state(user_id, otp_data)
+    return otp_data
@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from .crypto import AESCipher, SecretCache
+
+
+class AESCipherTest(SimpleTestCase):
+    def test_roundtrip(self):
+        ciphertext = AESCipher.encrypt("TESTSECRET")
+
+        self.assertNotEqual(AESCipher.encrypt("TESTSECRET"), ciphertext)
+        self.assertEqual(AESCipher.decrypt(ciphertext), "TESTSECRET")
+
+
+class SecretCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.cache = SecretCache(maxsize=10, ttl=60)
+        self.ciphertext = AESCipher.encrypt("TESTSECRET")
+
+    def test_secret_is_decrypted_once(self):
+        with patch("auth.crypto.AESCipher.decrypt", wraps=AESCipher.decrypt) as mock_decrypt:
+            for _ in range(3):
+                self.assertEqual(self.cache.decrypt(1, self.ciphertext), "TESTSECRET")
+
+        mock_decrypt.assert_called_once()
+
+    def test_changed_secret_is_decrypted_again(self):
+        self.cache.decrypt(1, self.ciphertext)
+
+        self.assertEqual(self.cache.decrypt(1, AESCipher.encrypt("NEWSECRET")), "NEWSECRET")
+
+    def test_secrets_are_scoped_per_user(self):
+        self.cache.decrypt(1, self.ciphertext)
+
+        self.assertEqual(self.cache.decrypt(2, AESCipher.encrypt("OTHER")), "OTHER")
+        self.assertEqual(self.cache.decrypt(1, self.ciphertext), "TESTSECRET")
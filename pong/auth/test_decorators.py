@@ -1,14 +1,16 @@
 from django.test import TestCase, RequestFactory
 from django.http import JsonResponse
 from django.utils import timezone
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import timedelta
+import asyncio
 import json
 import jwt
 
-from .decorators import token_required, login_required
+from .decorators import token_required, login_required, refresh_access_token
 from .models import OTPSecret, User, OTPLockInfo
 from common.constants import JWT_SECRET, JWT_EXPIRED
+from common.singleflight import SingleFlight
 
 
 class AuthDecoratorTestCase(TestCase):
@@ -197,6 +199,82 @@ class AuthDecoratorTestCase(TestCase):
         self.assertEqual(decoded_new_jwt["access_token"], "new_access_token")
 
 
+
+@patch("auth.decorators.set_refresh_token_in_db", new_callable=AsyncMock)
+@patch("auth.decorators.fetch_new_tokens")
+class RefreshAccessTokenTestCase(TestCase):
+    def setUp(self):
+        self.token_refreshes = SingleFlight(result_ttl=5)
+        patcher = patch("auth.decorators.token_refreshes", self.token_refreshes)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def decoded_jwt(self, user_id=1, otp_verified=True):
+        return {"user_id": user_id, "otp_verified": otp_verified}
+
+    async def fetch_slowly(self, user_id):
+        await asyncio.sleep(0.01)
+        return {"access_token": f"access_{user_id}", "refresh_token": f"refresh_{user_id}"}
+
+    async def test_concurrent_refreshes_are_coalesced(self, mock_fetch, mock_set_refresh_token):
+        mock_fetch.side_effect = self.fetch_slowly
+        results = await asyncio.gather(
+            *(refresh_access_token(None, self.decoded_jwt(otp_verified=i % 2)) for i in range(5))
+        )
+
+        mock_fetch.assert_awaited_once_with(1)
+        mock_set_refresh_token.assert_awaited_once_with(1, "refresh_1")
+        self.assertEqual({result["access_token"] for result in results}, {"access_1"})
+        # 토큰만 공유하고 jwt 내용은 요청마다 만든다
+        self.assertEqual([result["otp_verified"] for result in results], [0, 1, 0, 1, 0])
+        self.assertIsInstance(results[0]["custom_exp"], float)
+
+    async def test_different_users_are_not_coalesced(self, mock_fetch, mock_set_refresh_token):
+        mock_fetch.side_effect = self.fetch_slowly
+        await asyncio.gather(
+            refresh_access_token(None, self.decoded_jwt(1)),
+            refresh_access_token(None, self.decoded_jwt(2)),
+        )
+
+        self.assertEqual(mock_fetch.await_count, 2)
+
+    async def test_recent_result_is_reused(self, mock_fetch, mock_set_refresh_token):
+        mock_fetch.side_effect = self.fetch_slowly
+        await refresh_access_token(None, self.decoded_jwt())
+        await refresh_access_token(None, self.decoded_jwt())
+
+        mock_fetch.assert_awaited_once()
+        self.assertEqual(self.token_refreshes.get_metrics()["shared"], 1)
+
+    async def test_failure_is_shared_but_not_reused(self, mock_fetch, mock_set_refresh_token):
+        mock_fetch.side_effect = Exception("42auth fetch failed")
+        results = await asyncio.gather(
+            *(refresh_access_token(None, self.decoded_jwt()) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        self.assertTrue(all(isinstance(result, Exception) for result in results))
+        mock_fetch.assert_awaited_once()
+        mock_set_refresh_token.assert_not_awaited()
+
+        mock_fetch.side_effect = self.fetch_slowly
+        result = await refresh_access_token(None, self.decoded_jwt())
+        self.assertEqual(result["access_token"], "access_1")
+
+    async def test_cancelled_waiter_does_not_cancel_refresh(
+        self, mock_fetch, mock_set_refresh_token
+    ):
+        mock_fetch.side_effect = self.fetch_slowly
+        first = asyncio.create_task(refresh_access_token(None, self.decoded_jwt()))
+        second = asyncio.create_task(refresh_access_token(None, self.decoded_jwt()))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        result = await second
+        self.assertEqual(result["access_token"], "access_1")
+        mock_set_refresh_token.assert_awaited_once()
+
+
 class OTPTest(TestCase):
     def setUp(self):
         self.user = User.objects.create(id="9876543", email="test@test.com")
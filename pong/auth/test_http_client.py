@@ -0,0 +1,147 @@
+from django.test import SimpleTestCase
+from contextlib import asynccontextmanager
+from unittest.mock import patch, AsyncMock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import asyncio
+
+from .decorators import fetch_new_tokens
+from common.http_client import HttpClient
+from common.fakes import fake_decorators
+
+with fake_decorators():
+    from .views import OAuthView
+
+
+TOKENS = {"access_token": "access", "refresh_token": "refresh"}
+
+
+class FakeOAuthServer:
+    """42 API의 /oauth/token, /v2/me를 흉내내는 로컬 서버"""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.peers = set()
+        self.requests = 0
+        self.app = web.Application()
+        self.app.router.add_post("/oauth/token", self.token)
+        self.app.router.add_get("/v2/me", self.me)
+
+    async def token(self, request):
+        self.record(request)
+        await asyncio.sleep(self.delay)
+        data = await request.post()
+        if data.get("grant_type") not in ("authorization_code", "refresh_token"):
+            return web.json_response({"error": "invalid_grant"}, status=400)
+        return web.json_response(TOKENS)
+
+    async def me(self, request):
+        self.record(request)
+        if request.headers.get("Authorization") != "Bearer access":
+            return web.json_response({"error": "unauthorized"}, status=401)
+        return web.json_response({"id": 1, "login": "test"})
+
+    def record(self, request):
+        self.requests += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+
+
+@asynccontextmanager
+async def oauth_server(client, delay=0):
+    server = FakeOAuthServer(delay)
+    test_server = TestServer(server.app)
+    await test_server.start_server()
+    api_url = str(test_server.make_url("")).rstrip("/")
+    try:
+        with patch("auth.views.API_URL", api_url), patch(
+            "auth.decorators.API_URL", api_url
+        ), patch("auth.views.http_client", client), patch("auth.decorators.http_client", client):
+            yield server
+    finally:
+        await client.close()
+        await test_server.close()
+
+
+class HttpClientTest(SimpleTestCase):
+    def setUp(self):
+        self.client = HttpClient()
+        self.view = OAuthView()
+
+    async def test_exchange_code_for_token(self):
+        async with oauth_server(self.client):
+            tokens = await self.view.exchange_code_for_token("code")
+
+        self.assertEqual(tokens, TOKENS)
+
+    @patch("auth.views.OAuthView.process_user_data", new_callable=AsyncMock)
+    async def test_get_user_info(self, mock_process_user_data):
+        mock_process_user_data.return_value = (True, {})
+        async with oauth_server(self.client):
+            success, _ = await self.view.get_user_info(TOKENS)
+            failed, error = await self.view.get_user_info({"access_token": "wrong"})
+
+        self.assertTrue(success)
+        self.assertEqual(mock_process_user_data.call_args.args[0]["login"], "test")
+        self.assertFalse(failed)
+        self.assertEqual(error, {"error": "unauthorized"})
+
+    @patch("auth.decorators.get_refresh_token_from_db", new_callable=AsyncMock)
+    async def test_fetch_new_tokens(self, mock_get_refresh_token):
+        mock_get_refresh_token.return_value = "refresh"
+        async with oauth_server(self.client):
+            tokens = await fetch_new_tokens(1)
+
+        self.assertEqual(tokens, TOKENS)
+
+    async def test_connection_is_reused(self):
+        async with oauth_server(self.client) as server:
+            for _ in range(5):
+                await self.view.exchange_code_for_token("code")
+
+        self.assertEqual(server.requests, 5)
+        self.assertEqual(len(server.peers), 1)
+        self.assertEqual(self.client.sessions_created, 1)
+
+    async def test_per_host_limit(self):
+        self.client = HttpClient(limit_per_host=2)
+        async with oauth_server(self.client, delay=0.05) as server:
+            await asyncio.gather(*(self.view.exchange_code_for_token("code") for _ in range(6)))
+
+        self.assertEqual(server.requests, 6)
+        self.assertEqual(len(server.peers), 2)
+
+    async def test_timeout_fails_login(self):
+        self.client = HttpClient(timeout=0.05)
+        async with oauth_server(self.client, delay=1):
+            tokens = await self.view.exchange_code_for_token("code")
+
+        self.assertIsNone(tokens)
+
+    async def test_session_is_recreated_after_close(self):
+        session = self.client.get_session()
+        await self.client.close()
+
+        self.assertTrue(session.closed)
+        self.assertIsNot(self.client.get_session(), session)
+        await self.client.close()
+
+
+class HttpClientLoopTest(SimpleTestCase):
+    def test_session_from_finished_loop_is_closed(self):
+        client = HttpClient()
+
+        async def get_session():
+            return client.get_session()
+
+        old_session = asyncio.run(get_session())
+
+        async def replace_session():
+            session = client.get_session()
+            await asyncio.sleep(0)
+            await client.close()
+            return session
+
+        new_session = asyncio.run(replace_session())
+        self.assertIsNot(new_session, old_session)
+        self.assertTrue(old_session.closed)
+        self.assertEqual(client.sessions_created, 2)
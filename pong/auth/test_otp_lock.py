@@ -0,0 +1,129 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.utils import timezone
+from asgiref.sync import async_to_sync
+from unittest.mock import patch
+from datetime import timedelta
+
+from .models import OTPLockInfo, OTPSecret, User
+from .otp_lock import (
+    get_otp_state,
+    reload_otp_state,
+    record_failure,
+    record_success,
+    otp_state_key,
+)
+from common.constants import MAX_ATTEMPTS, LOCK_ACCOUNT
+from common.fakes import FAKE_USER
+
+
+class OTPLockTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(**FAKE_USER)
+        self.otp_secret = OTPSecret.objects.create(
+            user_id=self.user.id, secret="TESTSECRET", is_verified=False
+        )
+        self.otp_lock_info = OTPLockInfo.objects.create(otp_secret=self.otp_secret)
+        self.now = timezone.now()
+        cache.delete(otp_state_key(self.user.id))
+
+    def get_state(self):
+        return async_to_sync(get_otp_state)(self.user.id)
+
+    def record_failure(self, otp_data):
+        return async_to_sync(record_failure)(self.user.id, otp_data, self.now)
+
+    def record_success(self, otp_data):
+        return async_to_sync(record_success)(self.user.id, otp_data, self.now)
+
+    def set_lock_info(self, **fields):
+        OTPLockInfo.objects.filter(id=self.otp_lock_info.id).update(**fields)
+        self.otp_lock_info.refresh_from_db()
+
+    def test_state_is_read_with_one_query(self):
+        with self.assertNumQueries(1):
+            otp_data = self.get_state()
+
+        self.assertEqual(otp_data["secret"], "TESTSECRET")
+        self.assertEqual(otp_data["attempts"], 0)
+        self.assertFalse(otp_data["is_verified"])
+
+    def test_failure_is_one_update(self):
+        otp_data = self.get_state()
+        with self.assertNumQueries(1):
+            otp_data = self.record_failure(otp_data)
+
+        self.otp_lock_info.refresh_from_db()
+        self.assertEqual(otp_data["attempts"], 1)
+        self.assertEqual(self.otp_lock_info.attempts, 1)
+        self.assertEqual(self.otp_lock_info.last_attempt, self.now)
+
+    def test_max_attempts_locks_account(self):
+        self.set_lock_info(attempts=MAX_ATTEMPTS - 1)
+        otp_data = self.record_failure(self.get_state())
+
+        self.otp_lock_info.refresh_from_db()
+        self.assertTrue(otp_data["is_locked"])
+        self.assertTrue(self.otp_lock_info.is_locked)
+
+    def test_locked_account_is_not_updated(self):
+        self.set_lock_info(attempts=MAX_ATTEMPTS, is_locked=True, last_attempt=self.now)
+
+        self.assertIsNone(self.record_failure(self.get_state()))
+        self.otp_lock_info.refresh_from_db()
+        self.assertEqual(self.otp_lock_info.attempts, MAX_ATTEMPTS)
+
+    def test_expired_lock_restarts_count(self):
+        last_attempt = self.now - timedelta(seconds=LOCK_ACCOUNT + 1)
+        self.set_lock_info(attempts=MAX_ATTEMPTS, is_locked=True, last_attempt=last_attempt)
+        otp_data = self.record_failure(self.get_state())
+
+        self.otp_lock_info.refresh_from_db()
+        self.assertEqual(otp_data["attempts"], 1)
+        self.assertEqual(self.otp_lock_info.attempts, 1)
+        self.assertFalse(self.otp_lock_info.is_locked)
+
+    def test_stale_attempts_cannot_exceed_lock(self):
+        # 같은 상태를 읽은 동시 요청들
+        otp_data = self.get_state()
+        results = [self.record_failure(dict(otp_data)) for _ in range(MAX_ATTEMPTS + 2)]
+
+        self.otp_lock_info.refresh_from_db()
+        self.assertEqual(self.otp_lock_info.attempts, MAX_ATTEMPTS)
+        self.assertTrue(self.otp_lock_info.is_locked)
+        self.assertEqual(results[MAX_ATTEMPTS:], [None, None])
+
+    def test_success_resets_attempts_and_verifies(self):
+        self.set_lock_info(attempts=2)
+        self.record_success(self.get_state())
+
+        self.otp_lock_info.refresh_from_db()
+        self.otp_secret.refresh_from_db()
+        self.assertEqual(self.otp_lock_info.attempts, 0)
+        self.assertTrue(self.otp_secret.is_verified)
+
+    def test_unchanged_success_does_not_write(self):
+        self.otp_secret.is_verified = True
+        self.otp_secret.save()
+        otp_data = self.get_state()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.record_success(otp_data))
+
+
+@patch("auth.otp_lock.OTP_STATE_CACHE_TTL", 60)
+class CachedOTPLockTestCase(OTPLockTestCase):
+    def test_attempt_after_first_read_is_one_query(self):
+        self.get_state()
+        with self.assertNumQueries(1):
+            otp_data = self.record_failure(self.get_state())
+
+        self.assertEqual(self.get_state()["attempts"], otp_data["attempts"])
+
+    def test_out_of_band_lock_is_reconciled(self):
+        otp_data = self.get_state()
+        self.set_lock_info(attempts=MAX_ATTEMPTS, is_locked=True, last_attempt=self.now)
+
+        self.assertIsNone(self.record_failure(otp_data))
+        self.assertIsNone(cache.get(otp_state_key(self.user.id)))
+        self.assertTrue(async_to_sync(reload_otp_state)(self.user.id)["is_locked"])
@@ -0,0 +1,64 @@
+from django.test import SimpleTestCase
+from unittest.mock import patch
+import time
+import jwt
+
+from .tokens import JWTCache
+from common.constants import JWT_SECRET
+
+
+class JWTCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.cache = JWTCache(maxsize=2, ttl=60)
+
+    def encode(self, custom_exp, user_id=1):
+        payload = {"custom_exp": custom_exp, "user_id": user_id, "otp_verified": True}
+        return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+
+    def test_verified_claims_are_cached(self):
+        token = self.encode(time.time() + 100)
+
+        with patch("auth.tokens.jwt.decode", wraps=jwt.decode) as mock_decode:
+            claims = self.cache.decode(token)
+            claims["user_id"] = 2
+            self.assertEqual(self.cache.decode(token)["user_id"], 1)
+
+        mock_decode.assert_called_once()
+        self.assertEqual(self.cache.get_metrics()["hits"], 1)
+        self.assertEqual(self.cache.get_metrics()["misses"], 1)
+
+    def test_invalid_token_is_not_cached(self):
+        token = self.encode(time.time() + 100)
+        header, payload, _ = token.split(".")
+        forged = f"{header}.{payload}.{jwt.encode({}, 'other', algorithm='HS256').split('.')[2]}"
+
+        for _ in range(2):
+            with self.assertRaises(jwt.InvalidTokenError):
+                self.cache.decode(forged)
+        self.assertEqual(self.cache.get_metrics()["size"], 0)
+
+    def test_expired_token_is_not_cached(self):
+        self.cache.decode(self.encode(time.time() - 1))
+
+        self.assertEqual(self.cache.get_metrics()["size"], 0)
+
+    def test_entry_expires_at_custom_exp(self):
+        now = [0]
+        self.cache.claims.time_func = lambda: now[0]
+        token = self.encode(time.time() + 10)
+
+        with patch("auth.tokens.jwt.decode", wraps=jwt.decode) as mock_decode:
+            self.cache.decode(token)
+            now[0] = 9
+            self.cache.decode(token)
+            self.assertEqual(mock_decode.call_count, 1)
+            now[0] = 11
+            self.cache.decode(token)
+            self.assertEqual(mock_decode.call_count, 2)
+
+    def test_size_is_bounded(self):
+        for user_id in range(3):
+            self.cache.decode(self.encode(time.time() + 100, user_id))
+
+        self.assertEqual(self.cache.get_metrics()["size"], 2)
+        self.assertEqual(self.cache.get_metrics()["evictions"], 1)
@@ -0,0 +1,46 @@
+import hashlib
+import time
+import jwt
+
+from common.constants import JWT_SECRET, JWT_CACHE_SIZE, JWT_CACHE_TTL
+from common.lru import TTLCache
+
+
+class JWTCache:
+    """
+    검증을 통과한 JWT의 claims를 프로세스 내부 LRU에 보관
+    같은 cookie로 반복되는 요청은 HS256 서명 검증과 JSON 파싱을 생략한다
+
+    key는 토큰 전체(서명 포함)의 sha256이므로 payload나 서명이 하나라도 다르면 다시 검증한다
+    custom_exp가 지난 토큰은 refresh 대상이므로 캐시하지 않는다
+    """
+
+    def __init__(self, maxsize=JWT_CACHE_SIZE, ttl=JWT_CACHE_TTL, secret=JWT_SECRET):
+        self.ttl = ttl
+        self.secret = secret
+        self.claims = TTLCache(maxsize, ttl)
+
+    def decode(self, encoded_jwt):
+        """
+        jwt.decode와 같이 검증에 실패하면 jwt.InvalidTokenError를 발생시킨다
+        :return: claims의 복사본, 호출한 쪽에서 수정해도 캐시에는 영향이 없다
+        """
+        key = hashlib.sha256(encoded_jwt.encode()).digest()
+        claims = self.claims.get(key)
+        if claims is None:
+            claims = jwt.decode(encoded_jwt, self.secret, algorithms=["HS256"])
+            custom_exp = claims.get("custom_exp")
+            if isinstance(custom_exp, (int, float)):
+                ttl = min(custom_exp - time.time(), self.ttl)
+                if ttl > 0:
+                    self.claims.set(key, claims, ttl)
+        return dict(claims)
+
+    def clear(self):
+        self.claims.clear()
+
+    def get_metrics(self):
+        return self.claims.get_metrics()
+
+
+jwt_cache = JWTCache()
@@ -5,7 +5,7 @@ from django.core.cache import cache
 import logging
 
 from .models import User, OTPSecret
-from .crypto import AESCipher
+from .crypto import secret_cache
 from common.constants import TOKEN_EXPIRES
 
 
@@ -22,13 +22,13 @@ async def get_user_data(user_id):
     if not user_data:
         user_data = await get_user_data_from_db(user_id)
         if user_data:
-            decrypt_secret(user_data)
+            decrypt_secret(user_id, user_data)
             await cache.aset(f"user_data_{user_id}", user_data, TOKEN_EXPIRES)
     return user_data
 
 
-def decrypt_secret(user_data):
-    secret = AESCipher.decrypt(user_data["encrypted_secret"])
+def decrypt_secret(user_id, user_data):
+    secret = secret_cache.decrypt(user_id, user_data["encrypted_secret"])
     del user_data["encrypted_secret"]
     user_data["secret"] = secret
     return user_data
@@ -6,6 +6,7 @@ from django.views import View
 from django.db import transaction, DatabaseError
 from os import getenv
 from datetime import timedelta
+import asyncio
 import aiohttp
 import pyotp
 import jwt
@@ -19,7 +20,16 @@ from .decorators import (
 )
 from .models import User, OTPSecret, OTPLockInfo
 from .utils import get_user_data
+from .tokens import jwt_cache
+from .otp_lock import (
+    get_otp_state,
+    reload_otp_state,
+    record_failure,
+    record_success,
+    is_lock_expired,
+)
 from common.constants import *
+from common.http_client import http_client
 
 
 logger = logging.getLogger(__name__)
@@ -117,16 +127,15 @@ class OAuthView(View):
             "state": STATE,
         }
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{API_URL}/oauth/token", data=data) as response:
-                    if response.status != 200:
-                        return None
-                    response_data = await response.json()
-                    return {
-                        "access_token": response_data.get("access_token"),
-                        "refresh_token": response_data.get("refresh_token"),
-                    }
-        except aiohttp.ClientError:
+            async with http_client.post(f"{API_URL}/oauth/token", data=data) as response:
+                if response.status != 200:
+                    return None
+                response_data = await response.json()
+                return {
+                    "access_token": response_data.get("access_token"),
+                    "refresh_token": response_data.get("refresh_token"),
+                }
+        except (aiohttp.ClientError, asyncio.TimeoutError):
             return None
 
     async def get_user_info(self, tokens):
@@ -136,14 +145,13 @@ class OAuthView(View):
         """
         headers = {"Authorization": f'Bearer {tokens["access_token"]}'}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{API_URL}/v2/me", headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return await self.process_user_data(data, tokens)
-                    return False, await response.json()
-        except aiohttp.ClientError as e:
-            return False, str(e)
+            async with http_client.get(f"{API_URL}/v2/me", headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return await self.process_user_data(data, tokens)
+                return False, await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return False, str(e) or type(e).__name__
 
     @sync_to_async
     def process_user_data(self, data, tokens):
@@ -254,8 +262,8 @@ class OTPView(View):
         OTP 정보 확인 및 900초 지났을 경우 시도 횟수 초기화
         계정 잠금, 정보 없음, OTP인증 실패 확인
 
-        cache를 사용하여 저장할 경우 퍼포먼스의 이득을 볼 수 있지만
-        데이터의 정합성을 위해서 db를 확인한다
+        시도 결과는 OTPLockInfo의 조건부 UPDATE 한 번으로 기록하고 (auth.otp_lock)
+        잠금 여부는 항상 DB에서 판단한다, 상태 조회는 OTP_STATE_CACHE_TTL 설정 시 cache를 사용
 
         :cookie jwt: 인증을 위한 JWT
         :body input_password: 사용자가 입력한 OTP
@@ -267,13 +275,11 @@ class OTPView(View):
 
         now = timezone.now()
         if self.is_account_locked(otp_data, now):
-            return JsonResponse({"error": "Account is locked. try later"}, status=403)
+            return self.account_locked_response()
 
-        otp_data["attempts"] += 1
-        otp_data["last_attempt"] = now
-        if otp_data["attempts"] >= MAX_ATTEMPTS:
-            otp_data["is_locked"] = True
-            await sync_to_async(self.update_otp_data)(user_id, otp_data)
+        if not otp_data["is_locked"] and otp_data["attempts"] + 1 >= MAX_ATTEMPTS:
+            if not await record_failure(user_id, otp_data, now):
+                return await self.conflict_response(user_id)
             return JsonResponse(
                 {
                     "error": "Maximum number of attempts exceeded. Please try again after 15 minutes."
@@ -282,12 +288,24 @@ class OTPView(View):
             )
 
         if self.verify_otp(request, otp_data["secret"]):
-            await self.update_otp_success(user_id, otp_data)
+            if not await record_success(user_id, otp_data, now):
+                return await self.conflict_response(user_id)
             return await self.create_success_response(decoded_jwt)
 
-        await sync_to_async(self.update_otp_data)(user_id, otp_data)
+        otp_data = await record_failure(user_id, otp_data, now)
+        if not otp_data:
+            return await self.conflict_response(user_id)
         return self.password_fail_response(otp_data["attempts"])
 
+    async def conflict_response(self, user_id):
+        """조건부 UPDATE가 반영되지 않은 경우(cache와 DB 불일치, 동시 잠금) DB 기준으로 응답"""
+        if not await reload_otp_state(user_id):
+            return JsonResponse({"error": "Can't found OTP data."}, status=500)
+        return self.account_locked_response()
+
+    def account_locked_response(self):
+        return JsonResponse({"error": "Account is locked. try later"}, status=403)
+
     async def create_success_response(self, decoded_jwt):
         response = JsonResponse({"success": "OTP authentication verified"})
         encoded_jwt = jwt.encode(
@@ -303,20 +321,8 @@ class OTPView(View):
         response.set_cookie("jwt", encoded_jwt, httponly=True, secure=True, samesite="Lax")
         return response
 
-    @sync_to_async
-    def get_otp_data(self, user_id):
-        try:
-            otp_secret = OTPSecret.objects.select_related("otplockinfo").get(user_id=user_id)
-            data = {
-                "secret": otp_secret.secret,
-                "attempts": otp_secret.otplockinfo.attempts,
-                "last_attempt": otp_secret.otplockinfo.last_attempt,
-                "is_locked": otp_secret.otplockinfo.is_locked,
-                "is_verified": otp_secret.is_verified,
-            }
-        except OTPSecret.DoesNotExist:
-            return None
-        return data
+    async def get_otp_data(self, user_id):
+        return await get_otp_state(user_id)
 
     def password_fail_response(self, attempts):
         return JsonResponse(
@@ -328,49 +334,14 @@ class OTPView(View):
         )
 
     def is_account_locked(self, otp_data, now):
-        if otp_data["is_locked"]:
-            if (
-                otp_data["last_attempt"]
-                and (now - otp_data["last_attempt"]).total_seconds() > LOCK_ACCOUNT
-            ):
-                otp_data["is_locked"] = False
-                otp_data["attempts"] = 0
-                return False
-            return True
-        return False
+        """잠금 시간이 지난 경우 다음 기록에서 시도 횟수가 초기화된다"""
+        return otp_data["is_locked"] and not is_lock_expired(otp_data, now)
 
     def verify_otp(self, request, secret):
         body = json.loads(request.body.decode("utf-8"))
         otp_code = body.get("input_password")
         return pyotp.TOTP(secret).verify(otp_code)
 
-    @sync_to_async
-    def update_otp_success(self, user_id, otp_data):
-        otp_data["attempts"] = 0
-        otp_data["is_locked"] = False
-        otp_data["is_verified"] = True
-        self.update_otp_data(user_id, otp_data)
-
-    def update_otp_data(self, user_id, data):
-        """
-        OTP 시도 횟수 및 시간 저장
-        5회 이상 시도 시 계정 잠금 및 초기화 시간 900초 소요
-        """
-        with transaction.atomic():
-            otp_secret = OTPSecret.objects.select_for_update().get(user_id=user_id)
-
-            # TODO: if not changed, do not hit query
-            # OTPSecret 업데이트
-            otp_secret.is_verified = data["is_verified"]
-            otp_secret.save()
-
-            # OTPLockInfo 업데이트
-            otp_lock_info = OTPLockInfo.objects.get(otp_secret=otp_secret)
-            otp_lock_info.attempts = data["attempts"]
-            otp_lock_info.last_attempt = data["last_attempt"]
-            otp_lock_info.is_locked = data["is_locked"]
-            otp_lock_info.save()
-
 
 class LoginView(View):
     async def get(self, request):
@@ -389,7 +360,7 @@ class StatusView(View):
             return JsonResponse({"error": "No jwt in request"}, status=401)
 
         try:
-            decoded_jwt = jwt.decode(encoded_jwt, JWT_SECRET, algorithms=["HS256"])
+            decoded_jwt = jwt_cache.decode(encoded_jwt)
         except:
             return JsonResponse({"error": "Decoding jwt failed"}, status=401)
 
@@ -12,3 +12,63 @@ REDIRECT_URI = getenv("REDIRECT_URI")
 STATE = getenv("STATE")
 AUTH_PAGE = getenv("AUTH_PAGE")
 FRONT_BASE_URL = getenv("FRONT_BASE_URL")
+# standalone: 소켓마다 게임 루프 실행, batch: 프로세스 단위 BatchPongEngine에서 일괄 처리
+# process: GameWorkerPool의 워커 프로세스에서 물리 연산 실행
+GAME_ENGINE = getenv("GAME_ENGINE", "standalone")
+# numpy: ndarray 기반 물리 연산, scalar: float 기반 ScalarPhysics (standalone 모드에서만 사용)
+GAME_PHYSICS = getenv("GAME_PHYSICS", "numpy")
+# 초당 시뮬레이션 스텝 수 및 지연 발생시 한 번에 따라잡을 수 있는 최대 스텝 수
+GAME_TICK_RATE = int(getenv("GAME_TICK_RATE", 150))
+MAX_CATCH_UP_STEPS = int(getenv("MAX_CATCH_UP_STEPS", 5))
+# 초당 state 프레임 전송 횟수, GAME_TICK_RATE 이상이면 매 틱 전송
+GAME_BROADCAST_RATE = int(getenv("GAME_BROADCAST_RATE", GAME_TICK_RATE))
+# GAME_ENGINE=process 에서 사용할 워커 프로세스 수, 0이면 코어 수
+GAME_WORKERS = int(getenv("GAME_WORKERS", 0))
+# GAME_SHARDING=true 인 경우 user id의 consistent hash로 경기를 실행할 shard를 결정
+GAME_SHARDING = getenv("GAME_SHARDING", "false") == "true"
+SHARD_ID = getenv("SHARD_ID", "shard-0")
+GAME_SHARDS = getenv("GAME_SHARDS", SHARD_ID).split(",")
+# 모든 클라이언트가 떠난 경기를 재접속을 위해 유지하는 시간(초)
+MATCH_RECONNECT_GRACE = int(getenv("MATCH_RECONNECT_GRACE", 30))
+# 게임 session data 저장소: SESSION_CACHE_ALIAS의 django cache를 공유 저장소로 사용
+SESSION_CACHE_ALIAS = getenv("SESSION_CACHE_ALIAS", "sessions")
+SESSION_TTL = int(getenv("SESSION_TTL", 500))
+# 프로세스 내부 LRU의 최대 항목 수 및 유지 시간(초)
+# 로컬 항목은 읽을 때마다 공유 저장소의 generation과 비교하므로 다른 노드의 기록이 가려지지 않는다
+# 단 write-behind 대기열의 값은 기록되기 전(SESSION_WRITE_BEHIND)까지 다른 노드에서 보이지 않는다
+SESSION_LOCAL_SIZE = int(getenv("SESSION_LOCAL_SIZE", 10000))
+SESSION_LOCAL_TTL = int(getenv("SESSION_LOCAL_TTL", 60))
+# 경기 중 갱신되는 session data를 공유 저장소에 모아서 기록하는 주기(초)
+SESSION_WRITE_BEHIND = float(getenv("SESSION_WRITE_BEHIND", 0.5))
+# 종료된 게임 결과를 모아서 bulk_create 하는 최대 개수 및 최대 대기 시간(초)
+GAME_RESULT_BATCH_SIZE = int(getenv("GAME_RESULT_BATCH_SIZE", 100))
+GAME_RESULT_FLUSH_INTERVAL = float(getenv("GAME_RESULT_FLUSH_INTERVAL", 0.05))
+# cursor 페이지네이션에서 total=true로 요청한 전체 게임 수를 캐시하는 시간(초)
+GAME_COUNT_CACHE_TTL = int(getenv("GAME_COUNT_CACHE_TTL", 60))
+# 게임 기록 페이지 응답을 캐시하는 시간(초), 게임이 저장되면 버전이 바뀌어 즉시 무효화된다
+GAME_HISTORY_CACHE_TTL = int(getenv("GAME_HISTORY_CACHE_TTL", 300))
+# 승률 랭킹에 포함되기 위한 최소 게임 수
+LEADERBOARD_MIN_GAMES = int(getenv("LEADERBOARD_MIN_GAMES", 5))
+# 일시정지 상태로 유지되는 경기와 입력이 없는 경기를 정리하기까지의 시간(초) 및 확인 주기
+MATCH_PAUSE_TIMEOUT = int(getenv("MATCH_PAUSE_TIMEOUT", 300))
+MATCH_IDLE_TIMEOUT = int(getenv("MATCH_IDLE_TIMEOUT", 600))
+MATCH_REAP_INTERVAL = float(getenv("MATCH_REAP_INTERVAL", 5))
+# 42 API 등 외부 HTTP 요청에 사용하는 연결 풀의 크기, 호스트당 동시 연결 수, keep-alive 유지 시간(초)
+HTTP_POOL_SIZE = int(getenv("HTTP_POOL_SIZE", 100))
+HTTP_POOL_PER_HOST = int(getenv("HTTP_POOL_PER_HOST", 20))
+HTTP_KEEPALIVE = float(getenv("HTTP_KEEPALIVE", 30))
+# DNS 조회 결과를 재사용하는 시간(초) 및 요청 전체, 연결 timeout(초)
+HTTP_DNS_CACHE_TTL = int(getenv("HTTP_DNS_CACHE_TTL", 300))
+HTTP_TIMEOUT = float(getenv("HTTP_TIMEOUT", 10))
+HTTP_CONNECT_TIMEOUT = float(getenv("HTTP_CONNECT_TIMEOUT", 3))
+# 동시에 만료된 요청들이 공유한 토큰 갱신 결과를 갱신이 끝난 뒤에도 재사용하는 시간(초)
+TOKEN_REFRESH_REUSE = float(getenv("TOKEN_REFRESH_REUSE", 5))
+# 검증한 JWT claims를 캐시하는 최대 개수 및 최대 유지 시간(초), custom_exp가 더 빠르면 그때까지만 유지
+JWT_CACHE_SIZE = int(getenv("JWT_CACHE_SIZE", 10000))
+JWT_CACHE_TTL = int(getenv("JWT_CACHE_TTL", 300))
+# 복호화한 OTP secret을 유저별로 캐시하는 최대 개수 및 유지 시간(초)
+SECRET_CACHE_SIZE = int(getenv("SECRET_CACHE_SIZE", 10000))
+SECRET_CACHE_TTL = int(getenv("SECRET_CACHE_TTL", 300))
+# OTP 시도 상태(시도 횟수, 잠금 여부)를 cache에서 읽는 시간(초), 0이면 매 시도마다 DB에서 읽는다
+# 잠금은 항상 DB의 조건부 UPDATE로 판단하며 cache는 만료되거나 DB와 어긋나면 다시 읽는다
+OTP_STATE_CACHE_TTL = int(getenv("OTP_STATE_CACHE_TTL", 0))
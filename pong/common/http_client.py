@@ -0,0 +1,92 @@
+import asyncio
+import aiohttp
+
+from .constants import (
+    HTTP_POOL_SIZE,
+    HTTP_POOL_PER_HOST,
+    HTTP_KEEPALIVE,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+)
+
+
+class HttpClient:
+    """
+    프로세스 전체에서 공유하는 aiohttp.ClientSession
+    요청마다 세션을 만들면 매번 DNS 조회와 TCP, TLS 연결을 새로 하므로
+    하나의 연결 풀을 keep-alive로 재사용한다
+
+    서버 startup에서 start, shutdown에서 close를 호출하며 (game.lifespan, daphne는 reactor 이벤트)
+    그 외의 곳(테스트, 관리 명령)에서는 처음 요청할 때 생성된다
+    세션은 이벤트 루프에 묶이므로 루프가 바뀌면 이전 세션을 닫고 새로 만든다
+    """
+
+    def __init__(
+        self,
+        limit=HTTP_POOL_SIZE,
+        limit_per_host=HTTP_POOL_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE,
+        dns_cache_ttl=HTTP_DNS_CACHE_TTL,
+        timeout=HTTP_TIMEOUT,
+        connect_timeout=HTTP_CONNECT_TIMEOUT,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self._session = None
+        self._loop = None
+        self._closing = set()
+        self.sessions_created = 0
+
+    async def start(self):
+        self.get_session()
+
+    def get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                self.close_stale(self._session, self._loop)
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._loop = loop
+            self.sessions_created += 1
+        return self._session
+
+    def close_stale(self, session, session_loop):
+        """다른 이벤트 루프에서 만든 세션을 닫는다"""
+        if session_loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+            return
+        # 끝난 루프의 연결은 이미 끊겨 있으므로 세션과 connector의 상태만 정리한다
+        task = asyncio.get_running_loop().create_task(self.close_session(session))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def close_session(self, session):
+        try:
+            await session.close()
+        except RuntimeError:
+            # 멈췄지만 닫히지 않은 루프의 연결은 해당 루프에서만 기다릴 수 있다
+            pass
+
+    def get(self, url, **kwargs):
+        return self.get_session().get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.get_session().post(url, **kwargs)
+
+    async def close(self):
+        session, self._session, self._loop = self._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+http_client = HttpClient()
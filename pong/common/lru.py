@@ -0,0 +1,69 @@
+from collections import OrderedDict
+import time
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    프로세스 내부에서 사용하는 LRU 캐시
+    maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거하고
+    ttl이 지난 항목은 조회 시점에 만료 처리한다
+
+    :param maxsize: 최대 항목 수
+    :param ttl: 항목 유지 시간(초), None이면 만료되지 않음
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, time_func=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.time_func = time_func
+        self.data = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key, default=None, count=True):
+        item = self.data.get(key)
+        if item is not None:
+            expires_at, value = item
+            if expires_at is None or expires_at > self.time_func():
+                self.data.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return value
+            del self.data[key]
+        if count:
+            self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else self.time_func() + ttl
+        self.data[key] = (expires_at, value)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        item = self.data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self):
+        self.data.clear()
+
+    def get_metrics(self):
+        return {
+            "size": len(self.data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
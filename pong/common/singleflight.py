@@ -0,0 +1,68 @@
+import asyncio
+
+from .lru import TTLCache, _MISSING
+
+
+class SingleFlight:
+    """
+    같은 key로 동시에 들어온 호출은 하나만 실행하고 나머지는 그 결과(또는 예외)를 공유한다
+    result_ttl 동안은 끝난 호출의 성공 결과도 재사용한다 (실패는 재사용하지 않음)
+
+    프로세스 단위로 동작하므로 여러 프로세스 사이의 호출은 합쳐지지 않는다
+    진행중인 호출은 이벤트 루프에 묶이므로 루프가 바뀌면 비운다
+    """
+
+    def __init__(self, result_ttl=0, maxsize=10000):
+        self.calls = {}  # key -> asyncio.Task
+        self.results = TTLCache(maxsize, result_ttl) if result_ttl else None
+        self.loop = None
+        self.executions = 0
+        self.shared = 0
+
+    async def do(self, key, func, *args):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.calls = {}
+        if self.results is not None:
+            result = self.results.get(key, _MISSING)
+            if result is not _MISSING:
+                self.shared += 1
+                return result
+        task = self.calls.get(key)
+        if task is None:
+            self.executions += 1
+            task = loop.create_task(self.run(key, func, *args))
+            task.add_done_callback(retrieve_exception)
+            self.calls[key] = task
+        else:
+            self.shared += 1
+        # 기다리던 요청 하나가 취소되어도 다른 요청들이 공유하는 호출은 계속 진행한다
+        return await asyncio.shield(task)
+
+    async def run(self, key, func, *args):
+        try:
+            result = await func(*args)
+            if self.results is not None:
+                self.results.set(key, result)
+            return result
+        finally:
+            if self.calls.get(key) is asyncio.current_task():
+                del self.calls[key]
+
+    def forget(self, key):
+        if self.results is not None:
+            self.results.pop(key)
+
+    def get_metrics(self):
+        return {
+            "in_flight": len(self.calls),
+            "executions": self.executions,
+            "shared": self.shared,
+        }
+
+
+def retrieve_exception(task):
+    # 모든 대기자가 취소된 경우 "exception was never retrieved" 경고 방지
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,74 @@
+import asyncio
+
+from .clock import GameClock
+from common.constants import GAME_BROADCAST_RATE, GAME_TICK_RATE
+
+
+class StateBroadcaster:
+    """
+    state 프레임을 시뮬레이션 틱과 별개의 주기로 전송한다
+    주기 사이에 발생한 state는 가장 최근 것 하나만 남기고 버린다
+    score, game_end 등 다른 이벤트는 flush로 남은 state를 먼저 보낸 뒤 바로 전송한다
+
+    :param send: 프레임을 실제로 전송하는 코루틴 함수
+    :param rate: 초당 state 전송 횟수, 틱 레이트 이상이면 매 틱 바로 전송
+    """
+
+    def __init__(self, send, rate=GAME_BROADCAST_RATE):
+        self.send = send
+        self.throttled = 0 < rate < GAME_TICK_RATE
+        self.clock = GameClock(tick_rate=rate, max_catch_up=1) if self.throttled else None
+        self.pending = None
+        self.task = None
+        self.published = 0
+        self.sent = 0
+
+    async def publish(self, state):
+        self.published += 1
+        if not self.throttled:
+            await self._send(state)
+            return
+        self.pending = state
+        self.start()
+
+    async def flush(self):
+        if self.pending is not None:
+            state, self.pending = self.pending, None
+            await self._send(state)
+
+    async def _send(self, state):
+        self.sent += 1
+        await self.send(state)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        """
+        주기마다 대기중인 state를 전송하고 보낼 state가 없는 주기가 오면 종료한다
+        일시정지 등으로 state가 더 이상 오지 않으면 깨어나지 않고 다음 publish에서 다시 시작된다
+        종료는 마지막 전송에서 한 주기 이상 지난 시점이므로 다시 시작해서 바로 보내도 주기를 넘지 않는다
+        """
+        try:
+            self.clock.reset()
+            while True:
+                if self.clock.advance():
+                    if self.pending is None:
+                        return
+                    await self.flush()
+                await asyncio.sleep(self.clock.time_until_next_tick())
+        except asyncio.CancelledError:
+            pass
+
+    def get_metrics(self):
+        return {
+            "published": self.published,
+            "sent": self.sent,
+            "coalesced": self.published - self.sent - (self.pending is not None),
+        }
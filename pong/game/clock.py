@@ -0,0 +1,71 @@
+import time
+
+from common.constants import GAME_TICK_RATE, MAX_CATCH_UP_STEPS
+
+
+class GameClock:
+    """
+    고정된 시간 간격(timestep)으로 시뮬레이션을 진행시키기 위한 시계
+    실제로 흐른 시간을 accumulator에 누적하고 timestep 단위로 소비한다
+    처리 지연으로 밀린 스텝은 max_catch_up 까지만 따라잡고 나머지는 버린다
+
+    다음 틱 시각을 절대 시간 기준으로 계산하므로
+    물리 연산이나 전송에 걸린 시간만큼 게임이 느려지지 않는다
+
+    :param tick_rate: 초당 시뮬레이션 스텝 수
+    :param max_catch_up: 한 번에 진행할 수 있는 최대 스텝 수
+    """
+
+    def __init__(self, tick_rate=GAME_TICK_RATE, max_catch_up=MAX_CATCH_UP_STEPS, time_func=None):
+        self.timestep = 1 / tick_rate
+        self.max_catch_up = max_catch_up
+        self.time_func = time_func or time.monotonic
+        self.ticks = 0
+        self.wakeups = 0
+        self.overruns = 0
+        self.dropped_steps = 0
+        self.jitter_sum = 0.0
+        self.max_jitter = 0.0
+        self.reset()
+
+    def reset(self):
+        """일시정지 등으로 멈춰있던 시간은 따라잡지 않도록 기준 시각을 초기화"""
+        now = self.time_func()
+        self.last_time = now
+        self.next_tick = now
+        self.accumulator = self.timestep
+
+    def advance(self):
+        """마지막 호출 이후 흐른 시간만큼 진행해야 할 스텝 수를 반환"""
+        now = self.time_func()
+        jitter = max(0.0, now - self.next_tick)
+        self.wakeups += 1
+        self.jitter_sum += jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        # 부동소수점 오차로 timestep에 조금 못 미치는 경우도 한 스텝으로 인정
+        steps = int((self.accumulator + 1e-9) / self.timestep)
+        if steps > self.max_catch_up:
+            self.overruns += 1
+            self.dropped_steps += steps - self.max_catch_up
+            steps = self.max_catch_up
+            self.accumulator = self.timestep * steps
+        self.accumulator -= self.timestep * steps
+        self.ticks += steps
+        self.next_tick = now + self.timestep - self.accumulator
+        return steps
+
+    def time_until_next_tick(self):
+        return max(0.0, self.next_tick - self.time_func())
+
+    def get_metrics(self):
+        return {
+            "ticks": self.ticks,
+            "wakeups": self.wakeups,
+            "overruns": self.overruns,
+            "dropped_steps": self.dropped_steps,
+            "avg_jitter": self.jitter_sum / self.wakeups if self.wakeups else 0.0,
+            "max_jitter": self.max_jitter,
+        }
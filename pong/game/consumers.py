@@ -1,10 +1,20 @@
-from .utils import get_default_session_data
 from .pong_game import NormalPongGame, TournamentPongGame
-from django.core.cache import cache
-from asgiref.sync import sync_to_async
+from .engine import get_engine
+from .broadcast import StateBroadcaster
+from .protocol import select_codec
+from .sharding import shard_host, owner_group, match_group
+from .session_store import session_store
+from .supervisor import match_supervisor
+from common.constants import GAME_ENGINE, GAME_PHYSICS, GAME_SHARDING
 from channels.generic.websocket import AsyncWebsocketConsumer
 import json
-import asyncio
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# MatchSupervisor가 방치된 경기를 정리하면서 소켓을 닫을 때 사용하는 close code
+IDLE_CLOSE_CODE = 4008
 
 
 class GameConsumer(AsyncWebsocketConsumer):
@@ -12,72 +22,135 @@ class GameConsumer(AsyncWebsocketConsumer):
     웹소켓을 연결하여 PongGame을 실행한다
     PongGame을 상속받아 param의 모드에 맞는 객체 생성
     Consumer에서는 socket 통신을, PongGame에서 게임 로직을 처리함
+    GAME_SHARDING을 사용하는 경우 경기를 소유한 shard로 입력을 전달하고 프레임을 중계한다
 
     :param mode: [normal, tournament] 둘 중 하나
     :param userid: 유저 id값
     """
 
     async def connect(self):
-        await self.accept()
-        self.game_task = None
-        self.key_input = None
+        # 클라이언트가 요청한 서브프로토콜에 따라 바이너리, delta 프레임 사용
+        self.codec = select_codec(self.scope.get("subprotocols", []))
+        await self.accept(subprotocol=self.codec.subprotocol)
         self.pause = False
+        self.sharded = GAME_SHARDING
+        self.engine = get_engine(GAME_ENGINE)
+        self.broadcaster = StateBroadcaster(self.send_message)
         self.mode = "tournament"
         if self.scope["url_route"]["kwargs"]["mode"] != "tournament":
             self.mode = "normal"
         self.user_id = self.scope["url_route"]["kwargs"]["userid"]
+        if self.sharded:
+            await self.join_match()
+            return
         self.session_data = await self.get_session_data()
+        # BatchPongEngine은 numpy 배열 상태를 사용한다
+        physics = "numpy" if GAME_ENGINE == "batch" else GAME_PHYSICS
         if self.mode == "tournament":
-            self.game = TournamentPongGame(self.send_callback, self.session_data)
+            self.game = TournamentPongGame(self.send_callback, self.session_data, physics)
         else:
-            self.game = NormalPongGame(self.send_callback, self.session_data)
+            self.game = NormalPongGame(self.send_callback, self.session_data, physics)
 
     async def disconnect(self, close_code):
-        if self.game_task:
-            self.game_task.cancel()
+        self.broadcaster.stop()
+        logger.debug(
+            f"match {self.mode}_{self.user_id} broadcast: {self.broadcaster.get_metrics()}"
+        )
+        if self.sharded:
+            await self.leave_match()
+            return
+        match_supervisor.unregister(self.channel_name)
+        self.engine.remove(self.game)
         if self.game.state != "ended":
             await self.save_game_state()
+        # 연결 처리가 끝나기 전에 대기중인 세션 저장/삭제를 모두 기록
+        await session_store.flush()
 
     async def save_game_state(self):
         """
         게임이 도중에 중단된 경우 세션에 저장
+        게임 루프를 막지 않도록 session_store의 대기열을 통해 기록한다
         """
-        await sync_to_async(cache.set)(
-            f"session_data_{self.mode}_{self.user_id}", self.session_data, 500
-        )
+        session_store.set_deferred(self.mode, self.user_id, self.game.session_data)
 
     async def receive(self, text_data):
-        if text_data == "start":
+        if text_data == "resync":
+            # delta 프로토콜에서 클라이언트가 상태를 잃어버린 경우 다음 state를 keyframe으로 전송
+            self.codec.request_keyframe()
+        elif self.sharded:
+            await self.forward_to_shard(text_data)
+        elif text_data == "start":
             self.start_game()
         elif text_data == "pause":
-            self.pause = True
+            self.set_pause(True)
         elif text_data == "resume":
-            self.pause = False
+            self.set_pause(False)
         else:
-            self.key_input = json.loads(text_data)
+            match_supervisor.touch(self.channel_name)
+            self.engine.process_key_input(self.game, json.loads(text_data))
+
+    def set_pause(self, pause):
+        self.pause = pause
+        self.engine.set_paused(self.game, pause)
+        match_supervisor.set_paused(self.channel_name, pause)
 
     async def send_callback(self, data):
-        """콜백함수로 활용"""
-        await self.send(text_data=json.dumps(data))
-
-    async def game_loop(self):
-        try:
-            while True:
-                while self.pause:
-                    await asyncio.sleep(0.1)
-                if self.key_input:
-                    self.game.process_key_input(self.key_input)
-                    self.key_input = None
-                self.game.move_panels()
-                await self.game.update()
-                await asyncio.sleep(0.006)
-        except asyncio.CancelledError:
-            pass
+        """
+        콜백함수로 활용
+        state는 StateBroadcaster의 주기에 맞춰 전송하고
+        그 외 이벤트는 대기중인 state를 먼저 보낸 뒤 즉시 전송한다
+        """
+        if data["type"] == "state":
+            await self.broadcaster.publish(data)
+            return
+        await self.broadcaster.flush()
+        await self.send_message(data)
+
+    async def send_message(self, data):
+        await self.send(**self.codec.encode(data))
 
     def start_game(self):
-        self.game_task = asyncio.create_task(self.game_loop())
+        # 엔진이 경기를 진행시키고 Consumer는 프레임만 중계한다
+        # start를 여러 번 보내도 엔진과 supervisor에는 경기 하나만 등록된다
+        self.engine.add(self.game)
+        self.engine.set_paused(self.game, self.pause)
+        self.engine.ensure_running()
+        match_supervisor.register(
+            self.channel_name, self.game, self.engine, self.mode, self.user_id, self.evict
+        )
+        match_supervisor.set_paused(self.channel_name, self.pause)
+
+    async def evict(self):
+        """MatchSupervisor가 경기를 정리한 뒤 호출, 상태는 이미 저장되어 있다"""
+        await self.close(code=IDLE_CLOSE_CODE)
 
     async def get_session_data(self):
-        default_data = get_default_session_data(self.user_id, self.mode)
-        session_data = await cache.aget(f"session_data_{self.mode}_{self.user_id}", default_data)
-        return session_data
+        return await session_store.get(self.mode, self.user_id)
+
+    async def join_match(self):
+        """경기를 소유한 shard에 참가를 요청하고 경기 프레임을 구독"""
+        await shard_host.ensure_running()
+        self.match_group = match_group(self.mode, self.user_id)
+        await self.channel_layer.group_add(self.match_group, self.channel_name)
+        await self.send_to_shard("match.join", mode=self.mode, user_id=self.user_id)
+
+    async def leave_match(self):
+        await self.send_to_shard("match.leave")
+        await self.channel_layer.group_discard(self.match_group, self.channel_name)
+
+    async def forward_to_shard(self, text_data):
+        if text_data == "start":
+            await self.send_to_shard("match.start")
+        elif text_data in ("pause", "resume"):
+            await self.send_to_shard("match.pause", paused=text_data == "pause")
+        else:
+            await self.send_to_shard("match.input", key_input=json.loads(text_data))
+
+    async def send_to_shard(self, message_type, **kwargs):
+        await self.channel_layer.group_send(
+            owner_group(self.user_id), {"type": message_type, "group": self.match_group, **kwargs}
+        )
+
+    async def match_frame(self, event):
+        """shard가 match group으로 보낸 프레임을 클라이언트로 전송"""
+        await self.send_callback(event["data"])
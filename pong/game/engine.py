@@ -0,0 +1,276 @@
+import numpy as np
+import asyncio
+import logging
+
+from .clock import GameClock
+from .standalone import standalone_engine
+from .workers import worker_pool
+
+
+logger = logging.getLogger(__name__)
+
+SUB_STEPS = 10
+PANEL_SPEED = 0.2
+PANEL_LIMIT = 7
+
+# 사이드 4개 평면의 법선벡터, 원점으로부터의 거리는 모두 10
+SIDE_NORMALS = np.array(
+    [
+        [1.0, 0.0, 0.0],
+        [-1.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.0, -1.0, 0.0],
+    ]
+)
+SIDE_DISTANCE = 10
+GOAL_LINE = 48
+PANEL_DISTANCE = 50
+PANEL1_NORMAL = np.array([0.0, 0.0, -1.0])
+PANEL2_NORMAL = np.array([0.0, 0.0, 1.0])
+INERTIA = (2 / 5) * 4 * 4
+
+
+class BatchPongEngine:
+    """
+    프로세스에 존재하는 모든 PongGame의 물리 연산을 한 번에 처리하는 엔진
+    공과 판넬의 위치, 벡터, 회전값을 (N, 3) 배열로 모아두고
+    매 틱마다 모든 경기를 벡터 연산으로 진행시킨 뒤
+    경기별 이벤트(득점, 상태)를 각 게임 객체로 전달한다
+
+    :param capacity: 초기 슬롯 개수, 부족하면 두 배씩 늘어난다
+    """
+
+    def __init__(self, capacity=64, clock=None):
+        self.clock = clock or GameClock()
+        self.games = {}  # slot -> PongGame
+        self.slots = {}  # id(PongGame) -> slot
+        self.free_slots = []
+        self._task = None
+        # 진행중인 경기가 없으면 run 루프는 이 이벤트를 기다린다
+        self._wake = asyncio.Event()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        def grow(array, shape, dtype=np.float64):
+            new_array = np.zeros(shape, dtype=dtype)
+            if array is not None:
+                new_array[: len(array)] = array
+            return new_array
+
+        old_capacity = getattr(self, "capacity", 0)
+        self.ball_pos = grow(getattr(self, "ball_pos", None), (capacity, 3))
+        self.ball_vec = grow(getattr(self, "ball_vec", None), (capacity, 3))
+        self.ball_rot = grow(getattr(self, "ball_rot", None), (capacity, 3))
+        self.panel1_pos = grow(getattr(self, "panel1_pos", None), (capacity, 3))
+        self.panel2_pos = grow(getattr(self, "panel2_pos", None), (capacity, 3))
+        self.key_state = grow(getattr(self, "key_state", None), (capacity, 8), bool)
+        self.active = grow(getattr(self, "active", None), (capacity,), bool)
+        self.free_slots.extend(range(capacity - 1, old_capacity - 1, -1))
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self.games)
+
+    def add(self, game):
+        """게임의 현재 상태를 배열로 옮기고 슬롯을 할당한다"""
+        if id(game) in self.slots:
+            return self.slots[id(game)]
+        if not self.free_slots:
+            self._allocate(self.capacity * 2)
+        slot = self.free_slots.pop()
+        self.ball_pos[slot] = game.ball_pos
+        self.ball_vec[slot] = game.ball_vec
+        self.ball_rot[slot] = game.ball_rot
+        self.panel1_pos[slot] = game.panel1_pos
+        self.panel2_pos[slot] = game.panel2_pos
+        self.key_state[slot] = game.key_state
+        self.active[slot] = True
+        self.games[slot] = game
+        self.slots[id(game)] = slot
+        self._wake.set()
+        return slot
+
+    def remove(self, game):
+        """슬롯의 상태를 게임 객체에 되돌려주고 슬롯을 반환한다"""
+        slot = self.slots.pop(id(game), None)
+        if slot is None:
+            return
+        game.ball_pos = self.ball_pos[slot].copy()
+        game.ball_vec = self.ball_vec[slot].copy()
+        game.ball_rot = self.ball_rot[slot].copy()
+        game.panel1_pos = self.panel1_pos[slot].copy()
+        game.panel2_pos = self.panel2_pos[slot].copy()
+        self.active[slot] = False
+        del self.games[slot]
+        self.free_slots.append(slot)
+        self._wake.set()
+
+    def set_paused(self, game, paused):
+        slot = self.slots.get(id(game))
+        if slot is not None:
+            self.active[slot] = not paused
+            if not paused:
+                self._wake.set()
+
+    def process_key_input(self, game, key_input):
+        game.process_key_input(key_input)
+        slot = self.slots.get(id(game))
+        if slot is not None:
+            self.key_state[slot] = game.key_state
+
+    def move_panels(self):
+        """PongGame.move_panels를 모든 활성 슬롯에 대해 수행"""
+        keys = self.key_state & self.active[:, None]
+        self._move_axis(self.panel1_pos, 1, keys[:, 0], keys[:, 2], PANEL_SPEED)
+        self._move_axis(self.panel1_pos, 0, keys[:, 1], keys[:, 3], -PANEL_SPEED)
+        self._move_axis(self.panel2_pos, 1, keys[:, 4], keys[:, 6], PANEL_SPEED)
+        self._move_axis(self.panel2_pos, 0, keys[:, 5], keys[:, 7], PANEL_SPEED)
+
+    def _move_axis(self, panel_pos, axis, first, second, speed):
+        # 두 키가 모두 눌린 경우 first 키가 우선한다
+        delta = np.where(first, speed, np.where(second, -speed, 0.0))
+        moved = first | second
+        clamped = np.clip(panel_pos[:, axis] + delta, -PANEL_LIMIT, PANEL_LIMIT)
+        panel_pos[:, axis] = np.where(moved, clamped, panel_pos[:, axis])
+
+    def step(self):
+        """
+        PongGame.step을 모든 활성 슬롯에 대해 벡터 연산으로 수행
+        득점이 발생한 슬롯의 [(slot, scoring_player)] 리스트를 반환
+        """
+        events = []
+        # 사이드 벽과 충돌한 경기는 해당 틱의 남은 스텝을 진행하지 않는다
+        moving = self.active.copy()
+        for _ in range(SUB_STEPS):
+            if not moving.any():
+                break
+            movement = self.ball_vec * (0.4 / SUB_STEPS)
+            self.ball_pos[moving] += movement[moving]
+
+            side_hit = self._collide_with_sides(moving)
+            moving &= ~side_hit
+            events.extend(self._collide_with_goal_area(moving))
+        return events
+
+    def _collide_with_sides(self, moving):
+        hit_any = np.zeros(self.capacity, dtype=bool)
+        for normal in SIDE_NORMALS:
+            distance = np.abs(self.ball_pos @ normal + SIDE_DISTANCE)
+            hit = moving & ~hit_any & (distance <= 2)
+            if not hit.any():
+                continue
+            self.ball_rot[hit] -= normal * 0.01
+            self.ball_pos[hit] -= normal * distance[hit, None]
+            self.ball_pos[hit] += normal * 2
+            self._reflect(hit, normal)
+            hit_any |= hit
+        return hit_any
+
+    def _collide_with_goal_area(self, moving):
+        events = []
+        z = self.ball_pos[:, 2]
+        for in_goal, panel_pos, normal, scoring_player in (
+            (moving & (z >= GOAL_LINE), self.panel1_pos, PANEL1_NORMAL, "right"),
+            (moving & (z <= -GOAL_LINE), self.panel2_pos, PANEL2_NORMAL, "left"),
+        ):
+            if not in_goal.any():
+                continue
+            offset = np.abs(self.ball_pos[:, :2] - panel_pos[:, :2])
+            in_panel = (offset <= 4).all(axis=1)
+            self._hit_panel(in_goal & in_panel, panel_pos, normal)
+
+            scored = in_goal & ~in_panel
+            if scored.any():
+                direction = 1.0 if scoring_player == "left" else -1.0
+                self.ball_pos[scored] = 0.0
+                self.ball_vec[scored] = (0.0, 0.0, direction)
+                events.extend((int(slot), scoring_player) for slot in np.flatnonzero(scored))
+        return events
+
+    def _hit_panel(self, hit, panel_pos, normal):
+        if not hit.any():
+            return
+        distance = np.abs(self.ball_pos[hit] @ normal + PANEL_DISTANCE)
+        self.ball_rot[hit] -= normal * 0.01
+        self.ball_pos[hit] -= normal * distance[:, None]
+        self.ball_pos[hit] += normal * 2
+        self._reflect(hit, normal)
+
+        # 구름 마찰력에 의한 회전 감속
+        rot = self.ball_rot[hit]
+        friction_torque = -rot / np.linalg.norm(rot, axis=1)[:, None] * -rot
+        rot += friction_torque / INERTIA * 0.1
+        rot *= 0.5
+        self.ball_rot[hit] = rot
+
+        # 판넬과 부딪힌 위치에 따라 공의 방향 보정
+        self.ball_vec[hit, :2] = (2 - (panel_pos[hit, :2] - self.ball_pos[hit, :2])) / 24
+        self.ball_vec[hit, 2] += normal[2] * 0.04
+
+    def _reflect(self, hit, normal):
+        dot_product = self.ball_vec[hit] @ normal
+        self.ball_vec[hit] -= normal * dot_product[:, None] * 2
+
+    async def tick(self, steps=1):
+        for _ in range(steps):
+            self.move_panels()
+            for slot, scoring_player in self.step():
+                game = self.games.get(slot)
+                if game:
+                    await game.update_score_and_check_win(scoring_player)
+        for slot in np.flatnonzero(self.active):
+            game = self.games.get(int(slot))
+            if game:
+                await game.send_callback(self.get_state(int(slot)))
+
+    def get_state(self, slot):
+        return {
+            "type": "state",
+            "ball_pos": self.ball_pos[slot].tolist(),
+            "panel1": self.panel1_pos[slot].tolist(),
+            "panel2": self.panel2_pos[slot].tolist(),
+            "ball_rot": self.ball_rot[slot].tolist(),
+        }
+
+    def ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self.run())
+
+    async def run(self):
+        # Event는 처음 기다린 이벤트 루프에 묶이므로 run마다 새로 만든다
+        self._wake = asyncio.Event()
+        try:
+            self.clock.reset()
+            while self.games:
+                if not self.active.any():
+                    # 모든 경기가 일시정지된 경우 resume 또는 remove까지 깨어나지 않는다
+                    self._wake.clear()
+                    await self._wake.wait()
+                    self.clock.reset()
+                    continue
+                steps = self.clock.advance()
+                if steps:
+                    try:
+                        await self.tick(steps)
+                    except Exception:
+                        logger.exception("batch engine tick failed")
+                await asyncio.sleep(self.clock.time_until_next_tick())
+        except asyncio.CancelledError:
+            pass
+
+
+batch_engine = BatchPongEngine()
+
+
+# GAME_ENGINE 설정값별 엔진
+ENGINES = {
+    "standalone": standalone_engine,
+    "batch": batch_engine,
+    "process": worker_pool,
+}
+
+
+def get_engine(name):
+    return ENGINES.get(name, standalone_engine)
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+import hashlib
+import time
+
+from common.constants import GAME_HISTORY_CACHE_TTL
+
+
+HISTORY_PARAMS = ["page", "size", "cursor", "total"]
+
+
+def version_key(user_id):
+    return f"game_history_version_{user_id}"
+
+
+def new_version():
+    # 버전 키가 만료/제거된 뒤 예전 버전 번호가 다시 쓰이지 않도록 시각으로 시작한다
+    return time.time_ns()
+
+
+async def get_history_version(user_id):
+    version = await cache.aget(version_key(user_id))
+    if version is None:
+        await cache.aadd(version_key(user_id), new_version(), None)
+        version = await cache.aget(version_key(user_id))
+    return version
+
+
+def bump_history_versions(user_ids):
+    """
+    유저의 게임이 저장되면 버전을 올려서 이전 버전으로 캐시된 페이지를 더 이상 사용하지 않는다
+    게임을 저장한 트랜잭션의 on_commit에서 호출
+    """
+    for user_id in user_ids:
+        try:
+            cache.incr(version_key(user_id))
+        except ValueError:
+            cache.set(version_key(user_id), new_version(), None)
+
+
+def history_page_key(user_id, version, query):
+    """조회 파라미터 중 페이지 내용에 영향을 주는 값만 사용해서 캐시 키 생성"""
+    params = "&".join(f"{name}={query.get(name)}" for name in HISTORY_PARAMS if name in query)
+    digest = hashlib.md5(params.encode()).hexdigest()
+    return f"game_history_{user_id}_{version}_{digest}"
+
+
+async def get_cached_page(key):
+    return await cache.aget(key)
+
+
+async def set_cached_page(key, data):
+    await cache.aset(key, data, GAME_HISTORY_CACHE_TTL)
@@ -0,0 +1,62 @@
+from django.db.models import Q
+
+from .models import LeaderboardEntry
+from common.constants import LEADERBOARD_MIN_GAMES
+
+
+# 정렬 기준별 순서, LeaderboardEntry의 인덱스와 같은 순서를 사용한다
+ORDERINGS = {
+    "wins": ("wins", "win_rate"),
+    "win_rate": ("win_rate", "wins"),
+}
+
+
+def ranked_entries(mode, sort):
+    queryset = LeaderboardEntry.objects.filter(mode=mode)
+    if sort == "win_rate":
+        # 몇 판만 이긴 유저가 상위권을 차지하지 않도록 최소 게임 수를 둔다
+        queryset = queryset.filter(games__gte=LEADERBOARD_MIN_GAMES)
+    first, second = ORDERINGS[sort]
+    return queryset.order_by(f"-{first}", f"-{second}", "user_id")
+
+
+def leaderboard_page(mode, sort, page_number, page_size):
+    start = (page_number - 1) * page_size
+    entries = ranked_entries(mode, sort).select_related("user")[start : start + page_size]
+    return [
+        {
+            "rank": start + i + 1,
+            "userId": entry.user_id,
+            "login": entry.user.login,
+            "games": entry.games,
+            "wins": entry.wins,
+            "winRate": entry.win_rate,
+        }
+        for i, entry in enumerate(entries)
+    ]
+
+
+def get_rank(user_id, mode, sort):
+    """
+    유저 앞에 있는 항목 수 + 1
+
+    정렬 인덱스의 범위 조건으로 세므로 전체 테이블을 정렬하지는 않지만
+    COUNT는 앞에 있는 인덱스 항목을 모두 읽으므로 비용은 O(log n)이 아닌 O(순위)이다
+    (win_rate 정렬은 games 조건 때문에 해당 행도 확인한다)
+
+    랭킹 항목 수는 유저 수 이하이고 갱신은 모든 프로세스에서 게임 저장 트랜잭션과 함께 일어난다
+    O(log n) 순위 조회가 가능한 공유 정렬 구조(Redis sorted set 등)는 기본 배포(FileBasedCache)에 없고
+    프로세스 내부 정렬 캐시는 다른 프로세스의 갱신을 반영하지 못하므로 DB 인덱스 COUNT를 사용한다
+    """
+    queryset = ranked_entries(mode, sort)
+    entry = queryset.filter(user_id=user_id).first()
+    if entry is None:
+        return None
+    first, second = ORDERINGS[sort]
+    first_value, second_value = getattr(entry, first), getattr(entry, second)
+    ahead = queryset.filter(
+        Q(**{f"{first}__gt": first_value})
+        | Q(**{first: first_value, f"{second}__gt": second_value})
+        | Q(**{first: first_value, second: second_value, "user_id__lt": user_id})
+    )
+    return ahead.count() + 1
@@ -0,0 +1,81 @@
+import asyncio
+import atexit
+import logging
+import sys
+
+from .records import game_result_sink
+from .session_store import session_store
+from .sharding import shard_host
+from common.constants import GAME_SHARDING
+from common.http_client import http_client
+
+
+logger = logging.getLogger(__name__)
+
+
+async def lifespan(scope, receive, send):
+    """
+    ASGI lifespan 프로토콜 처리 (uvicorn 등)
+    daphne는 lifespan을 보내지 않으므로 install_reactor_hooks로 같은 처리를 연결한다
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await startup()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def startup():
+    """
+    외부 API용 HTTP 연결 풀을 만들고
+    sharding 사용 시 이 프로세스의 shard 호스트를 시작한다
+    소켓이 연결되지 않은 shard도 다른 프로세스에서 group_send한 경기 메시지를 받아야 한다
+    """
+    await http_client.start()
+    if GAME_SHARDING:
+        await shard_host.ensure_running()
+
+
+async def shutdown():
+    """메모리에 대기중인 게임 결과와 세션 저장을 기록한 뒤 연결 풀을 닫는다"""
+    await drain()
+    await http_client.close()
+
+
+async def drain():
+    await game_result_sink.close()
+    await session_store.flush()
+    logger.info(f"game results drained: {game_result_sink.get_metrics()}")
+
+
+def install_reactor_hooks():
+    """
+    daphne가 사용하는 twisted reactor의 시작, 종료 이벤트에 startup, shutdown을 연결
+    daphne는 application을 불러오기 전에 reactor를 설치하므로 asgi.py에서 호출한다
+    reactor가 없는 서버에서는 아무것도 하지 않는다
+
+    :return: 연결했는지 여부
+    """
+    reactor = sys.modules.get("twisted.internet.reactor")
+    if reactor is None:
+        return False
+    from twisted.internet import defer
+
+    reactor.callWhenRunning(lambda: asyncio.ensure_future(startup()))
+    reactor.addSystemEventTrigger(
+        "before", "shutdown", lambda: defer.Deferred.fromFuture(asyncio.ensure_future(shutdown()))
+    )
+    return True
+
+
+def drain_at_exit():
+    # reactor 종료 이벤트 없이 프로세스가 끝나는 경우에도 남은 기록을 동기적으로 저장
+    game_result_sink.drain()
+    session_store.drain()
+
+
+atexit.register(drain_at_exit)
@@ -0,0 +1,126 @@
+from django.core.management.base import BaseCommand
+from unittest.mock import AsyncMock
+import asyncio
+import time
+
+from game.broadcast import StateBroadcaster
+from game.standalone import StandaloneEngine
+from game.pong_game import NormalPongGame
+from game.utils import get_default_session_data
+
+
+async def poll_paused(paused):
+    """이전 방식: 일시정지 중 0.1초마다 깨어나서 확인"""
+    while paused[0]:
+        await asyncio.sleep(0.1)
+
+
+async def discard(state):
+    pass
+
+
+class PollingBroadcaster(StateBroadcaster):
+    """이전 방식: 보낼 state가 없어도 주기마다 깨어난다"""
+
+    async def run(self):
+        try:
+            self.clock.reset()
+            while True:
+                if self.clock.advance():
+                    await self.flush()
+                await asyncio.sleep(self.clock.time_until_next_tick())
+        except asyncio.CancelledError:
+            pass
+
+
+class Command(BaseCommand):
+    help = (
+        "일시정지된 경기들이 대기하는 동안의 이벤트 루프 반복 횟수와 CPU 시간 비교 "
+        "(경기 루프, GAME_BROADCAST_RATE로 제한된 state 전송)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--matches", type=int, default=1000)
+        parser.add_argument("--seconds", type=float, default=2.0)
+        parser.add_argument("--broadcast-rate", type=int, default=30)
+
+    def handle(self, *args, **options):
+        self.broadcast_rate = options["broadcast_rate"]
+        cases = (
+            ("polling", self.run_polling),
+            ("event", self.run_event),
+            ("broadcast.polling", self.run_broadcast_polling),
+            ("broadcast", self.run_broadcast),
+        )
+        for name, run in cases:
+            iterations, cpu_seconds = asyncio.run(
+                self.measure(run, options["matches"], options["seconds"])
+            )
+            self.stdout.write(
+                f"{name:<18} {iterations:8d} loop iterations {cpu_seconds * 1e3:8.1f} ms cpu"
+            )
+
+    async def measure(self, run, matches, seconds):
+        loop = asyncio.get_running_loop()
+        iterations = 0
+        run_once = loop._run_once
+
+        def counting_run_once():
+            nonlocal iterations
+            iterations += 1
+            run_once()
+
+        loop._run_once = counting_run_once
+        try:
+            return await run(matches, seconds, lambda: iterations)
+        finally:
+            loop._run_once = run_once
+
+    async def run_polling(self, matches, seconds, count):
+        paused = [True]
+        tasks = [asyncio.create_task(poll_paused(paused)) for _ in range(matches)]
+        await asyncio.sleep(0)
+        start_iterations, start = count(), time.process_time()
+        await asyncio.sleep(seconds)
+        result = count() - start_iterations, time.process_time() - start
+        paused[0] = False
+        await asyncio.gather(*tasks)
+        return result
+
+    async def run_event(self, matches, seconds, count):
+        engine = StandaloneEngine()
+        games = [
+            NormalPongGame(AsyncMock(), get_default_session_data(1, "normal"))
+            for _ in range(matches)
+        ]
+        for game in games:
+            engine.add(game)
+            engine.set_paused(game, True)
+        await asyncio.sleep(0.05)
+        start_iterations, start = count(), time.process_time()
+        await asyncio.sleep(seconds)
+        result = count() - start_iterations, time.process_time() - start
+        for game in games:
+            engine.remove(game)
+        return result
+
+    async def run_broadcast_polling(self, matches, seconds, count):
+        return await self.run_broadcasters(PollingBroadcaster, matches, seconds, count)
+
+    async def run_broadcast(self, matches, seconds, count):
+        return await self.run_broadcasters(StateBroadcaster, matches, seconds, count)
+
+    async def run_broadcasters(self, broadcaster_class, matches, seconds, count):
+        """일시정지 직전에 마지막 state를 보낸 consumer들의 broadcaster"""
+        broadcasters = [
+            broadcaster_class(discard, rate=self.broadcast_rate) for _ in range(matches)
+        ]
+        for broadcaster in broadcasters:
+            await broadcaster.publish({"type": "state"})
+        await asyncio.sleep(3 / self.broadcast_rate)
+        start_iterations, start = count(), time.process_time()
+        await asyncio.sleep(seconds)
+        result = count() - start_iterations, time.process_time() - start
+        for broadcaster in broadcasters:
+            broadcaster.stop()
+        return result
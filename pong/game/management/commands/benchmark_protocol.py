@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+import time
+
+from game.protocol import JsonCodec, BinaryCodec
+from game.pong_game import NormalPongGame
+from game.utils import get_default_session_data
+
+
+class Command(BaseCommand):
+    help = "state 프레임 프로토콜(json, binary, delta)별 프레임 크기와 인코딩 시간 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--frames", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        frames = options["frames"]
+        game = NormalPongGame(None, get_default_session_data(1, "normal"))
+        game.ball_vec[:2] = (0.13, -0.27)
+        game.key_state[0] = True
+        states = []
+        for i in range(frames):
+            # 판넬은 가끔씩만 움직인다
+            game.key_state[3] = i % 200 < 20
+            game.move_panels()
+            game.step()
+            states.append(game.get_state())
+
+        codecs = {
+            "json": JsonCodec(),
+            "json.delta": JsonCodec(delta=True),
+            "binary": BinaryCodec(),
+            "binary.delta": BinaryCodec(delta=True),
+        }
+        for name, codec in codecs.items():
+            total_bytes = 0
+            start = time.perf_counter()
+            for state in states:
+                frame = next(iter(codec.encode(state).values()))
+                total_bytes += len(frame)
+            seconds = time.perf_counter() - start
+            self.stdout.write(
+                f"{name:<14} {total_bytes / frames:7.1f} bytes/frame "
+                f"{seconds / frames * 1e6:8.3f} us/frame"
+            )
@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+import asyncio
+import pickle
+import tempfile
+import time
+
+from game.session_store import SessionStore, session_key
+from game.session_state import SessionState
+from game.utils import get_default_session_data
+
+
+class Command(BaseCommand):
+    help = "FileBasedCache 직접 사용과 SessionStore(2계층, write-behind)의 session data 처리 시간 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--updates", type=int, default=3)
+
+    def handle(self, *args, **options):
+        users, updates = options["users"], options["updates"]
+        with tempfile.TemporaryDirectory() as directory:
+            results = {
+                "file": asyncio.run(self.run_file_cache(FileBasedCache(directory, {}), options)),
+                "store+file": asyncio.run(
+                    self.run_store(FileBasedCache(f"{directory}/store", {}), options)
+                ),
+                "store+locmem": asyncio.run(self.run_store(LocMemCache("bench", {}), options)),
+            }
+        operations = users * (updates + 2)
+        for name, seconds in results.items():
+            self.stdout.write(
+                f"{name:<14} {seconds * 1e3:9.1f} ms total {seconds / operations * 1e6:8.1f} us/op"
+            )
+        self.compare_serialization()
+
+    def compare_serialization(self, rounds=20000):
+        """기존 dict와 SessionState 레코드의 pickle 크기 및 시간"""
+        state = SessionState.default(1, "tournament")
+        for i in range(2):
+            state.match_results.append(
+                {"player1_nick": "p1", "player2_nick": "p2", "player1_score": 5, "player2_score": i}
+            )
+            state.win_history.append(i)
+        for name, value in (("dict", state.to_dict()), ("record", state.to_record())):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                pickle.loads(pickle.dumps(value))
+            seconds = time.perf_counter() - start
+            self.stdout.write(
+                f"pickle {name:<7} {len(pickle.dumps(value)):5d} bytes "
+                f"{seconds / rounds * 1e6:6.2f} us/round trip"
+            )
+
+    async def run_file_cache(self, cache, options):
+        """기존 방식: 접속, 경기 결과 갱신, 세션 조회마다 파일을 읽고 쓴다"""
+        start = time.perf_counter()
+        for user_id in range(options["users"]):
+            key = session_key("tournament", user_id)
+            data = await cache.aget(key, get_default_session_data(user_id, "tournament"))
+            for score in range(options["updates"]):
+                data["left_score"] = score
+                cache.set(key, data, 500)
+            await cache.aget(key)
+        return time.perf_counter() - start
+
+    async def run_store(self, backend, options):
+        store = SessionStore(backend=backend)
+        start = time.perf_counter()
+        for user_id in range(options["users"]):
+            state = await store.get("tournament", user_id)
+            for score in range(options["updates"]):
+                state.left_score = score
+                store.set_deferred("tournament", user_id, state)
+            await store.get("tournament", user_id)
+        await store.flush()
+        return time.perf_counter() - start
@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from asgiref.sync import sync_to_async
+import asyncio
+import time
+
+from auth.models import User
+from game.models import Game, Tournament
+from game.records import save_tournament
+
+
+MATCH_RESULTS = [
+    {"player1_nick": "p1", "player2_nick": "p2", "player1_score": 5, "player2_score": 3},
+    {"player1_nick": "p3", "player2_nick": "p4", "player1_score": 1, "player2_score": 5},
+    {"player1_nick": "p1", "player2_nick": "p4", "player1_score": 5, "player2_score": 4},
+]
+
+
+async def save_each(user_id, match_results):
+    """이전 방식: 경기마다 create, 호출마다 스레드 전환과 autocommit"""
+    tournament = await sync_to_async(Tournament.objects.create)(user_id=user_id)
+    for i, match in enumerate(match_results):
+        game = await sync_to_async(Game.objects.create)(
+            user_id=user_id,
+            tournament_id=tournament.id,
+            player1_nick=match["player1_nick"],
+            player2_nick=match["player2_nick"],
+            player1_score=match["player1_score"],
+            player2_score=match["player2_score"],
+            mode="Tournament",
+        )
+        setattr(tournament, f"game{i + 1}", game)
+    await sync_to_async(tournament.save)()
+
+
+async def save_bulk(user_id, match_results):
+    await sync_to_async(save_tournament)(user_id, match_results)
+
+
+class Command(BaseCommand):
+    help = "동시에 끝나는 토너먼트 결과 저장의 쿼리 수와 소요 시간 비교 (임시 sqlite DB 사용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tournaments", type=int, default=500)
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0)
+        try:
+            User.objects.create(id=1, email="bench@example.com", login="bench")
+            for name, save in (("create", save_each), ("bulk", save_bulk)):
+                self.queries = 0
+                seconds = asyncio.run(self.run(save, options["tournaments"]))
+                self.stdout.write(
+                    f"{name:<8} {seconds * 1e3:8.1f} ms "
+                    f"{self.queries / options['tournaments']:5.1f} queries/tournament"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def set_counting(self, enabled):
+        # DB 연결은 스레드마다 따로 있으므로 sync_to_async가 사용하는 스레드에서 등록한다
+        if enabled:
+            connection.execute_wrappers.append(self.count_query)
+        else:
+            connection.execute_wrappers.remove(self.count_query)
+
+    async def run(self, save, tournaments):
+        await sync_to_async(self.set_counting)(True)
+        start = time.perf_counter()
+        await asyncio.gather(*(save(1, MATCH_RESULTS) for _ in range(tournaments)))
+        seconds = time.perf_counter() - start
+        await sync_to_async(self.set_counting)(False)
+        return seconds
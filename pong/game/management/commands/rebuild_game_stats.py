@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from game.models import UserGameStats
+from game.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Game 테이블로 유저별 게임 통계(UserGameStats)를 다시 계산"
+
+    def handle(self, *args, **options):
+        rebuild_stats()
+        self.stdout.write(f"rebuilt stats for {UserGameStats.objects.count()} users")
@@ -2,6 +2,7 @@ from django.db import models
 from auth.models import User
 
 GAME_MODES = [("1ON1", "1on1"), ("TOURNAMENT", "Tournament")]
+LEADERBOARD_MODES = [("all", "All"), ("normal", "Normal"), ("tournament", "Tournament")]
 
 
 class Game(models.Model):
@@ -14,6 +15,12 @@ class Game(models.Model):
     tournament = models.ForeignKey("Tournament", on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # 유저별 게임 기록을 최신순으로 조회 (cursor 페이지네이션)
+            models.Index(fields=["user", "-created_at", "-id"], name="game_user_created_idx"),
+        ]
+
 
 class Tournament(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=False)
@@ -26,3 +33,41 @@ class Tournament(models.Model):
     game3 = models.ForeignKey(
         "Game", related_name="tournament_game3", on_delete=models.SET_NULL, null=True
     )
+
+
+class UserGameStats(models.Model):
+    """
+    유저별 게임 기록 집계, Game이 저장될 때 game.stats.apply_game_stats로 함께 갱신된다
+    승패와 득실점은 player1(유저 본인) 기준
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    games_played = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    goals_for = models.IntegerField(default=0)
+    goals_against = models.IntegerField(default=0)
+    normal_games = models.IntegerField(default=0)
+    tournament_games = models.IntegerField(default=0)
+
+
+class LeaderboardEntry(models.Model):
+    """
+    모드별 랭킹 집계, UserGameStats와 같은 트랜잭션에서 갱신된다
+    정렬 기준마다 (mode, 정렬 필드, user) 인덱스가 있어서 페이지 조회와 순위 계산에 인덱스를 사용한다
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    mode = models.CharField(max_length=10, choices=LEADERBOARD_MODES)
+    games = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    win_rate = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "mode"], name="leaderboard_user_mode_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["mode", "-wins", "-win_rate", "user"], name="leaderboard_wins_idx"),
+            models.Index(fields=["mode", "-win_rate", "-wins", "user"], name="leaderboard_rate_idx"),
+        ]
@@ -0,0 +1,57 @@
+from datetime import datetime
+from django.core.cache import cache
+from django.db.models import Q
+import base64
+import json
+
+from common.constants import GAME_COUNT_CACHE_TTL
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(game):
+    """마지막으로 전달한 게임의 (created_at, id)를 클라이언트가 해석하지 않는 문자열로 변환"""
+    raw = json.dumps([game.created_at.isoformat(), game.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, game_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(game_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def keyset_page(queryset, cursor, size):
+    """
+    (created_at, id) 내림차순으로 cursor 다음의 게임을 size개 조회
+    OFFSET을 사용하지 않으므로 (user, created_at, id) 인덱스로 몇 번째 페이지든 같은 비용이 든다
+
+    :return: (게임 리스트, 다음 페이지 cursor 또는 None)
+    """
+    if cursor:
+        created_at, game_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=game_id)
+        )
+    games = list(queryset.order_by("-created_at", "-id")[: size + 1])
+    if len(games) <= size:
+        return games, None
+    games = games[:size]
+    return games, encode_cursor(games[-1])
+
+
+def cached_count(queryset, key):
+    """
+    전체 개수는 GAME_COUNT_CACHE_TTL초 동안 캐시된 값을 사용
+    key에 게임 기록 version을 포함하면 게임이 저장될 때 새로 계산된다
+    """
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, GAME_COUNT_CACHE_TTL)
+    return count
@@ -0,0 +1,170 @@
+import numpy as np
+
+
+# 사이드 평면 ((법선벡터), 원점으로부터의 거리, 판정에 사용하는 축, 법선의 부호)
+SIDE_PLANES = (
+    ((1.0, 0.0, 0.0), 10, 0, 1.0),
+    ((-1.0, 0.0, 0.0), 10, 0, -1.0),
+    ((0.0, 1.0, 0.0), 10, 1, 1.0),
+    ((0.0, -1.0, 0.0), 10, 1, -1.0),
+)
+PANEL1_PLANE = ((0.0, 0.0, -1.0), 50)
+PANEL2_PLANE = ((0.0, 0.0, 1.0), 50)
+
+
+class ScalarPhysics:
+    """
+    PongGame의 numpy 물리 연산과 동일한 결과를 내는 float 기반 구현
+    길이 3짜리 ndarray를 매 스텝 생성하지 않도록 상태를 float 슬롯에 저장한다
+
+    사이드 평면은 축에 정렬되어 있으므로 평면과의 거리 계산을
+    한 축의 비교로 대체하고, 충돌이 발생한 경우에만 전체 연산을 수행한다
+    """
+
+    __slots__ = (
+        "bx", "by", "bz",  # 공위치
+        "vx", "vy", "vz",  # 공이 움직이는 방향
+        "rx", "ry", "rz",  # 공의 회전벡터
+        "p1x", "p1y", "p1z",  # panel1의 위치
+        "p2x", "p2y", "p2z",  # panel2의 위치
+    )
+
+    def __init__(self):
+        self.init_game()
+
+    def init_game(self):
+        self.bx, self.by, self.bz = 0.0, 0.0, 0.0
+        self.vx, self.vy, self.vz = 0.0, 0.0, 1.0
+        self.rx, self.ry, self.rz = 0.0, 0.0, 0.0
+        self.p1x, self.p1y, self.p1z = 0.0, 0.0, 50.0
+        self.p2x, self.p2y, self.p2z = 0.0, 0.0, -50.0
+
+    def move_panels(self, key_state):
+        ball_speed = 0.2
+        if key_state[0]:
+            self.p1y = clamp_panel_pos(self.p1y + ball_speed)
+        elif key_state[2]:
+            self.p1y = clamp_panel_pos(self.p1y - ball_speed)
+        if key_state[1]:
+            self.p1x = clamp_panel_pos(self.p1x - ball_speed)
+        elif key_state[3]:
+            self.p1x = clamp_panel_pos(self.p1x + ball_speed)
+        if key_state[4]:
+            self.p2y = clamp_panel_pos(self.p2y + ball_speed)
+        elif key_state[6]:
+            self.p2y = clamp_panel_pos(self.p2y - ball_speed)
+        if key_state[5]:
+            self.p2x = clamp_panel_pos(self.p2x + ball_speed)
+        elif key_state[7]:
+            self.p2x = clamp_panel_pos(self.p2x - ball_speed)
+
+    def step(self):
+        """PongGame.step과 동일, 득점한 플레이어를 반환"""
+        steps = 10
+        scale = 0.4 / steps
+        scoring_player = None
+        for i in range(steps):
+            self.bx += self.vx * scale
+            self.by += self.vy * scale
+            self.bz += self.vz * scale
+
+            if self.check_collision_with_sides():
+                break
+            scoring_player = self.check_collision_with_goal_area() or scoring_player
+        return scoring_player
+
+    def check_collision_with_sides(self):
+        for plane in SIDE_PLANES:
+            normal, d, axis, sign = plane
+            position = self.bx if axis == 0 else self.by
+            # |pos · n + d| / |n| 에서 n이 단위 축벡터인 경우
+            distance = abs(sign * position + d)
+            if distance <= 2:
+                self.collide_with_plane(normal, distance)
+                self.bx += normal[0] * 2
+                self.by += normal[1] * 2
+                self.bz += normal[2] * 2
+                self.reflect(normal)
+                return True
+        return False
+
+    def check_collision_with_goal_area(self):
+        if self.bz >= 48:
+            if abs(self.bx - self.p1x) <= 4 and abs(self.by - self.p1y) <= 4:
+                self.handle_panel_collision(PANEL1_PLANE, self.p1x, self.p1y)
+            else:
+                self.reset_ball("right")
+                return "right"
+        elif self.bz <= -48:
+            if abs(self.bx - self.p2x) <= 4 and abs(self.by - self.p2y) <= 4:
+                self.handle_panel_collision(PANEL2_PLANE, self.p2x, self.p2y)
+            else:
+                self.reset_ball("left")
+                return "left"
+        return None
+
+    def collide_with_plane(self, normal, distance):
+        """공의 회전값을 갱신하고 공의 중심을 평면 위로 옮긴다"""
+        nx, ny, nz = normal
+        self.rx -= nx * 0.01
+        self.ry -= ny * 0.01
+        self.rz -= nz * 0.01
+        self.bx = self.bx - nx * distance
+        self.by = self.by - ny * distance
+        self.bz = self.bz - nz * distance
+
+    def reflect(self, normal):
+        nx, ny, nz = normal
+        dot_product = self.vx * nx + self.vy * ny + self.vz * nz
+        self.vx = self.vx - nx * dot_product * 2
+        self.vy = self.vy - ny * dot_product * 2
+        self.vz = self.vz - nz * dot_product * 2
+
+    def handle_panel_collision(self, panel_plane, panel_x, panel_y):
+        normal, d = panel_plane
+        # panel 평면의 법선은 z축과 평행하다
+        distance = abs(normal[2] * self.bz + d)
+        self.collide_with_plane(normal, distance)
+        self.bx = self.bx + normal[0] * 2
+        self.by = self.by + normal[1] * 2
+        self.bz = self.bz + normal[2] * 2
+
+        self.reflect(normal)
+        self.update_ball_rotation()
+        self.vx = (2 - (panel_x - self.bx)) / 24
+        self.vy = (2 - (panel_y - self.by)) / 24
+        self.vz += normal[2] * 0.04
+
+    def update_ball_rotation(self):
+        # norm은 BLAS 구현(FMA 사용 여부)에 따라 마지막 비트가 달라질 수 있으므로
+        # numpy 구현과 같은 결과를 내기 위해 판넬 충돌시에만 np.linalg.norm을 사용한다
+        norm = float(np.linalg.norm((self.rx, self.ry, self.rz)))
+        inertia = (2 / 5) * 4 * 4
+        rotation = []
+        for r in (self.rx, self.ry, self.rz):
+            friction_torque = -r / norm * -r
+            r += friction_torque / inertia * 0.1
+            rotation.append(r * 0.5)
+        self.rx, self.ry, self.rz = rotation
+
+    def reset_ball(self, scoring_player):
+        direction = 1.0 if scoring_player == "left" else -1.0
+        self.vx, self.vy, self.vz = 0.0, 0.0, direction
+        self.bx, self.by, self.bz = 0.0, 0.0, 0.0
+
+    def get_state(self):
+        return {
+            "type": "state",
+            "ball_pos": [self.bx, self.by, self.bz],
+            "panel1": [self.p1x, self.p1y, self.p1z],
+            "panel2": [self.p2x, self.p2y, self.p2z],
+            "ball_rot": [self.rx, self.ry, self.rz],
+        }
+
+
+def clamp_panel_pos(pos):
+    if pos < -7:
+        return -7.0
+    elif pos > 7:
+        return 7.0
+    return pos
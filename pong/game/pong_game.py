@@ -1,7 +1,10 @@
 from abc import *
-from game.models import Tournament, Game
+from game.models import Game
+from game.records import save_tournament, game_result_sink
 from asgiref.sync import sync_to_async
-from django.core.cache import cache
+from .physics import ScalarPhysics
+from .session_store import session_store
+from .session_state import SessionState
 import numpy as np
 import math
 
@@ -29,8 +32,13 @@ class PongGame(metaclass=ABCMeta):
         """
         raise NotImplementedError("This method must be implemented.")
 
-    def __init__(self, send_callback, session_data):
+    def __init__(self, send_callback, session_data, physics="numpy"):
+        """
+        :param physics: [numpy, scalar] 물리 연산 구현 방식
+            scalar인 경우 ScalarPhysics에 연산을 위임한다
+        """
         self.send_callback = send_callback
+        self.physics = ScalarPhysics() if physics == "scalar" else None
         self.ball_pos = np.array([0.0, 0.0, 0.0])  # 공위치
         self.ball_vec = np.array([0.0, 0.0, 1.0])  # 공이 움직이는 방향
         self.ball_rot = np.array([0.0, 0.0, 0.0])  # 공의 회전벡터
@@ -53,12 +61,14 @@ class PongGame(metaclass=ABCMeta):
         self.panel2_plane = (np.array([0, 0, 1]), 50)
         self.state = "playing"
         self.winner = None
-        self.session_data = session_data
-        self.game_mode = session_data.get("game_mode", "normal")
-        self.player1_score = session_data.get("left_score")
-        self.player2_score = session_data.get("right_score")
+        self.session_data = SessionState.coerce(session_data)
+        self.game_mode = "normal"
+        self.player1_score = self.session_data.left_score
+        self.player2_score = self.session_data.right_score
 
     def init_game(self):
+        if self.physics:
+            return self.physics.init_game()
         self.ball_pos = np.array([0.0, 0.0, 0.0])  # 공위치
         self.ball_vec = np.array([0.0, 0.0, 1.0])  # 공이 움직이는 방향
         self.ball_rot = np.array([0.0, 0.0, 0.0])  # 공의 회전벡터
@@ -71,6 +81,8 @@ class PongGame(metaclass=ABCMeta):
                 self.key_state[KEY_MAPPING[k]] = v
 
     def move_panels(self):
+        if self.physics:
+            return self.physics.move_panels(self.key_state)
         ball_speed = 0.2
         if self.key_state[0]:
             self.panel1_pos[1] = self.clamp_panel_pos(self.panel1_pos[1] + ball_speed)
@@ -98,7 +110,24 @@ class PongGame(metaclass=ABCMeta):
         return pos
 
     async def update(self):
+        await self.simulate()
+        await self.send_callback(self.get_state())
+
+    async def simulate(self):
+        """상태 전송 없이 한 틱을 진행하고 득점을 처리한다"""
+        scoring_player = self.step()
+        if scoring_player:
+            await self.update_score_and_check_win(scoring_player)
+
+    def step(self):
+        """
+        한 틱 동안의 물리 연산만 수행한다
+        득점이 발생한 경우 득점한 플레이어("left" or "right")를 반환
+        """
+        if self.physics:
+            return self.physics.step()
         steps = 10
+        scoring_player = None
         for i in range(steps):
             movement = np.copy(self.ball_vec) * (0.4 / steps)
             self.ball_pos += movement
@@ -107,17 +136,19 @@ class PongGame(metaclass=ABCMeta):
             if collision_plane:
                 self.update_ball_vector(collision_plane)
                 break
-            await self.check_collision_with_goal_area()
-
-        await self.send_callback(
-            {
-                "type": "state",
-                "ball_pos": self.ball_pos.tolist(),
-                "panel1": self.panel1_pos.tolist(),
-                "panel2": self.panel2_pos.tolist(),
-                "ball_rot": self.ball_rot.tolist(),
-            }
-        )
+            scoring_player = self.check_collision_with_goal_area() or scoring_player
+        return scoring_player
+
+    def get_state(self):
+        if self.physics:
+            return self.physics.get_state()
+        return {
+            "type": "state",
+            "ball_pos": self.ball_pos.tolist(),
+            "panel1": self.panel1_pos.tolist(),
+            "panel2": self.panel2_pos.tolist(),
+            "ball_rot": self.ball_rot.tolist(),
+        }
 
     # 벽4가지를 순회하며 어느 벽과 충돌했는지 판별하고 부딪힌 벽을 반환
     def check_collision_with_sides(self):
@@ -147,22 +178,25 @@ class PongGame(metaclass=ABCMeta):
             self.ball_pos[0] * a + self.ball_pos[1] * b + self.ball_pos[2] * c + d
         ) / math.sqrt(a**2 + b**2 + c**2)
 
-    # panel이 위치한 평면과 충돌시
-    async def check_collision_with_goal_area(self):
+    # panel이 위치한 평면과 충돌시, 득점한 경우 공을 초기화하고 득점한 플레이어를 반환
+    def check_collision_with_goal_area(self):
         if self.ball_pos[2] >= 48:  # z좌표가 48이상인경우 #player1쪽 벽과 충돌한경우
             if self.is_ball_in_panel(self.panel1_pos):  # x,y 좌표 판정
                 self.handle_panel_collision(
                     self.panel1_plane, self.panel1_pos
                 )  # panel1과 충돌한경우
             else:
-                await self.update_score_and_check_win("right")  # panel1이 위치한 면에 충돌한경우
+                self.reset_ball("right")  # panel1이 위치한 면에 충돌한경우
+                return "right"
         elif self.ball_pos[2] <= -48:
             if self.is_ball_in_panel(self.panel2_pos):
                 self.handle_panel_collision(
                     self.panel2_plane, self.panel2_pos
                 )  # panel2와 충돌한 경우
             else:
-                await self.update_score_and_check_win("left")
+                self.reset_ball("left")
+                return "left"
+        return None
 
     # 공 중심의 x, y좌표가 panel안에 위치하는지 확인하는 함수
     def is_ball_in_panel(self, panel_pos):
@@ -222,13 +256,12 @@ class PongGame(metaclass=ABCMeta):
         self.ball_pos = np.array([0.0, 0.0, 0.0])
 
     async def update_score_and_check_win(self, scoring_player):
-        self.reset_ball(scoring_player)
         if scoring_player == "left":
             self.player1_score += 1
-            self.session_data["left_score"] += 1
+            self.session_data.left_score += 1
         elif scoring_player == "right":
             self.player2_score += 1
-            self.session_data["right_score"] += 1
+            self.session_data.right_score += 1
 
         await self.send_score_callback()
         if self.player1_score >= GAME_END_SCORE or self.player2_score >= GAME_END_SCORE:
@@ -248,67 +281,56 @@ class TournamentPongGame(PongGame):
     async def set_game_ended(self):
         self.update_match_result(self.session_data)
         # 마지막 경기가 끝나면 DB에 저장
-        if self.session_data["current_match"] >= 3:
+        if self.session_data.current_match >= 3:
             self.state = "ended"
             await self.save_tournament_results(self.session_data)
         await self.send_callback({"type": "game_end"})
 
     def update_match_result(self, data):
-        current_match = data["matches"][data["current_match"]]
+        current_match = data.matches[data.current_match]
         player1_index, player2_index = current_match
         match_result = {
-            "player1_nick": data["players_name"][player1_index],
-            "player2_nick": data["players_name"][player2_index],
+            "player1_nick": data.players_name[player1_index],
+            "player2_nick": data.players_name[player2_index],
             "player1_score": self.player1_score,
             "player2_score": self.player2_score,
         }
-        data["match_results"].append(match_result)
-        data["left_score"] = 0
-        data["right_score"] = 0
+        data.match_results.append(match_result)
+        data.left_score = 0
+        data.right_score = 0
 
         # 승자 결정
         winner_index = player1_index if self.player1_score > self.player2_score else player2_index
-        data["win_history"].append(winner_index)
+        data.win_history.append(winner_index)
 
-        data["current_match"] += 1
+        data.current_match += 1
 
         # 두 번째 경기가 끝나면 결승전 참가자 결정
-        if data["current_match"] == 2:
-            data["matches"][2][0] = data["win_history"][0]
-            data["matches"][2][1] = data["win_history"][1]
-        cache.set(f"session_data_tournament_{self.session_data['user_id']}", data, 500)
+        if data.current_match == 2:
+            data.matches[2][0] = data.win_history[0]
+            data.matches[2][1] = data.win_history[1]
+        session_store.set_deferred("tournament", data.user_id, data)
 
     async def save_tournament_results(self, data):
-        user_id = data["user_id"]
-        tournament = await sync_to_async(Tournament.objects.create)(user_id=user_id)
-        for i, match in enumerate(data["match_results"]):
-            game_key = f"game{i + 1}"
-            game = await sync_to_async(Game.objects.create)(
-                user_id=user_id,
-                tournament_id=tournament.id,
-                player1_nick=match["player1_nick"],
-                player2_nick=match["player2_nick"],
-                player1_score=match["player1_score"],
-                player2_score=match["player2_score"],
-                mode="Tournament",
-            )
-            setattr(tournament, game_key, game)
-        await sync_to_async(tournament.save)()
+        await sync_to_async(save_tournament)(data.user_id, data.match_results)
 
 
 class NormalPongGame(PongGame):
     async def set_game_ended(self):
         self.state = "ended"
         await self.save_game_result(self.session_data)
-        cache.delete(f"session_data_normal_{self.session_data['user_id']}")
+        session_store.delete_deferred("normal", self.session_data.user_id)
         await self.send_callback({"type": "game_end"})
 
     async def save_game_result(self, data):
-        await sync_to_async(Game.objects.create)(
-            user_id=data["user_id"],
-            player1_nick=data["players_name"][0],
-            player2_nick=data["players_name"][1],
-            player1_score=data["left_score"],
-            player2_score=data["right_score"],
-            mode="1on1",
+        # 게임 루프가 DB 저장을 기다리지 않도록 game_result_sink에 넘긴다
+        game_result_sink.add(
+            Game(
+                user_id=data.user_id,
+                player1_nick=data.players_name[0],
+                player2_nick=data.players_name[1],
+                player1_score=data.left_score,
+                player2_score=data.right_score,
+                mode="1on1",
+            )
         )
@@ -0,0 +1,175 @@
+import struct
+import json
+
+
+BINARY_SUBPROTOCOL = "pong.binary.v1"
+BINARY_DELTA_SUBPROTOCOL = "pong.binary.delta.v1"
+JSON_DELTA_SUBPROTOCOL = "pong.json.delta.v1"
+
+# 프레임 타입 (1바이트)
+STATE = 1
+SCORE = 2
+GAME_END = 3
+STATE_DELTA = 4
+
+# 타입(uint8), 시퀀스 번호(uint32)
+HEADER = struct.Struct("<BI")
+# ball_pos, panel1, panel2, ball_rot 순서의 float32 x 12
+STATE_BODY = struct.Struct("<12f")
+# left_score, right_score
+SCORE_BODY = struct.Struct("<HH")
+# 변경된 필드의 비트마스크, 이후 변경된 필드마다 float32 x 3
+DELTA_MASK = struct.Struct("<B")
+VECTOR = struct.Struct("<3f")
+
+# 비트마스크의 각 비트가 가리키는 필드
+STATE_FIELDS = ("ball_pos", "panel1", "panel2", "ball_rot")
+FULL_MASK = (1 << len(STATE_FIELDS)) - 1
+KEYFRAME_INTERVAL = 60
+
+
+class DeltaState:
+    """
+    마지막으로 전송한 state와 비교하여 변경된 필드를 계산한다
+    keyframe_interval 마다, 또는 클라이언트가 resync를 요청한 경우
+    전체 필드를 담은 keyframe을 전송한다
+    """
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.last = None
+        self.since_keyframe = 0
+
+    def request_keyframe(self):
+        self.last = None
+
+    def diff(self, state):
+        """(변경된 필드의 비트마스크, keyframe 여부)를 반환"""
+        if self.last is None or self.since_keyframe >= self.keyframe_interval:
+            mask, keyframe = FULL_MASK, True
+            self.since_keyframe = 0
+        else:
+            mask, keyframe = 0, False
+            for bit, field in enumerate(STATE_FIELDS):
+                if state[field] != self.last[field]:
+                    mask |= 1 << bit
+            self.since_keyframe += 1
+        self.last = {field: state[field] for field in STATE_FIELDS}
+        return mask, keyframe
+
+
+def changed_fields(mask):
+    return [field for bit, field in enumerate(STATE_FIELDS) if mask & (1 << bit)]
+
+
+class JsonCodec:
+    """
+    기본 프로토콜, 모든 메시지를 json 텍스트 프레임으로 전송
+    delta를 사용하는 경우 keyframe이 아닌 state는
+    변경된 필드만 담은 state_delta 메시지로 전송한다
+    """
+
+    def __init__(self, delta=False):
+        self.delta = DeltaState() if delta else None
+        self.subprotocol = JSON_DELTA_SUBPROTOCOL if delta else None
+
+    def request_keyframe(self):
+        if self.delta:
+            self.delta.request_keyframe()
+
+    def encode(self, data):
+        if self.delta and data["type"] == "state":
+            mask, keyframe = self.delta.diff(data)
+            if not keyframe:
+                data = {"type": "state_delta", "mask": mask}
+                data.update((field, self.delta.last[field]) for field in changed_fields(mask))
+        return {"text_data": json.dumps(data)}
+
+
+class BinaryCodec:
+    """
+    pong.binary.v1 서브프로토콜
+    state, score, game_end는 [타입, 시퀀스 번호, 고정 길이 payload] 바이너리 프레임으로,
+    그 외 메시지는 json 텍스트 프레임으로 전송한다
+
+    pong.binary.delta.v1 서브프로토콜은 keyframe이 아닌 state를
+    [비트마스크, 변경된 필드] payload의 STATE_DELTA 프레임으로 전송한다
+    """
+
+    def __init__(self, delta=False):
+        self.seq = 0
+        self.delta = DeltaState() if delta else None
+        self.subprotocol = BINARY_DELTA_SUBPROTOCOL if delta else BINARY_SUBPROTOCOL
+
+    def request_keyframe(self):
+        if self.delta:
+            self.delta.request_keyframe()
+
+    def encode(self, data):
+        message_type = data["type"]
+        if message_type == "state":
+            if self.delta:
+                mask, keyframe = self.delta.diff(data)
+                if not keyframe:
+                    body = DELTA_MASK.pack(mask) + b"".join(
+                        VECTOR.pack(*data[field]) for field in changed_fields(mask)
+                    )
+                    return {"bytes_data": self.header(STATE_DELTA) + body}
+            body = STATE_BODY.pack(
+                *data["ball_pos"], *data["panel1"], *data["panel2"], *data["ball_rot"]
+            )
+            return {"bytes_data": self.header(STATE) + body}
+        if message_type == "score":
+            body = SCORE_BODY.pack(data["left_score"], data["right_score"])
+            return {"bytes_data": self.header(SCORE) + body}
+        if message_type == "game_end":
+            return {"bytes_data": self.header(GAME_END)}
+        return {"text_data": json.dumps(data)}
+
+    def header(self, frame_type):
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        return HEADER.pack(frame_type, self.seq)
+
+    @staticmethod
+    def decode(frame):
+        """바이너리 프레임을 json 프로토콜과 같은 형태의 dict로 변환"""
+        frame_type, seq = HEADER.unpack_from(frame)
+        if frame_type == STATE:
+            values = STATE_BODY.unpack_from(frame, HEADER.size)
+            return {
+                "type": "state",
+                "seq": seq,
+                "ball_pos": list(values[0:3]),
+                "panel1": list(values[3:6]),
+                "panel2": list(values[6:9]),
+                "ball_rot": list(values[9:12]),
+            }
+        if frame_type == STATE_DELTA:
+            (mask,) = DELTA_MASK.unpack_from(frame, HEADER.size)
+            data = {"type": "state_delta", "seq": seq, "mask": mask}
+            offset = HEADER.size + DELTA_MASK.size
+            for field in changed_fields(mask):
+                data[field] = list(VECTOR.unpack_from(frame, offset))
+                offset += VECTOR.size
+            return data
+        if frame_type == SCORE:
+            left_score, right_score = SCORE_BODY.unpack_from(frame, HEADER.size)
+            return {"type": "score", "seq": seq, "left_score": left_score, "right_score": right_score}
+        if frame_type == GAME_END:
+            return {"type": "game_end", "seq": seq}
+        raise ValueError(f"Unknown frame type: {frame_type}")
+
+
+CODECS = {
+    BINARY_SUBPROTOCOL: lambda: BinaryCodec(),
+    BINARY_DELTA_SUBPROTOCOL: lambda: BinaryCodec(delta=True),
+    JSON_DELTA_SUBPROTOCOL: lambda: JsonCodec(delta=True),
+}
+
+
+def select_codec(subprotocols):
+    """클라이언트가 요청한 순서대로 지원하는 서브프로토콜의 코덱을 선택, 없으면 json"""
+    for subprotocol in subprotocols:
+        if subprotocol in CODECS:
+            return CODECS[subprotocol]()
+    return JsonCodec()
@@ -0,0 +1,181 @@
+from django.db import transaction
+from asgiref.sync import sync_to_async
+from functools import partial
+import asyncio
+import logging
+import time
+
+from .models import Game, Tournament
+from .stats import apply_game_stats
+from .history import bump_history_versions
+from common.constants import GAME_RESULT_BATCH_SIZE, GAME_RESULT_FLUSH_INTERVAL
+
+
+logger = logging.getLogger(__name__)
+
+
+@transaction.atomic
+def save_tournament(user_id, match_results):
+    """
+    토너먼트와 경기 결과를 하나의 트랜잭션으로 저장
+    경기들은 bulk_create 한 번으로 생성하고 tournament의 game1~3과 유저 통계를 갱신한다
+    sync_to_async로 한 번만 호출하면 되도록 동기 함수로 작성
+
+    :param match_results: session data의 match_results
+    :return: 저장된 Tournament
+    """
+    tournament = Tournament.objects.create(user_id=user_id)
+    games = Game.objects.bulk_create(
+        [
+            Game(
+                user_id=user_id,
+                tournament_id=tournament.id,
+                player1_nick=match["player1_nick"],
+                player2_nick=match["player2_nick"],
+                player1_score=match["player1_score"],
+                player2_score=match["player2_score"],
+                mode="Tournament",
+            )
+            for match in match_results
+        ]
+    )
+    game_fields = []
+    for i, game in enumerate(games[:3]):
+        game_key = f"game{i + 1}"
+        setattr(tournament, game_key, game)
+        game_fields.append(game_key)
+    tournament.save(update_fields=game_fields)
+    apply_game_stats(games)
+    transaction.on_commit(partial(bump_history_versions, [user_id]))
+    return tournament
+
+
+class GameResultSink:
+    """
+    종료된 게임 결과(Game)를 메모리에 모아서 한 트랜잭션의 bulk_create로 저장
+    batch_size만큼 모이거나 flush_interval초가 지나면 저장한다
+
+    add: 저장을 기다리지 않음 (게임 루프에서 사용)
+    save: 저장된 Game을 반환, 같은 주기에 들어온 요청들은 한 번에 commit 된다
+    close: 종료 시 남은 결과를 모두 저장
+    """
+
+    def __init__(
+        self, batch_size=GAME_RESULT_BATCH_SIZE, flush_interval=GAME_RESULT_FLUSH_INTERVAL
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = []  # (Game, Future 또는 None)
+        self.flush_loop = None
+        self.flush_handle = None
+        self.flush_lock = None
+        self.flushes = 0
+        self.rows = 0
+        self.failures = 0
+        self.max_batch = 0
+        self.flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, game):
+        self.enqueue(game, None)
+
+    async def save(self, game):
+        future = asyncio.get_running_loop().create_future()
+        self.enqueue(game, future)
+        return await future
+
+    def enqueue(self, game, future):
+        loop = asyncio.get_running_loop()
+        if self.flush_loop is not loop:
+            self.flush_loop = loop
+            self.flush_lock = asyncio.Lock()
+            self.flush_handle = None
+        self.pending.append((game, future))
+        if len(self.pending) >= self.batch_size:
+            loop.create_task(self.flush())
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(
+                self.flush_interval, lambda: loop.create_task(self.flush())
+            )
+
+    async def flush(self):
+        if self.flush_handle:
+            self.flush_handle.cancel()
+        self.flush_handle = None
+        if self.flush_lock is None:
+            self.flush_lock = asyncio.Lock()
+        async with self.flush_lock:
+            while self.pending:
+                batch = self.pending[: self.batch_size]
+                del self.pending[: self.batch_size]
+                start = time.perf_counter()
+                results = await sync_to_async(self.write)([game for game, _ in batch])
+                seconds = time.perf_counter() - start
+                for (_, future), result in zip(batch, results):
+                    if future is None or future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                self.flushes += 1
+                self.rows += len(batch)
+                self.max_batch = max(self.max_batch, len(batch))
+                self.flush_seconds += seconds
+                self.max_flush_seconds = max(self.max_flush_seconds, seconds)
+
+    def write(self, games):
+        """
+        games와 유저 통계를 한 트랜잭션으로 저장하고 각 Game 또는 Exception을 순서대로 반환
+        일부 행 때문에 bulk_create가 실패하면 나머지 결과는 저장되도록 하나씩 다시 저장한다
+        """
+        try:
+            with transaction.atomic():
+                games = Game.objects.bulk_create(games)
+                apply_game_stats(games)
+                user_ids = {game.user_id for game in games}
+                transaction.on_commit(partial(bump_history_versions, user_ids))
+                return games
+        except Exception:
+            logger.exception(f"failed to bulk save {len(games)} game results")
+        results = []
+        for game in games:
+            try:
+                game.pk = None
+                with transaction.atomic():
+                    game.save(force_insert=True)
+                    apply_game_stats([game])
+                    transaction.on_commit(partial(bump_history_versions, [game.user_id]))
+                results.append(game)
+            except Exception as e:
+                self.failures += 1
+                logger.exception(f"failed to save game result of user {game.user_id}")
+                results.append(e)
+        return results
+
+    async def close(self):
+        await self.flush()
+
+    def drain(self):
+        """이벤트 루프가 멈춘 뒤(atexit)에도 남은 결과를 동기적으로 저장"""
+        if self.pending:
+            games = [game for game, _ in self.pending]
+            self.pending = []
+            self.write(games)
+
+    def get_metrics(self):
+        return {
+            "pending": len(self.pending),
+            "flushes": self.flushes,
+            "rows": self.rows,
+            "failures": self.failures,
+            "max_batch": self.max_batch,
+            "avg_flush_ms": self.flush_seconds / self.flushes * 1e3 if self.flushes else 0.0,
+            "max_flush_ms": self.max_flush_seconds * 1e3,
+        }
+
+
+game_result_sink = GameResultSink()
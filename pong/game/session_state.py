@@ -0,0 +1,150 @@
+import logging
+
+from .utils import get_default_session_data
+
+
+logger = logging.getLogger(__name__)
+
+# to_record 형식이 바뀌면 올린다, 다른 버전의 레코드는 기본값으로 대체된다
+SESSION_STATE_VERSION = 1
+
+MATCH_RESULT_FIELDS = ("player1_nick", "player2_nick", "player1_score", "player2_score")
+
+
+class SessionState:
+    """
+    경기 진행 상황(session data)
+    PongGame이 경기 중에 갱신하고 session_store에 저장된다
+
+    저장할 때는 to_record의 버전이 붙은 tuple을 사용해서 dict보다 작고 빠르게 pickle 되며
+    SessionView 등 클라이언트에는 to_dict로 기존 JSON 형태를 그대로 전달한다
+    """
+
+    __slots__ = (
+        "user_id",
+        "mode",
+        "players_name",
+        "left_score",
+        "right_score",
+        "current_match",
+        "win_history",
+        "match_results",
+        "matches",
+    )
+
+    def __init__(
+        self,
+        user_id,
+        mode,
+        players_name,
+        left_score=0,
+        right_score=0,
+        current_match=0,
+        win_history=None,
+        match_results=None,
+        matches=None,
+    ):
+        self.user_id = user_id
+        self.mode = mode
+        self.players_name = players_name
+        self.left_score = left_score
+        self.right_score = right_score
+        self.current_match = current_match
+        self.win_history = win_history if win_history is not None else []
+        self.match_results = match_results if match_results is not None else []
+        self.matches = matches if matches is not None else []
+
+    @property
+    def is_tournament(self):
+        return self.mode == "tournament"
+
+    @classmethod
+    def default(cls, user_id, mode):
+        return cls.from_dict(get_default_session_data(user_id, mode))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["user_id"],
+            data["mode"],
+            list(data["players_name"]),
+            data["left_score"],
+            data["right_score"],
+            data.get("current_match", 0),
+            list(data.get("win_history", [])),
+            [dict(result) for result in data.get("match_results", [])],
+            [list(match) for match in data.get("matches", [])],
+        )
+
+    @classmethod
+    def coerce(cls, data):
+        """기존 dict 형태의 session data도 받을 수 있도록 변환"""
+        return data if isinstance(data, cls) else cls.from_dict(data)
+
+    def to_dict(self):
+        data = {
+            "user_id": self.user_id,
+            "players_name": list(self.players_name),
+            "left_score": self.left_score,
+            "right_score": self.right_score,
+            "mode": self.mode,
+        }
+        if self.is_tournament:
+            data["current_match"] = self.current_match
+            data["win_history"] = list(self.win_history)
+            data["match_results"] = [dict(result) for result in self.match_results]
+            data["matches"] = [list(match) for match in self.matches]
+        return data
+
+    def to_record(self):
+        """저장용 불변 tuple, 같은 레코드에서 여러 번 복원해도 서로 영향을 주지 않는다"""
+        return (
+            SESSION_STATE_VERSION,
+            self.user_id,
+            self.mode,
+            tuple(self.players_name),
+            self.left_score,
+            self.right_score,
+            self.current_match,
+            tuple(self.win_history),
+            tuple(
+                tuple(result[field] for field in MATCH_RESULT_FIELDS)
+                for result in self.match_results
+            ),
+            tuple(tuple(match) for match in self.matches),
+        )
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        to_record로 저장한 값을 복원, 이전에 저장된 dict도 허용한다
+        :return: 알 수 없는 형식이면 None
+        """
+        if isinstance(record, dict):
+            return cls.from_dict(record)
+        if not isinstance(record, tuple) or record[0] != SESSION_STATE_VERSION:
+            logger.warning(f"unknown session record: {type(record).__name__} {record!r:.40}")
+            return None
+        (
+            _,
+            user_id,
+            mode,
+            players_name,
+            left_score,
+            right_score,
+            current_match,
+            win_history,
+            match_results,
+            matches,
+        ) = record
+        return cls(
+            user_id,
+            mode,
+            list(players_name),
+            left_score,
+            right_score,
+            current_match,
+            list(win_history),
+            [dict(zip(MATCH_RESULT_FIELDS, result)) for result in match_results],
+            [list(match) for match in matches],
+        )
@@ -0,0 +1,256 @@
+from django.core.cache import caches
+import itertools
+import asyncio
+import logging
+import time
+import uuid
+
+from .session_state import SessionState
+from common.lru import TTLCache
+from common.constants import (
+    SESSION_CACHE_ALIAS,
+    SESSION_TTL,
+    SESSION_LOCAL_SIZE,
+    SESSION_LOCAL_TTL,
+    SESSION_WRITE_BEHIND,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# 대기열에서 삭제 요청을 나타내는 값
+DELETED = object()
+
+
+def session_key(mode, user_id):
+    return f"session_data_{mode}_{user_id}"
+
+
+def generation_key(key):
+    return f"{key}_gen"
+
+
+class SessionStore:
+    """
+    게임 session data 저장소
+    프로세스 내부 LRU(TTLCache)를 앞단에, django cache(SESSION_CACHE_ALIAS)를 공유 저장소로 사용한다
+
+    set: 두 계층에 바로 저장 (API 요청 등 다른 노드에서 바로 읽어야 하는 경우)
+    set_deferred, delete_deferred: 로컬에만 바로 반영하고 공유 저장소에는 write_behind초 뒤에 모아서 저장
+        같은 키를 여러 번 갱신하면 마지막 값만 기록된다
+        게임 루프에서 호출되므로 I/O를 기다리지 않는다, 기록은 flush task에서 수행
+
+    다른 노드가 공유 저장소에 기록한 값을 로컬 계층이 가리지 않도록 기록할 때마다 새 generation을
+    record와 함께 저장하고, 로컬 계층을 읽을 때 공유 저장소의 generation과 비교한다
+    다르면(다른 노드의 set, SessionView의 저장/삭제 등) 공유 저장소에서 다시 읽는다
+    로컬 계층은 record 조회와 복원을 줄여줄 뿐 공유 저장소 왕복 한 번은 항상 필요하다
+
+    backend를 지정하면 alias 대신 해당 cache 객체를 공유 저장소로 사용한다
+    두 계층 모두 SessionState.to_record의 불변 tuple을 저장하고 조회할 때마다 새 SessionState로 복원하므로
+    호출한 쪽에서 수정해도 저장된 값은 바뀌지 않는다
+    """
+
+    def __init__(
+        self,
+        alias=SESSION_CACHE_ALIAS,
+        ttl=SESSION_TTL,
+        local_size=SESSION_LOCAL_SIZE,
+        local_ttl=SESSION_LOCAL_TTL,
+        write_behind=SESSION_WRITE_BEHIND,
+        backend=None,
+    ):
+        self.alias = alias
+        self._backend = backend
+        self.ttl = ttl
+        self.write_behind = write_behind
+        self.local = TTLCache(local_size, min(local_ttl, ttl))  # key -> (generation, record)
+        # key -> 공유 저장소에 아직 기록되지 않은 (generation, record) 또는 DELETED
+        self.pending = {}
+        self.flushing = {}  # 기록중인 pending, 끝나기 전까지 공유 저장소의 값은 이전 값이다
+        self.node = uuid.uuid4().hex[:12]
+        self.generations = itertools.count()
+        self.flush_loop = None
+        self.flush_handle = None
+        self.flush_lock = None
+        self.backend_reads = 0
+        self.generation_reads = 0
+        self.backend_writes = 0
+        self.max_pending = 0
+        self.flushes = 0
+        self.flushed_items = 0
+        self.flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+
+    @property
+    def backend(self):
+        if self._backend is not None:
+            return self._backend
+        return caches[self.alias]
+
+    async def get(self, mode, user_id):
+        """
+        :return: SessionState, 저장된 값이 없으면 기본값
+        """
+        key = session_key(mode, user_id)
+        # 기록 전인 갱신이 있으면 그 값이 최신이다
+        data = self.unflushed(key)
+        if data is None:
+            data = await self.read(key)
+        if data is None or data is DELETED:
+            return SessionState.default(user_id, mode)
+        state = SessionState.from_record(data[1])
+        if state is None:
+            return SessionState.default(user_id, mode)
+        return state
+
+    async def read(self, key):
+        """
+        로컬 계층의 값은 공유 저장소의 generation이 같을 때만 사용한다
+        :return: (generation, record) 또는 None
+        """
+        item = self.local.get(key)
+        if item is not None:
+            self.generation_reads += 1
+            if await self.backend.aget(generation_key(key)) == item[0]:
+                return item
+        self.backend_reads += 1
+        values = await self.backend.aget_many([key, generation_key(key)])
+        record = values.get(key)
+        if record is None:
+            self.local.pop(key)
+            return None
+        item = (values.get(generation_key(key)), record)
+        # 읽는 동안 들어온 갱신을 이전 값으로 덮어쓰지 않는다
+        unflushed = self.unflushed(key)
+        if unflushed is not None:
+            return unflushed
+        if item[0] is not None:
+            self.local.set(key, item)
+        return item
+
+    async def set(self, mode, user_id, state):
+        key = session_key(mode, user_id)
+        item = self.new_item(state)
+        self.local.set(key, item)
+        self.pending.pop(key, None)
+        self.backend_writes += 1
+        await self.backend.aset_many(self.backend_values(key, item), self.ttl)
+
+    async def delete(self, mode, user_id):
+        key = session_key(mode, user_id)
+        self.local.pop(key)
+        self.pending.pop(key, None)
+        await self.backend.adelete_many([key, generation_key(key)])
+
+    def new_item(self, state):
+        generation = f"{self.node}:{next(self.generations)}"
+        return (generation, SessionState.coerce(state).to_record())
+
+    def backend_values(self, key, item):
+        return {key: item[1], generation_key(key): item[0]}
+
+    def unflushed(self, key):
+        """공유 저장소에 아직 반영되지 않은 (generation, record) 또는 DELETED, 없으면 None"""
+        data = self.pending.get(key)
+        if data is None:
+            data = self.flushing.get(key)
+        return data
+
+    def set_deferred(self, mode, user_id, state):
+        key = session_key(mode, user_id)
+        item = self.new_item(state)
+        self.local.set(key, item)
+        self.enqueue(key, item)
+
+    def delete_deferred(self, mode, user_id):
+        key = session_key(mode, user_id)
+        self.local.pop(key)
+        self.enqueue(key, DELETED)
+
+    def enqueue(self, key, data):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 이벤트 루프 밖에서는 모아서 보낼 수 없으므로 바로 저장
+            self.backend_writes += 1
+            self.write_now(key, data)
+            return
+        self.pending[key] = data
+        self.max_pending = max(self.max_pending, len(self.pending))
+        if self.flush_loop is not loop:
+            self.flush_loop = loop
+            self.flush_lock = asyncio.Lock()
+            self.flush_handle = None
+        if self.flush_handle is None:
+            self.flush_handle = loop.call_later(
+                self.write_behind, lambda: loop.create_task(self.flush())
+            )
+
+    async def flush(self):
+        """
+        대기열을 비우고 set_many, delete_many로 공유 저장소에 기록
+        이미 진행중인 flush가 있으면 끝난 뒤에 실행되므로 반환 시점에는 호출 전의 갱신이 모두 기록되어 있다
+        """
+        if self.flush_handle:
+            self.flush_handle.cancel()
+        self.flush_handle = None
+        if self.flush_lock is None:
+            self.flush_lock = asyncio.Lock()
+        async with self.flush_lock:
+            if not self.pending:
+                return
+            pending, self.pending = self.pending, {}
+            self.flushing = pending
+            updates = {}
+            deletes = []
+            for key, data in pending.items():
+                if data is DELETED:
+                    deletes.extend((key, generation_key(key)))
+                else:
+                    updates.update(self.backend_values(key, data))
+            start = time.perf_counter()
+            try:
+                if updates:
+                    self.backend_writes += 1
+                    await self.backend.aset_many(updates, self.ttl)
+                if deletes:
+                    self.backend_writes += 1
+                    await self.backend.adelete_many(deletes)
+            except Exception:
+                logger.exception(f"failed to flush {len(pending)} sessions")
+            finally:
+                self.flushing = {}
+            seconds = time.perf_counter() - start
+            self.flushes += 1
+            self.flushed_items += len(pending)
+            self.flush_seconds += seconds
+            self.max_flush_seconds = max(self.max_flush_seconds, seconds)
+
+    def drain(self):
+        """이벤트 루프가 멈춘 뒤(atexit)에도 남은 대기열을 동기적으로 기록"""
+        pending, self.pending = self.pending, {}
+        for key, data in pending.items():
+            self.write_now(key, data)
+
+    def write_now(self, key, data):
+        if data is DELETED:
+            self.backend.delete_many([key, generation_key(key)])
+        else:
+            self.backend.set_many(self.backend_values(key, data), self.ttl)
+
+    def get_metrics(self):
+        return {
+            **self.local.get_metrics(),
+            "pending": len(self.pending),
+            "max_pending": self.max_pending,
+            "flushes": self.flushes,
+            "flushed_items": self.flushed_items,
+            "avg_flush_ms": self.flush_seconds / self.flushes * 1e3 if self.flushes else 0.0,
+            "max_flush_ms": self.max_flush_seconds * 1e3,
+            "backend_reads": self.backend_reads,
+            "generation_reads": self.generation_reads,
+            "backend_writes": self.backend_writes,
+        }
+
+
+session_store = SessionStore()
@@ -0,0 +1,185 @@
+from channels.layers import get_channel_layer
+import hashlib
+import asyncio
+import bisect
+import logging
+
+from .pong_game import NormalPongGame, TournamentPongGame
+from .engine import get_engine
+from .session_store import session_store
+from common.constants import (
+    GAME_ENGINE,
+    GAME_PHYSICS,
+    GAME_SHARDS,
+    SHARD_ID,
+    MATCH_RECONNECT_GRACE,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def hash_key(key):
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    consistent hashing으로 user id를 담당할 shard를 결정한다
+    shard가 추가/제거되어도 다른 shard에 배치된 경기는 이동하지 않는다
+
+    :param nodes: shard id 리스트
+    :param replicas: shard 하나당 ring에 배치할 가상 노드 수
+    """
+
+    def __init__(self, nodes, replicas=100):
+        self.ring = sorted(
+            (hash_key(f"{node}#{replica}"), node) for node in nodes for replica in range(replicas)
+        )
+        self.hashes = [key for key, _ in self.ring]
+
+    def get_node(self, key):
+        index = bisect.bisect(self.hashes, hash_key(str(key))) % len(self.ring)
+        return self.ring[index][1]
+
+
+shard_ring = HashRing(GAME_SHARDS)
+
+
+def shard_group(shard_id):
+    return f"pong_shard_{shard_id}"
+
+
+def match_group(mode, user_id):
+    return f"pong_match_{mode}_{user_id}"
+
+
+def owner_group(user_id):
+    """user id를 담당하는 shard의 channel layer group 이름"""
+    return shard_group(shard_ring.get_node(user_id))
+
+
+class HostedMatch:
+    def __init__(self, game, mode, user_id):
+        self.game = game
+        self.mode = mode
+        self.user_id = user_id
+        self.subscribers = 0
+        self.expire_handle = None
+
+
+class ShardHost:
+    """
+    shard가 소유한 경기(PongGame)를 실행하는 호스트
+    Consumer들은 group_send로 입력을 전달하고 match group으로 프레임을 받는다
+    클라이언트가 재접속하면 캐시의 스냅샷이 아닌 실행중인 경기에 다시 연결된다
+
+    메시지
+        match.join, match.leave: 구독자 등록/해제, 구독자가 없으면 grace 이후 경기 종료
+        match.start, match.pause, match.input: 경기 조작
+    """
+
+    def __init__(self, shard_id=SHARD_ID, reconnect_grace=MATCH_RECONNECT_GRACE):
+        self.shard_id = shard_id
+        self.reconnect_grace = reconnect_grace
+        self.matches = {}  # match group -> HostedMatch
+        self.layer = None
+        self.channel = None
+        self.loop = None
+        self.task = None
+
+    async def ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self.task and not self.task.done() and self.loop is loop:
+            return
+        self.loop = loop
+        self.layer = get_channel_layer()
+        self.channel = await self.layer.new_channel()
+        await self.layer.group_add(shard_group(self.shard_id), self.channel)
+        self.task = loop.create_task(self.run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        try:
+            while True:
+                message = await self.layer.receive(self.channel)
+                try:
+                    await self.handle(message)
+                except Exception:
+                    logger.exception(f"shard {self.shard_id} failed to handle {message['type']}")
+        except asyncio.CancelledError:
+            pass
+
+    async def handle(self, message):
+        group = message["group"]
+        if message["type"] == "match.join":
+            await self.join(group, message["mode"], message["user_id"])
+            return
+        match = self.matches.get(group)
+        if match is None:
+            return
+        engine = get_engine(GAME_ENGINE)
+        if message["type"] == "match.leave":
+            self.leave(group, match)
+        elif message["type"] == "match.start":
+            engine.add(match.game)
+            engine.set_paused(match.game, False)
+            engine.ensure_running()
+        elif message["type"] == "match.pause":
+            engine.set_paused(match.game, message["paused"])
+        elif message["type"] == "match.input":
+            engine.process_key_input(match.game, message["key_input"])
+
+    async def join(self, group, mode, user_id):
+        match = self.matches.get(group)
+        if match is None:
+            match = self.matches[group] = HostedMatch(
+                await self.create_game(group, mode, user_id), mode, user_id
+            )
+        else:
+            if match.expire_handle:
+                match.expire_handle.cancel()
+                match.expire_handle = None
+            if match.game.state == "ended":
+                # 끝난 경기는 재개하지 않고 저장소의 세션으로 새 경기를 만든다
+                get_engine(GAME_ENGINE).remove(match.game)
+                match.game = await self.create_game(group, mode, user_id)
+        match.subscribers += 1
+        # 재접속한 클라이언트가 현재 점수를 알 수 있도록 전송
+        await match.game.send_score_callback()
+
+    def leave(self, group, match):
+        match.subscribers -= 1
+        if match.subscribers > 0:
+            return
+        get_engine(GAME_ENGINE).set_paused(match.game, True)
+        match.expire_handle = self.loop.call_later(
+            self.reconnect_grace, lambda: self.loop.create_task(self.expire(group))
+        )
+
+    async def expire(self, group):
+        """재접속 대기 시간이 지난 경기를 정리하고 세션을 저장"""
+        match = self.matches.pop(group, None)
+        if match is None:
+            return
+        get_engine(GAME_ENGINE).remove(match.game)
+        if match.game.state != "ended":
+            session_store.set_deferred(match.mode, match.user_id, match.game.session_data)
+
+    async def create_game(self, group, mode, user_id):
+        session_data = await session_store.get(mode, user_id)
+
+        async def send_callback(data):
+            await self.layer.group_send(group, {"type": "match.frame", "data": data})
+
+        physics = "numpy" if GAME_ENGINE == "batch" else GAME_PHYSICS
+        if mode == "tournament":
+            return TournamentPongGame(send_callback, session_data, physics)
+        return NormalPongGame(send_callback, session_data, physics)
+
+
+shard_host = ShardHost()
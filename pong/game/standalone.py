@@ -0,0 +1,100 @@
+from collections import deque
+import asyncio
+import logging
+
+from .clock import GameClock
+
+
+logger = logging.getLogger(__name__)
+
+
+class StandaloneMatch:
+    __slots__ = ("game", "clock", "running", "key_inputs", "task")
+
+    def __init__(self, game):
+        self.game = game
+        self.clock = GameClock()
+        # set 상태이면 진행, 일시정지는 clear 해서 game_loop가 resume까지 깨어나지 않도록 한다
+        self.running = asyncio.Event()
+        self.running.set()
+        # 틱 사이에 들어온 입력을 순서대로 모아서 다음 틱에 모두 적용
+        self.key_inputs = deque()
+        self.task = None
+
+    @property
+    def paused(self):
+        return not self.running.is_set()
+
+
+class StandaloneEngine:
+    """
+    경기마다 별도의 asyncio task로 game_loop를 실행하는 기본 엔진
+    BatchPongEngine, GameWorkerPool과 같은 인터페이스를 제공한다
+    """
+
+    def __init__(self):
+        self.matches = {}  # id(PongGame) -> StandaloneMatch
+
+    def __len__(self):
+        return len(self.matches)
+
+    def add(self, game):
+        match = self.matches.get(id(game))
+        if match is None:
+            match = self.matches[id(game)] = StandaloneMatch(game)
+        if match.task is None or match.task.done():
+            match.task = asyncio.create_task(self.game_loop(match))
+        return match
+
+    def remove(self, game):
+        match = self.matches.pop(id(game), None)
+        if match is None:
+            return
+        if match.task:
+            match.task.cancel()
+        logger.debug(f"match {id(game)} clock: {match.clock.get_metrics()}")
+
+    def set_paused(self, game, paused):
+        match = self.matches.get(id(game))
+        if match is None:
+            return
+        if paused:
+            match.running.clear()
+        else:
+            match.running.set()
+
+    def process_key_input(self, game, key_input):
+        match = self.matches.get(id(game))
+        if match:
+            match.key_inputs.append(key_input)
+
+    def ensure_running(self):
+        """경기마다 task가 add에서 생성되므로 별도로 실행할 루프가 없다"""
+
+    async def game_loop(self, match):
+        """
+        GameClock의 고정 timestep으로 게임을 진행시킨다
+        밀린 스텝은 한 번에 처리하고 상태는 깨어날 때마다 한 번만 전송
+        일시정지 중에는 running 이벤트만 기다리므로 깨어나지 않는다
+        """
+        game, clock, key_inputs = match.game, match.clock, match.key_inputs
+        try:
+            clock.reset()
+            while True:
+                if not match.running.is_set():
+                    await match.running.wait()
+                    clock.reset()
+                steps = clock.advance()
+                if steps:
+                    while key_inputs:
+                        game.process_key_input(key_inputs.popleft())
+                    for _ in range(steps):
+                        game.move_panels()
+                        await game.simulate()
+                    await game.send_callback(game.get_state())
+                await asyncio.sleep(clock.time_until_next_tick())
+        except asyncio.CancelledError:
+            pass
+
+
+standalone_engine = StandaloneEngine()
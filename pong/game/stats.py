@@ -0,0 +1,91 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField, ExpressionWrapper
+
+from .models import Game, UserGameStats, LeaderboardEntry
+
+
+STAT_FIELDS = [
+    "games_played",
+    "wins",
+    "losses",
+    "goals_for",
+    "goals_against",
+    "normal_games",
+    "tournament_games",
+]
+
+
+def game_stats(game):
+    """Game 하나가 집계에 더하는 값"""
+    is_tournament = game.tournament_id is not None or game.mode == "Tournament"
+    return {
+        "games_played": 1,
+        "wins": int(game.player1_score > game.player2_score),
+        "losses": int(game.player1_score < game.player2_score),
+        "goals_for": game.player1_score,
+        "goals_against": game.player2_score,
+        "normal_games": int(not is_tournament),
+        "tournament_games": int(is_tournament),
+    }
+
+
+def increment_or_create(queryset, increments, **create_kwargs):
+    """UPDATE로 값을 더하고 행이 없으면 생성, 동시에 생성된 경우 다시 UPDATE"""
+    if queryset.update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            queryset.model.objects.create(**create_kwargs)
+    except IntegrityError:
+        # 다른 요청이 먼저 생성한 경우
+        queryset.update(**increments)
+
+
+def apply_game_stats(games):
+    """
+    저장된 games를 유저별로 합산해서 UserGameStats와 LeaderboardEntry에 더한다
+    게임을 저장하는 트랜잭션 안에서 호출하며 행마다 UPDATE 한 번(처음이면 INSERT)으로 처리
+    """
+    deltas = {}
+    rankings = {}  # (user_id, mode) -> [games, wins]
+    for game in games:
+        stats = game_stats(game)
+        delta = deltas.setdefault(game.user_id, dict.fromkeys(STAT_FIELDS, 0))
+        for field, value in stats.items():
+            delta[field] += value
+        mode = "tournament" if stats["tournament_games"] else "normal"
+        for key in ((game.user_id, "all"), (game.user_id, mode)):
+            ranking = rankings.setdefault(key, [0, 0])
+            ranking[0] += 1
+            ranking[1] += stats["wins"]
+
+    for user_id, delta in deltas.items():
+        increment_or_create(
+            UserGameStats.objects.filter(user_id=user_id),
+            {field: F(field) + value for field, value in delta.items()},
+            user_id=user_id,
+            **delta,
+        )
+    for (user_id, mode), (games, wins) in rankings.items():
+        # UPDATE의 우변은 갱신 전 값을 참조하므로 승률도 같은 문장에서 계산할 수 있다
+        win_rate = ExpressionWrapper(
+            (F("wins") + wins) * 1.0 / (F("games") + games), output_field=FloatField()
+        )
+        increment_or_create(
+            LeaderboardEntry.objects.filter(user_id=user_id, mode=mode),
+            {"games": F("games") + games, "wins": F("wins") + wins, "win_rate": win_rate},
+            user_id=user_id,
+            mode=mode,
+            games=games,
+            wins=wins,
+            win_rate=wins / games,
+        )
+
+
+@transaction.atomic
+def rebuild_stats():
+    """Game 테이블 전체로 집계와 랭킹을 다시 계산 (기존 기록 이관, 불일치 복구용)"""
+    UserGameStats.objects.all().delete()
+    LeaderboardEntry.objects.all().delete()
+    games = Game.objects.only("user_id", "tournament_id", "mode", "player1_score", "player2_score")
+    apply_game_stats(games.iterator())
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import resource
+import time
+
+from .session_store import session_store
+from common.constants import MATCH_PAUSE_TIMEOUT, MATCH_IDLE_TIMEOUT, MATCH_REAP_INTERVAL
+
+
+logger = logging.getLogger(__name__)
+
+
+class SupervisedMatch:
+    __slots__ = ("game", "engine", "mode", "user_id", "on_evict", "last_active", "paused_at")
+
+    def __init__(self, game, engine, mode, user_id, on_evict, now):
+        self.game = game
+        self.engine = engine
+        self.mode = mode
+        self.user_id = user_id
+        self.on_evict = on_evict
+        self.last_active = now
+        self.paused_at = None
+
+
+class MatchSupervisor:
+    """
+    노드에서 실행중인 경기를 추적하고 방치된 경기를 정리한다
+    Consumer마다 경기 하나만 등록되며 다시 등록하면 기존 항목을 갱신한다
+
+    pause_timeout초 이상 일시정지되었거나 idle_timeout초 동안 입력이 없는 경기는
+    엔진에서 제거하고 session_store에 저장한 뒤 on_evict를 호출한다 (Consumer는 소켓을 닫는다)
+    """
+
+    def __init__(
+        self,
+        pause_timeout=MATCH_PAUSE_TIMEOUT,
+        idle_timeout=MATCH_IDLE_TIMEOUT,
+        interval=MATCH_REAP_INTERVAL,
+        time_func=time.monotonic,
+    ):
+        self.pause_timeout = pause_timeout
+        self.idle_timeout = idle_timeout
+        self.interval = interval
+        self.time_func = time_func
+        self.matches = {}  # consumer channel name -> SupervisedMatch
+        self.evicted = 0
+        self.task = None
+
+    def __len__(self):
+        return len(self.matches)
+
+    def register(self, key, game, engine, mode, user_id, on_evict):
+        match = self.matches.get(key)
+        if match is not None and match.game is game:
+            self.touch(key)
+            return match
+        if match is not None:
+            # 같은 Consumer가 새 경기를 시작하면 이전 경기는 더 이상 실행하지 않는다
+            match.engine.remove(match.game)
+        match = self.matches[key] = SupervisedMatch(
+            game, engine, mode, user_id, on_evict, self.time_func()
+        )
+        self.ensure_running()
+        return match
+
+    def unregister(self, key):
+        self.matches.pop(key, None)
+
+    def touch(self, key):
+        match = self.matches.get(key)
+        if match:
+            match.last_active = self.time_func()
+
+    def set_paused(self, key, paused):
+        match = self.matches.get(key)
+        if match:
+            match.paused_at = self.time_func() if paused else None
+            match.last_active = self.time_func()
+
+    def ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self.task and not self.task.done() and self.task.get_loop() is loop:
+            return
+        self.task = loop.create_task(self.run())
+
+    async def run(self):
+        """추적중인 경기가 없으면 종료한다, register가 ensure_running으로 다시 시작한다"""
+        try:
+            while self.matches:
+                await asyncio.sleep(self.interval)
+                await self.reap()
+        except asyncio.CancelledError:
+            pass
+
+    async def reap(self):
+        """시간이 초과된 경기를 정리하고 정리한 경기 수를 반환"""
+        now = self.time_func()
+        expired = [
+            key
+            for key, match in self.matches.items()
+            if (match.paused_at is not None and now - match.paused_at >= self.pause_timeout)
+            or now - match.last_active >= self.idle_timeout
+        ]
+        for key in expired:
+            match = self.matches.pop(key)
+            match.engine.remove(match.game)
+            if match.game.state != "ended":
+                session_store.set_deferred(match.mode, match.user_id, match.game.session_data)
+            self.evicted += 1
+            logger.info(f"evicted idle match {match.mode}_{match.user_id}")
+            try:
+                await match.on_evict()
+            except Exception:
+                logger.exception(f"failed to notify evicted match {match.mode}_{match.user_id}")
+        logger.debug(f"match supervisor: {self.get_metrics()}")
+        return len(expired)
+
+    def get_metrics(self):
+        return {
+            "live": len(self.matches),
+            "paused": sum(1 for match in self.matches.values() if match.paused_at is not None),
+            "evicted": self.evicted,
+            # 리눅스에서 KB 단위
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+
+match_supervisor = MatchSupervisor()
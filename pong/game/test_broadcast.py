@@ -0,0 +1,55 @@
+from django.test import SimpleTestCase
+from unittest.mock import AsyncMock
+import asyncio
+
+from .broadcast import StateBroadcaster
+
+
+class StateBroadcasterTest(SimpleTestCase):
+    async def test_unthrottled_sends_every_state(self):
+        send = AsyncMock()
+        broadcaster = StateBroadcaster(send, rate=0)
+        for i in range(3):
+            await broadcaster.publish({"type": "state", "seq": i})
+        self.assertEqual(send.await_count, 3)
+        self.assertIsNone(broadcaster.task)
+
+    async def test_coalesces_states_between_broadcasts(self):
+        send = AsyncMock()
+        broadcaster = StateBroadcaster(send, rate=30)
+        for i in range(10):
+            await broadcaster.publish({"type": "state", "seq": i})
+        await asyncio.sleep(0)
+        await asyncio.sleep(0.05)
+        broadcaster.stop()
+
+        sent = [call.args[0]["seq"] for call in send.await_args_list]
+        self.assertEqual(sent[-1], 9)
+        self.assertLess(len(sent), 10)
+        self.assertEqual(broadcaster.get_metrics()["sent"], len(sent))
+
+    async def test_flush_sends_pending_state_once(self):
+        send = AsyncMock()
+        broadcaster = StateBroadcaster(send, rate=30)
+        await broadcaster.publish({"type": "state", "seq": 1})
+        await broadcaster.flush()
+        await broadcaster.flush()
+        broadcaster.stop()
+
+        send.assert_awaited_once_with({"type": "state", "seq": 1})
+
+    async def test_task_exits_when_states_stop(self):
+        send = AsyncMock()
+        broadcaster = StateBroadcaster(send, rate=100)
+        await broadcaster.publish({"type": "state", "seq": 1})
+        await asyncio.sleep(0.05)
+
+        self.assertTrue(broadcaster.task.done())
+        wakeups = broadcaster.clock.get_metrics()["wakeups"]
+        await asyncio.sleep(0.05)
+        self.assertEqual(broadcaster.clock.get_metrics()["wakeups"], wakeups)
+
+        await broadcaster.publish({"type": "state", "seq": 2})
+        await asyncio.sleep(0)
+        self.assertEqual(send.await_args.args[0]["seq"], 2)
+        broadcaster.stop()
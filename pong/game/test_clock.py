@@ -0,0 +1,47 @@
+from django.test import SimpleTestCase
+
+from .clock import GameClock
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class GameClockTest(SimpleTestCase):
+    def setUp(self):
+        self.time = FakeTime()
+        self.clock = GameClock(tick_rate=100, max_catch_up=5, time_func=self.time)
+
+    def test_first_advance_runs_one_step(self):
+        self.assertEqual(self.clock.advance(), 1)
+        self.assertAlmostEqual(self.clock.time_until_next_tick(), 0.01)
+
+    def test_fixed_timestep(self):
+        self.clock.advance()
+        self.time.now += 0.035
+        self.assertEqual(self.clock.advance(), 3)
+        # 남은 0.005초는 다음 틱에 반영된다
+        self.assertAlmostEqual(self.clock.time_until_next_tick(), 0.005)
+        self.time.now += 0.005
+        self.assertEqual(self.clock.advance(), 1)
+        self.assertEqual(self.clock.ticks, 5)
+
+    def test_catch_up_is_bounded(self):
+        self.clock.advance()
+        self.time.now += 1.0
+        self.assertEqual(self.clock.advance(), 5)
+        metrics = self.clock.get_metrics()
+        self.assertEqual(metrics["overruns"], 1)
+        self.assertEqual(metrics["dropped_steps"], 95)
+        self.assertAlmostEqual(metrics["max_jitter"], 0.99)
+
+    def test_reset_skips_paused_time(self):
+        self.clock.advance()
+        self.time.now += 10
+        self.clock.reset()
+        self.assertEqual(self.clock.advance(), 1)
+        self.assertEqual(self.clock.overruns, 0)
@@ -1,11 +1,14 @@
 from channels.testing import WebsocketCommunicator
 from channels.routing import URLRouter
+from django.core.cache import caches
 from django.test import TestCase
 from unittest.mock import patch, AsyncMock
 import json
 
 from .utils import get_default_session_data
+from .session_state import SessionState
 from .consumers import GameConsumer
+from .protocol import BinaryCodec, BINARY_SUBPROTOCOL
 from common.fakes import fake_decorators
 
 with fake_decorators():
@@ -38,6 +41,15 @@ class GameConsumerTest(TestCase):
         self.assertTrue(mock_tournament_game.called)
         await communicator.disconnect()
 
+    async def test_disconnect_flushes_session_state(self):
+        application = URLRouter(websocket_urlpatterns)
+        communicator = WebsocketCommunicator(application, "/pong-game/normal/777")
+        await communicator.connect()
+        await communicator.disconnect()
+
+        record = await caches["sessions"].aget("session_data_normal_777")
+        self.assertEqual(SessionState.from_record(record).user_id, 777)
+
     @patch('game.consumers.GameConsumer.save_game_state')
     async def test_game_start(self, mock_save_game):
         application = URLRouter(websocket_urlpatterns)
@@ -91,4 +103,32 @@ class GameConsumerTest(TestCase):
         self.assertGreater(state["panel1"][0], 0)
         self.assertLess(state["panel2"][1], 0)
         self.assertLess(state["panel2"][0], 0)
-        await communicator.disconnect()
\ No newline at end of file
+        await communicator.disconnect()
+
+    @patch('game.consumers.GAME_ENGINE', "batch")
+    @patch('game.consumers.GameConsumer.save_game_state')
+    async def test_game_start_batch_engine(self, mock_save_game):
+        application = URLRouter(websocket_urlpatterns)
+        communicator = WebsocketCommunicator(application, "/pong-game/normal/123")
+        await communicator.connect()
+
+        await communicator.send_to(text_data="start")
+        response = await communicator.receive_from()
+        self.assertEqual(json.loads(response)["type"], "state")
+        await communicator.disconnect()
+
+    @patch('game.consumers.GameConsumer.save_game_state')
+    async def test_binary_subprotocol(self, mock_save_game):
+        application = URLRouter(websocket_urlpatterns)
+        communicator = WebsocketCommunicator(
+            application, "/pong-game/normal/123", subprotocols=[BINARY_SUBPROTOCOL]
+        )
+        connected, subprotocol = await communicator.connect()
+        self.assertEqual(subprotocol, BINARY_SUBPROTOCOL)
+
+        await communicator.send_to(text_data="start")
+        response = await communicator.receive_output()
+        state = BinaryCodec.decode(response["bytes"])
+        self.assertEqual(state["type"], "state")
+        self.assertEqual(state["seq"], 1)
+        await communicator.disconnect()
@@ -0,0 +1,115 @@
+from django.test import TestCase
+from unittest.mock import AsyncMock
+import numpy as np
+import asyncio
+import random
+
+from .engine import BatchPongEngine
+from .pong_game import NormalPongGame, KEY_MAPPING
+from .utils import get_default_session_data
+
+
+class BatchPongEngineTest(TestCase):
+    def setUp(self):
+        self.rng = random.Random(42)
+        self.engine = BatchPongEngine(capacity=2)
+        self.games = []
+        for user_id in range(5):
+            game = NormalPongGame(AsyncMock(), get_default_session_data(user_id, "normal"))
+            game.ball_vec = np.array(
+                [self.rng.uniform(-0.5, 0.5), self.rng.uniform(-0.5, 0.5), 1.0]
+            )
+            self.games.append(game)
+            self.engine.add(game)
+
+    def random_key_input(self):
+        return {key: self.rng.random() < 0.3 for key in KEY_MAPPING}
+
+    def assert_same_state(self, game, slot):
+        np.testing.assert_allclose(self.engine.ball_pos[slot], game.ball_pos, atol=1e-9)
+        np.testing.assert_allclose(self.engine.ball_vec[slot], game.ball_vec, atol=1e-9)
+        np.testing.assert_allclose(self.engine.ball_rot[slot], game.ball_rot, atol=1e-9)
+        np.testing.assert_allclose(self.engine.panel1_pos[slot], game.panel1_pos)
+        np.testing.assert_allclose(self.engine.panel2_pos[slot], game.panel2_pos)
+
+    def test_slots_grow_with_capacity(self):
+        self.assertEqual(len(self.engine), 5)
+        self.assertGreaterEqual(self.engine.capacity, 5)
+        self.assertEqual(len(set(self.engine.slots.values())), 5)
+
+    def test_step_matches_single_game_physics(self):
+        references = [
+            NormalPongGame(AsyncMock(), get_default_session_data(i, "normal"))
+            for i in range(len(self.games))
+        ]
+        for reference, game in zip(references, self.games):
+            reference.ball_vec = game.ball_vec.copy()
+
+        scores = 0
+        for _ in range(800):
+            expected_events = []
+            for reference, game in zip(references, self.games):
+                key_input = self.random_key_input()
+                self.engine.process_key_input(game, key_input)
+                reference.process_key_input(key_input)
+                reference.move_panels()
+                scoring_player = reference.step()
+                if scoring_player:
+                    expected_events.append((self.engine.slots[id(game)], scoring_player))
+
+            self.engine.move_panels()
+            events = self.engine.step()
+            self.assertEqual(sorted(events), sorted(expected_events))
+            scores += len(events)
+            for reference, game in zip(references, self.games):
+                self.assert_same_state(reference, self.engine.slots[id(game)])
+        self.assertGreater(scores, 0)
+
+    def test_paused_match_does_not_move(self):
+        game = self.games[0]
+        slot = self.engine.slots[id(game)]
+        before = self.engine.ball_pos[slot].copy()
+        self.engine.set_paused(game, True)
+        self.engine.step()
+        np.testing.assert_array_equal(self.engine.ball_pos[slot], before)
+
+    def test_remove_returns_state_to_game(self):
+        game = self.games[0]
+        slot = self.engine.slots[id(game)]
+        self.engine.step()
+        expected = self.engine.ball_pos[slot].copy()
+        self.engine.remove(game)
+
+        np.testing.assert_array_equal(game.ball_pos, expected)
+        self.assertNotIn(id(game), self.engine.slots)
+        self.assertIn(slot, self.engine.free_slots)
+
+    async def test_tick_sends_state_and_score(self):
+        game = self.games[0]
+        game.update_score_and_check_win = AsyncMock()
+        slot = self.engine.slots[id(game)]
+        self.engine.ball_pos[slot] = (0.0, 0.0, 47.99)
+        self.engine.ball_vec[slot] = (0.0, 0.0, 1.0)
+        self.engine.panel1_pos[slot] = (7.0, 7.0, 50.0)
+
+        await self.engine.tick()
+
+        game.update_score_and_check_win.assert_awaited_once_with("right")
+        state = game.send_callback.await_args.args[0]
+        self.assertEqual(state["type"], "state")
+        self.assertEqual(state["ball_pos"], self.engine.ball_pos[slot].tolist())
+
+    async def test_run_sleeps_while_all_matches_paused(self):
+        for game in self.games:
+            self.engine.set_paused(game, True)
+        self.engine.ensure_running()
+        await asyncio.sleep(0.05)
+        self.assertFalse(any(game.send_callback.await_count for game in self.games))
+
+        self.engine.set_paused(self.games[0], False)
+        await asyncio.sleep(0.05)
+        self.assertGreater(self.games[0].send_callback.await_count, 0)
+        for game in list(self.games):
+            self.engine.remove(game)
+        await asyncio.sleep(0.01)
+        self.assertTrue(self.engine._task.done())
@@ -0,0 +1,64 @@
+from django.test import TestCase
+from unittest.mock import patch
+
+from .models import Game, LeaderboardEntry
+from .stats import apply_game_stats, rebuild_stats
+from .leaderboard import leaderboard_page, get_rank
+from auth.models import User
+
+
+class LeaderboardTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create(id=i, email=f"user{i}@example.com", login=f"user{i}")
+            for i in range(1, 5)
+        ]
+        # (user, 승, 패): user1 3승 3패, user2 3승 0패, user3 1승 1패, user4 기록 없음
+        for user, wins, losses in ((1, 3, 3), (2, 3, 0), (3, 1, 1)):
+            self.play(user, wins, losses)
+
+    def play(self, user_id, wins, losses, mode="1on1"):
+        games = [self.create_game(user_id, 5, 1, mode) for _ in range(wins)]
+        games += [self.create_game(user_id, 1, 5, mode) for _ in range(losses)]
+        apply_game_stats(Game.objects.bulk_create(games))
+
+    def create_game(self, user_id, player1_score, player2_score, mode):
+        return Game(
+            user_id=user_id,
+            player1_nick="p1",
+            player2_nick="p2",
+            player1_score=player1_score,
+            player2_score=player2_score,
+            mode=mode,
+        )
+
+    def test_win_rate_is_updated_incrementally(self):
+        self.play(3, 2, 0)
+        entry = LeaderboardEntry.objects.get(user_id=3, mode="all")
+        self.assertEqual((entry.games, entry.wins), (4, 3))
+        self.assertAlmostEqual(entry.win_rate, 0.75)
+
+    def test_rank_matches_page_order(self):
+        entries = leaderboard_page("all", "wins", 1, 10)
+        self.assertEqual([entry["userId"] for entry in entries], [2, 1, 3])
+        for entry in entries:
+            self.assertEqual(get_rank(entry["userId"], "all", "wins"), entry["rank"])
+        self.assertIsNone(get_rank(4, "all", "wins"))
+
+    @patch("game.leaderboard.LEADERBOARD_MIN_GAMES", 2)
+    def test_win_rate_ranking(self):
+        entries = leaderboard_page("all", "win_rate", 1, 10)
+        self.assertEqual([entry["userId"] for entry in entries], [2, 1, 3])
+        self.assertEqual(get_rank(3, "all", "win_rate"), 3)
+
+    def test_modes_are_ranked_separately(self):
+        self.play(4, 5, 0, mode="Tournament")
+
+        self.assertEqual(leaderboard_page("tournament", "wins", 1, 10)[0]["userId"], 4)
+        self.assertEqual(get_rank(4, "all", "wins"), 1)
+        self.assertIsNone(get_rank(4, "normal", "wins"))
+
+    def test_rebuild_keeps_rankings(self):
+        before = leaderboard_page("all", "wins", 1, 10)
+        rebuild_stats()
+        self.assertEqual(leaderboard_page("all", "wins", 1, 10), before)
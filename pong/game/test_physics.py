@@ -0,0 +1,67 @@
+from django.test import SimpleTestCase
+from unittest.mock import AsyncMock
+import numpy as np
+import random
+import json
+
+from .physics import ScalarPhysics
+from .pong_game import NormalPongGame, KEY_MAPPING
+from .utils import get_default_session_data
+
+
+class ScalarPhysicsDifferentialTest(SimpleTestCase):
+    """numpy 구현과 ScalarPhysics의 결과가 비트 단위로 같은지 비교한다"""
+
+    def create_games(self, ball_vec):
+        session_data = get_default_session_data(1, "normal")
+        numpy_game = NormalPongGame(AsyncMock(), session_data)
+        scalar_game = NormalPongGame(AsyncMock(), session_data, physics="scalar")
+        numpy_game.ball_vec = np.array(ball_vec)
+        scalar_game.physics.vx, scalar_game.physics.vy, scalar_game.physics.vz = ball_vec
+        return numpy_game, scalar_game
+
+    def run_differential(self, seed, ticks):
+        rng = random.Random(seed)
+        ball_vec = [rng.uniform(-0.6, 0.6), rng.uniform(-0.6, 0.6), rng.choice([-1.0, 1.0])]
+        numpy_game, scalar_game = self.create_games(ball_vec)
+
+        events = 0
+        for tick in range(ticks):
+            if tick % 5 == 0:
+                key_input = {key: rng.random() < 0.35 for key in KEY_MAPPING}
+                numpy_game.process_key_input(key_input)
+                scalar_game.process_key_input(key_input)
+            numpy_game.move_panels()
+            scalar_game.move_panels()
+
+            expected = numpy_game.step()
+            actual = scalar_game.step()
+            self.assertEqual(actual, expected, f"seed={seed} tick={tick}")
+            # json 직렬화 결과로 비교하여 -0.0 및 마지막 비트까지 확인한다
+            self.assertEqual(
+                json.dumps(scalar_game.get_state()),
+                json.dumps(numpy_game.get_state()),
+                f"seed={seed} tick={tick}",
+            )
+            self.assertEqual(
+                [scalar_game.physics.vx, scalar_game.physics.vy, scalar_game.physics.vz],
+                numpy_game.ball_vec.tolist(),
+            )
+            events += expected is not None
+        return events
+
+    def test_bit_identical_with_numpy_physics(self):
+        events = sum(self.run_differential(seed, 1000) for seed in range(8))
+        self.assertGreater(events, 0)
+
+    def test_panel_clamp(self):
+        physics = ScalarPhysics()
+        key_state = [True, True, False, False, True, True, False, False]
+        for _ in range(100):
+            physics.move_panels(key_state)
+        self.assertEqual([physics.p1x, physics.p1y], [-7.0, 7.0])
+        self.assertEqual([physics.p2x, physics.p2y], [7.0, 7.0])
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            ScalarPhysics().unknown = 1
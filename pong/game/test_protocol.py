@@ -0,0 +1,93 @@
+from django.test import SimpleTestCase
+import json
+
+from .protocol import (
+    BinaryCodec,
+    JsonCodec,
+    DeltaState,
+    select_codec,
+    BINARY_SUBPROTOCOL,
+    BINARY_DELTA_SUBPROTOCOL,
+    JSON_DELTA_SUBPROTOCOL,
+)
+
+
+STATE = {
+    "type": "state",
+    "ball_pos": [1.5, -2.25, 30.0],
+    "panel1": [0.0, 7.0, 50.0],
+    "panel2": [-7.0, 0.0, -50.0],
+    "ball_rot": [0.0, 0.0, 0.125],
+}
+
+
+class ProtocolTest(SimpleTestCase):
+    def test_select_codec(self):
+        self.assertIsInstance(select_codec([]), JsonCodec)
+        self.assertIsInstance(select_codec(["other", BINARY_SUBPROTOCOL]), BinaryCodec)
+        codec = select_codec([JSON_DELTA_SUBPROTOCOL, BINARY_SUBPROTOCOL])
+        self.assertEqual(codec.subprotocol, JSON_DELTA_SUBPROTOCOL)
+
+    def test_json_codec(self):
+        self.assertEqual(json.loads(JsonCodec().encode(STATE)["text_data"]), STATE)
+
+    def test_binary_state_round_trip(self):
+        codec = BinaryCodec()
+        frame = codec.encode(STATE)["bytes_data"]
+        self.assertEqual(len(frame), 53)
+        decoded = BinaryCodec.decode(frame)
+        self.assertEqual(decoded.pop("seq"), 1)
+        self.assertEqual(decoded, STATE)
+
+    def test_binary_sequence_and_events(self):
+        codec = BinaryCodec()
+        codec.encode(STATE)
+        score = BinaryCodec.decode(
+            codec.encode({"type": "score", "left_score": 2, "right_score": 1})["bytes_data"]
+        )
+        game_end = BinaryCodec.decode(codec.encode({"type": "game_end"})["bytes_data"])
+        self.assertEqual(score, {"type": "score", "seq": 2, "left_score": 2, "right_score": 1})
+        self.assertEqual(game_end, {"type": "game_end", "seq": 3})
+
+    def test_binary_falls_back_to_json_for_other_messages(self):
+        self.assertEqual(BinaryCodec().encode({"type": "error"}), {"text_data": '{"type": "error"}'})
+
+
+class DeltaStateTest(SimpleTestCase):
+    def moved(self, state, **fields):
+        return {**state, **fields}
+
+    def test_first_frame_is_keyframe(self):
+        self.assertEqual(DeltaState().diff(STATE), (0b1111, True))
+
+    def test_only_changed_fields(self):
+        delta = DeltaState()
+        delta.diff(STATE)
+        state = self.moved(STATE, ball_pos=[1.0, 1.0, 1.0], ball_rot=[0.0, 0.0, 0.0])
+        self.assertEqual(delta.diff(state), (0b1001, False))
+        self.assertEqual(delta.diff(state), (0, False))
+
+    def test_periodic_keyframe_and_resync(self):
+        delta = DeltaState(keyframe_interval=2)
+        keyframes = [delta.diff(STATE)[1] for _ in range(6)]
+        self.assertEqual(keyframes, [True, False, False, True, False, False])
+        delta.request_keyframe()
+        self.assertTrue(delta.diff(STATE)[1])
+
+    def test_json_delta_codec(self):
+        codec = JsonCodec(delta=True)
+        self.assertEqual(json.loads(codec.encode(STATE)["text_data"]), STATE)
+        data = json.loads(codec.encode(self.moved(STATE, panel1=[1.0, 7.0, 50.0]))["text_data"])
+        self.assertEqual(data, {"type": "state_delta", "mask": 0b0010, "panel1": [1.0, 7.0, 50.0]})
+
+    def test_binary_delta_codec(self):
+        codec = BinaryCodec(delta=True)
+        self.assertEqual(codec.subprotocol, BINARY_DELTA_SUBPROTOCOL)
+        self.assertEqual(BinaryCodec.decode(codec.encode(STATE)["bytes_data"])["type"], "state")
+
+        frame = codec.encode(self.moved(STATE, ball_pos=[2.0, 0.5, -4.0]))["bytes_data"]
+        self.assertEqual(len(frame), 5 + 1 + 12)
+        self.assertEqual(
+            BinaryCodec.decode(frame),
+            {"type": "state_delta", "seq": 2, "mask": 0b0001, "ball_pos": [2.0, 0.5, -4.0]},
+        )
@@ -0,0 +1,100 @@
+from django.test import TestCase
+from unittest.mock import patch, AsyncMock
+import asyncio
+
+from .models import Game, Tournament
+from .records import save_tournament, GameResultSink
+from .pong_game import TournamentPongGame
+from .utils import get_default_session_data
+from auth.models import User
+from common.fakes import FAKE_USER
+
+
+MATCH_RESULTS = [
+    {"player1_nick": "p1", "player2_nick": "p2", "player1_score": 5, "player2_score": 3},
+    {"player1_nick": "p3", "player2_nick": "p4", "player1_score": 1, "player2_score": 5},
+    {"player1_nick": "p1", "player2_nick": "p4", "player1_score": 5, "player2_score": 4},
+]
+
+
+class SaveTournamentTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(**FAKE_USER)
+
+    def test_tournament_and_games_are_saved(self):
+        tournament = save_tournament(self.user.id, MATCH_RESULTS)
+
+        tournament.refresh_from_db()
+        games = [tournament.game1, tournament.game2, tournament.game3]
+        self.assertEqual([game.player1_nick for game in games], ["p1", "p3", "p1"])
+        self.assertEqual(Game.objects.filter(tournament=tournament).count(), 3)
+
+    def test_nothing_is_saved_when_insert_fails(self):
+        with patch("game.records.Game.objects.bulk_create", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                save_tournament(self.user.id, MATCH_RESULTS)
+
+        self.assertFalse(Tournament.objects.exists())
+
+    async def test_final_match_saves_tournament(self):
+        session_data = get_default_session_data(self.user.id, "tournament")
+        session_data["match_results"] = MATCH_RESULTS[:2]
+        session_data["win_history"] = [0, 3]
+        session_data["matches"][2] = [0, 3]
+        session_data["current_match"] = 2
+        game = TournamentPongGame(AsyncMock(), session_data)
+        game.player1_score = 5
+
+        await game.set_game_ended()
+
+        self.assertEqual(game.state, "ended")
+        self.assertEqual(await Game.objects.filter(tournament__user=self.user).acount(), 3)
+
+
+class GameResultSinkTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(**FAKE_USER)
+        self.sink = GameResultSink(batch_size=3, flush_interval=0.01)
+
+    def create_game(self):
+        return Game(
+            user_id=self.user.id,
+            player1_nick="p1",
+            player2_nick="p2",
+            player1_score=5,
+            player2_score=2,
+            mode="1on1",
+        )
+
+    async def test_concurrent_saves_share_one_flush(self):
+        games = await asyncio.gather(*(self.sink.save(self.create_game()) for _ in range(2)))
+
+        self.assertTrue(all(game.id for game in games))
+        self.assertEqual(self.sink.get_metrics()["flushes"], 1)
+        self.assertEqual(self.sink.get_metrics()["max_batch"], 2)
+
+    async def test_full_batch_is_flushed_without_waiting(self):
+        self.sink.flush_interval = 60
+        for _ in range(3):
+            self.sink.add(self.create_game())
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(len(self.sink), 0)
+        self.assertEqual(await Game.objects.acount(), 3)
+
+    async def test_failed_row_does_not_drop_batch(self):
+        self.sink.add(self.create_game())
+        bad_game = self.create_game()
+        bad_game.player1_score = None
+
+        with self.assertLogs("game.records", "ERROR"), self.assertRaises(Exception):
+            await self.sink.save(bad_game)
+        self.assertEqual(await Game.objects.acount(), 1)
+        self.assertEqual(self.sink.get_metrics()["failures"], 1)
+
+    async def test_close_drains_pending_results(self):
+        self.sink.flush_interval = 60
+        self.sink.add(self.create_game())
+        await self.sink.close()
+
+        self.assertEqual(await Game.objects.acount(), 1)
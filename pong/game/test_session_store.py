@@ -0,0 +1,180 @@
+from django.core.cache import caches
+from django.test import SimpleTestCase
+import asyncio
+import pickle
+
+from .session_store import SessionStore, session_key
+from .session_state import SessionState
+from .utils import get_default_session_data
+from common.lru import TTLCache
+
+
+class TTLCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.now = 0
+        self.cache = TTLCache(maxsize=2, ttl=10, time_func=lambda: self.now)
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertNotIn("b", self.cache)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get_metrics()["evictions"], 1)
+
+    def test_expired_item_is_missing(self):
+        self.cache.set("a", 1)
+        self.now = 11
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
+
+
+class SessionStoreTest(SimpleTestCase):
+    def setUp(self):
+        self.backend = caches["sessions"]
+        self.backend.clear()
+        self.store = SessionStore(write_behind=0.01)
+
+    def create_state(self, user_id, left_score, mode="normal"):
+        state = SessionState.default(user_id, mode)
+        state.left_score = left_score
+        return state
+
+    def stored_score(self, mode, user_id):
+        record = self.backend.get(session_key(mode, user_id))
+        return None if record is None else SessionState.from_record(record).left_score
+
+    async def test_missing_session_returns_default(self):
+        state = await self.store.get("normal", 1)
+        self.assertEqual(state.to_dict(), get_default_session_data(1, "normal"))
+
+    async def test_local_tier_serves_repeated_reads(self):
+        await self.store.set("normal", 1, self.create_state(1, 3))
+
+        state = await self.store.get("normal", 1)
+        self.assertEqual(state.left_score, 3)
+        self.assertEqual(self.store.backend_reads, 0)
+        self.assertEqual(self.store.generation_reads, 1)
+
+    async def test_local_tier_is_not_served_after_backend_change(self):
+        await self.store.set("normal", 1, self.create_state(1, 3))
+        self.backend.clear()
+
+        self.assertEqual((await self.store.get("normal", 1)).left_score, 0)
+        self.assertEqual(self.store.backend_reads, 1)
+
+    async def test_write_from_other_store_is_visible(self):
+        other = SessionStore(backend=self.backend)
+        await self.store.set("tournament", 1, self.create_state(1, 1, "tournament"))
+        self.assertEqual((await other.get("tournament", 1)).left_score, 1)
+
+        await other.set("tournament", 1, self.create_state(1, 2, "tournament"))
+        self.assertEqual((await self.store.get("tournament", 1)).left_score, 2)
+
+        await other.delete("tournament", 1)
+        self.assertEqual((await self.store.get("tournament", 1)).left_score, 0)
+
+        self.store.set_deferred("tournament", 1, self.create_state(1, 3, "tournament"))
+        await self.store.flush()
+        self.assertEqual((await other.get("tournament", 1)).left_score, 3)
+
+    async def test_deleted_session_is_not_restored_from_backend(self):
+        await self.store.set("normal", 1, self.create_state(1, 4))
+        self.store.delete_deferred("normal", 1)
+
+        self.assertEqual((await self.store.get("normal", 1)).left_score, 0)
+        await self.store.flush()
+        self.assertEqual((await self.store.get("normal", 1)).left_score, 0)
+        self.assertIsNone(self.stored_score("normal", 1))
+
+    async def test_pending_write_is_not_overwritten_by_backend(self):
+        await self.store.set("normal", 1, self.create_state(1, 1))
+        self.store.set_deferred("normal", 1, self.create_state(1, 2))
+        self.store.local.clear()
+
+        self.assertEqual((await self.store.get("normal", 1)).left_score, 2)
+        self.assertEqual(self.store.backend_reads, 0)
+
+    async def test_returned_state_is_a_copy(self):
+        await self.store.set("tournament", 1, SessionState.default(1, "tournament"))
+        state = await self.store.get("tournament", 1)
+        state.match_results.append("changed")
+        state.matches[2][0] = 0
+
+        state = await self.store.get("tournament", 1)
+        self.assertEqual(state.match_results, [])
+        self.assertEqual(state.matches[2], [None, None])
+
+    async def test_deferred_writes_are_coalesced(self):
+        for score in range(5):
+            self.store.set_deferred("tournament", 1, self.create_state(1, score, "tournament"))
+        self.assertIsNone(self.stored_score("tournament", 1))
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.stored_score("tournament", 1), 4)
+        self.assertEqual(self.store.backend_writes, 1)
+
+    async def test_delete_drops_pending_write(self):
+        self.store.set_deferred("normal", 1, self.create_state(1, 1))
+        await self.store.delete("normal", 1)
+        await self.store.flush()
+
+        self.assertIsNone(self.stored_score("normal", 1))
+        self.assertEqual((await self.store.get("normal", 1)).left_score, 0)
+
+    async def test_deferred_delete_is_batched_with_writes(self):
+        await self.store.set("normal", 1, self.create_state(1, 1))
+        self.store.delete_deferred("normal", 1)
+        self.store.set_deferred("normal", 2, self.create_state(2, 2))
+        self.assertEqual(self.store.get_metrics()["pending"], 2)
+
+        await self.store.flush()
+        self.assertIsNone(self.stored_score("normal", 1))
+        self.assertEqual(self.stored_score("normal", 2), 2)
+        metrics = self.store.get_metrics()
+        self.assertEqual(metrics["pending"], 0)
+        self.assertEqual(metrics["flushes"], 1)
+        self.assertEqual(metrics["flushed_items"], 2)
+
+    async def test_flush_waits_for_running_flush(self):
+        self.store.set_deferred("normal", 1, self.create_state(1, 1))
+        first = asyncio.create_task(self.store.flush())
+        await asyncio.sleep(0)
+        self.store.set_deferred("normal", 1, self.create_state(1, 2))
+        await self.store.flush()
+
+        self.assertTrue(first.done())
+        self.assertEqual(self.stored_score("normal", 1), 2)
+
+    async def test_legacy_dict_session_is_read(self):
+        self.backend.set(session_key("normal", 1), get_default_session_data(1, "normal"))
+        state = await self.store.get("normal", 1)
+        self.assertEqual(state.user_id, 1)
+
+
+class SessionStateTest(SimpleTestCase):
+    def test_record_round_trip(self):
+        state = SessionState.default(1, "tournament")
+        state.match_results.append(
+            {"player1_nick": "a", "player2_nick": "b", "player1_score": 5, "player2_score": 2}
+        )
+        state.win_history.append(0)
+
+        restored = SessionState.from_record(state.to_record())
+        self.assertEqual(restored.to_dict(), state.to_dict())
+
+    def test_to_dict_keeps_json_shape(self):
+        for mode in ("normal", "tournament"):
+            state = SessionState.default(1, mode)
+            self.assertEqual(state.to_dict(), get_default_session_data(1, mode))
+
+    def test_record_is_smaller_than_dict(self):
+        state = SessionState.default(1, "tournament")
+        self.assertLess(len(pickle.dumps(state.to_record())), len(pickle.dumps(state.to_dict())))
+
+    def test_unknown_version_is_rejected(self):
+        record = (0,) + SessionState.default(1, "normal").to_record()[1:]
+        with self.assertLogs("game.session_state", "WARNING"):
+            self.assertIsNone(SessionState.from_record(record))
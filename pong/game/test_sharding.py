@@ -0,0 +1,144 @@
+from channels.testing import WebsocketCommunicator, ApplicationCommunicator
+from channels.routing import URLRouter
+from channels.layers import get_channel_layer
+from django.test import TestCase, SimpleTestCase
+from unittest.mock import patch
+import json
+
+from .sharding import HashRing, ShardHost, match_group
+from .lifespan import lifespan
+from .standalone import standalone_engine
+from common.fakes import fake_decorators
+
+with fake_decorators():
+    from .urls import websocket_urlpatterns
+
+
+class HashRingTest(SimpleTestCase):
+    def test_same_key_same_node(self):
+        ring = HashRing(["a", "b", "c"])
+        self.assertEqual(ring.get_node(123), ring.get_node("123"))
+
+    def test_keys_are_spread(self):
+        ring = HashRing(["a", "b", "c"])
+        counts = {"a": 0, "b": 0, "c": 0}
+        for user_id in range(3000):
+            counts[ring.get_node(user_id)] += 1
+        for count in counts.values():
+            self.assertGreater(count, 600)
+
+    def test_removing_node_only_moves_its_keys(self):
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "b"])
+        for user_id in range(1000):
+            if before.get_node(user_id) != "c":
+                self.assertEqual(before.get_node(user_id), after.get_node(user_id))
+
+
+@patch("game.consumers.GAME_SHARDING", True)
+class ShardedGameConsumerTest(TestCase):
+    def setUp(self):
+        self.host = ShardHost(shard_id="shard-0")
+        self.patchers = [patch("game.consumers.shard_host", self.host)]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    async def asyncTearDown(self):
+        for match in self.host.matches.values():
+            standalone_engine.remove(match.game)
+        self.host.stop()
+        await get_channel_layer().flush()
+
+    async def start_server(self):
+        communicator = ApplicationCommunicator(lifespan, {"type": "lifespan"})
+        await communicator.send_input({"type": "lifespan.startup"})
+        message = await communicator.receive_output()
+        self.assertEqual(message["type"], "lifespan.startup.complete")
+        return communicator
+
+    async def stop_server(self, communicator):
+        await communicator.send_input({"type": "lifespan.shutdown"})
+        await communicator.receive_output()
+
+    async def connect(self, user_id):
+        application = URLRouter(websocket_urlpatterns)
+        communicator = WebsocketCommunicator(application, f"/pong-game/normal/{user_id}")
+        await communicator.connect()
+        return communicator
+
+    async def receive_type(self, communicator, message_type):
+        for _ in range(50):
+            data = json.loads(await communicator.receive_from())
+            if data["type"] == message_type:
+                return data
+        self.fail(f"{message_type} not received")
+
+    async def test_game_runs_on_owner_shard(self):
+        communicator = await self.connect(501)
+        score = await self.receive_type(communicator, "score")
+        self.assertEqual(score["left_score"], 0)
+
+        await communicator.send_to(text_data="start")
+        state = await self.receive_type(communicator, "state")
+        self.assertIn("ball_pos", state)
+        self.assertIn(match_group("normal", 501), self.host.matches)
+        await communicator.disconnect()
+
+    async def test_reconnect_resumes_running_game(self):
+        communicator = await self.connect(502)
+        await communicator.send_to(text_data="start")
+        await self.receive_type(communicator, "state")
+        game = self.host.matches[match_group("normal", 502)].game
+        game.player1_score = 2
+        await communicator.disconnect()
+
+        communicator = await self.connect(502)
+        score = await self.receive_type(communicator, "score")
+        self.assertEqual(score["left_score"], 2)
+        self.assertIs(self.host.matches[match_group("normal", 502)].game, game)
+        await communicator.disconnect()
+
+    @patch("game.pong_game.game_result_sink")
+    async def test_reconnect_after_end_starts_new_game(self, mock_sink):
+        communicator = await self.connect(503)
+        await communicator.send_to(text_data="start")
+        await self.receive_type(communicator, "state")
+        game = self.host.matches[match_group("normal", 503)].game
+        game.player1_score = 3
+        await game.set_game_ended()
+        await communicator.disconnect()
+
+        communicator = await self.connect(503)
+        score = await self.receive_type(communicator, "score")
+        self.assertEqual(score["left_score"], 0)
+        new_game = self.host.matches[match_group("normal", 503)].game
+        self.assertIsNot(new_game, game)
+        self.assertNotEqual(new_game.state, "ended")
+        await communicator.disconnect()
+
+    async def test_routes_to_other_shard(self):
+        ring = HashRing(["shard-0", "shard-1"])
+        user_id = next(i for i in range(1000) if ring.get_node(i) == "shard-1")
+        # 소켓이 연결되지 않은 다른 프로세스의 shard는 서버 startup에서 시작된다
+        other_host = ShardHost(shard_id="shard-1")
+        with patch("game.lifespan.shard_host", other_host), patch(
+            "game.lifespan.GAME_SHARDING", True
+        ):
+            server = await self.start_server()
+
+        with patch("game.sharding.shard_ring", ring):
+            communicator = await self.connect(user_id)
+            await communicator.send_to(text_data="start")
+            await self.receive_type(communicator, "state")
+            await communicator.disconnect()
+
+        self.assertIn(match_group("normal", user_id), other_host.matches)
+        self.assertEqual(self.host.matches, {})
+        for match in other_host.matches.values():
+            standalone_engine.remove(match.game)
+        other_host.stop()
+        await self.stop_server(server)
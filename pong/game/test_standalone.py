@@ -0,0 +1,40 @@
+from django.test import SimpleTestCase
+from unittest.mock import AsyncMock
+import asyncio
+
+from .standalone import StandaloneEngine
+from .pong_game import NormalPongGame
+from .utils import get_default_session_data
+
+
+class StandaloneEngineTest(SimpleTestCase):
+    def setUp(self):
+        self.engine = StandaloneEngine()
+        self.game = NormalPongGame(AsyncMock(), get_default_session_data(1, "normal"))
+
+    def tearDown(self):
+        self.engine.remove(self.game)
+
+    async def test_paused_match_does_not_run(self):
+        self.engine.add(self.game)
+        self.engine.set_paused(self.game, True)
+        await asyncio.sleep(0.05)
+        count = self.game.send_callback.await_count
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.game.send_callback.await_count, count)
+
+        self.engine.set_paused(self.game, False)
+        await asyncio.sleep(0.05)
+        self.assertGreater(self.game.send_callback.await_count, count)
+
+    async def test_inputs_between_ticks_are_all_applied(self):
+        self.engine.add(self.game)
+        self.engine.set_paused(self.game, True)
+        await asyncio.sleep(0)
+        self.engine.process_key_input(self.game, {"KeyW": True})
+        self.engine.process_key_input(self.game, {"ArrowUp": True})
+        self.engine.set_paused(self.game, False)
+        await asyncio.sleep(0.05)
+
+        self.assertTrue(self.game.key_state[0])
+        self.assertTrue(self.game.key_state[4])
@@ -0,0 +1,60 @@
+from django.test import TestCase
+
+from .models import Game, UserGameStats
+from .records import save_tournament, GameResultSink
+from .stats import apply_game_stats, rebuild_stats
+from .test_records import MATCH_RESULTS
+from auth.models import User
+from common.fakes import FAKE_USER
+
+
+class UserGameStatsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(**FAKE_USER)
+
+    def create_game(self, player1_score, player2_score):
+        return Game(
+            user=self.user,
+            player1_nick="p1",
+            player2_nick="p2",
+            player1_score=player1_score,
+            player2_score=player2_score,
+            mode="1on1",
+        )
+
+    def get_stats(self):
+        return UserGameStats.objects.get(user=self.user)
+
+    def test_games_are_added_to_stats(self):
+        apply_game_stats([self.create_game(5, 3), self.create_game(2, 5)])
+        apply_game_stats([self.create_game(5, 0)])
+
+        stats = self.get_stats()
+        self.assertEqual(stats.games_played, 3)
+        self.assertEqual((stats.wins, stats.losses), (2, 1))
+        self.assertEqual((stats.goals_for, stats.goals_against), (12, 8))
+        self.assertEqual(stats.normal_games, 3)
+
+    def test_tournament_updates_stats(self):
+        save_tournament(self.user.id, MATCH_RESULTS)
+
+        stats = self.get_stats()
+        self.assertEqual(stats.tournament_games, 3)
+        self.assertEqual(stats.wins, 2)
+
+    async def test_game_result_sink_updates_stats(self):
+        sink = GameResultSink()
+        await sink.save(self.create_game(5, 1))
+
+        stats = await UserGameStats.objects.aget(user=self.user)
+        self.assertEqual((stats.games_played, stats.goals_for), (1, 5))
+
+    def test_rebuild_matches_incremental_stats(self):
+        save_tournament(self.user.id, MATCH_RESULTS)
+        apply_game_stats(Game.objects.bulk_create([self.create_game(1, 5)]))
+        incremental = self.get_stats()
+
+        rebuild_stats()
+        rebuilt = self.get_stats()
+        for field in ["games_played", "wins", "losses", "goals_for", "tournament_games"]:
+            self.assertEqual(getattr(rebuilt, field), getattr(incremental, field))
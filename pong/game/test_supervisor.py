@@ -0,0 +1,99 @@
+from channels.testing import WebsocketCommunicator
+from channels.routing import URLRouter
+from django.test import SimpleTestCase
+import asyncio
+from unittest.mock import patch, AsyncMock, Mock
+
+from .supervisor import MatchSupervisor
+from .pong_game import NormalPongGame
+from .utils import get_default_session_data
+from common.fakes import fake_decorators
+
+with fake_decorators():
+    from .urls import websocket_urlpatterns
+
+
+class MatchSupervisorTest(SimpleTestCase):
+    def setUp(self):
+        self.now = 0
+        self.supervisor = MatchSupervisor(
+            pause_timeout=10, idle_timeout=100, interval=60, time_func=lambda: self.now
+        )
+        self.engine = Mock()
+
+    def register(self, key, user_id=1):
+        game = NormalPongGame(AsyncMock(), get_default_session_data(user_id, "normal"))
+        on_evict = AsyncMock()
+        self.supervisor.register(key, game, self.engine, "normal", user_id, on_evict)
+        return game, on_evict
+
+    @patch("game.supervisor.session_store")
+    async def test_idle_match_is_evicted(self, mock_store):
+        game, on_evict = self.register("a")
+        self.now = 50
+        self.supervisor.touch("a")
+        self.now = 149
+        self.assertEqual(await self.supervisor.reap(), 0)
+
+        self.now = 150
+        self.assertEqual(await self.supervisor.reap(), 1)
+        self.engine.remove.assert_called_once_with(game)
+        mock_store.set_deferred.assert_called_once_with("normal", 1, game.session_data)
+        on_evict.assert_awaited_once()
+        self.assertEqual(self.supervisor.get_metrics()["evicted"], 1)
+
+    @patch("game.supervisor.session_store")
+    async def test_paused_match_is_evicted_first(self, mock_store):
+        self.register("a")
+        self.register("b", user_id=2)
+        self.supervisor.set_paused("a", True)
+        self.assertEqual(self.supervisor.get_metrics()["paused"], 1)
+
+        self.now = 10
+        await self.supervisor.reap()
+        self.assertEqual(list(self.supervisor.matches), ["b"])
+
+    async def test_one_match_per_consumer(self):
+        game, on_evict = self.register("a")
+        for _ in range(3):
+            self.supervisor.register("a", game, self.engine, "normal", 1, on_evict)
+        self.assertEqual(len(self.supervisor), 1)
+        self.engine.remove.assert_not_called()
+
+        self.register("a")
+        self.assertEqual(len(self.supervisor), 1)
+        self.engine.remove.assert_called_once_with(game)
+
+    @patch("game.supervisor.session_store")
+    async def test_task_exits_when_matches_are_gone(self, mock_store):
+        supervisor = MatchSupervisor(pause_timeout=0, interval=0.01)
+        game = NormalPongGame(AsyncMock(), get_default_session_data(1, "normal"))
+        supervisor.register("a", game, self.engine, "normal", 1, AsyncMock())
+        supervisor.set_paused("a", True)
+        with self.assertLogs("game.supervisor", "DEBUG") as logs:
+            await asyncio.wait_for(supervisor.task, 1)
+        self.assertEqual(len(supervisor), 0)
+        self.assertTrue(any("'evicted': 1" in line for line in logs.output))
+
+        supervisor.register("b", game, self.engine, "normal", 1, AsyncMock())
+        self.assertFalse(supervisor.task.done())
+        supervisor.task.cancel()
+
+
+class IdleConsumerTest(SimpleTestCase):
+    async def test_paused_socket_is_closed(self):
+        supervisor = MatchSupervisor(pause_timeout=0, interval=0.01)
+        with patch("game.consumers.match_supervisor", supervisor):
+            application = URLRouter(websocket_urlpatterns)
+            communicator = WebsocketCommunicator(application, "/pong-game/normal/901")
+            await communicator.connect()
+            await communicator.send_to(text_data="start")
+            await communicator.send_to(text_data="pause")
+
+            for _ in range(100):
+                output = await communicator.receive_output(timeout=1)
+                if output["type"] == "websocket.close":
+                    break
+            self.assertEqual(output["code"], 4008)
+            self.assertEqual(len(supervisor), 0)
+            supervisor.task.cancel()
@@ -1,10 +1,17 @@
 from django.test import TestCase, AsyncClient, AsyncRequestFactory
 from django.urls import reverse
+from django.core.cache import cache
+from asgiref.sync import async_to_sync
 from unittest.mock import patch, Mock
+from datetime import datetime
 import json
 
-from .models import Game, Tournament
+from .models import Game, Tournament, UserGameStats, LeaderboardEntry
+from auth.models import User
 from .utils import get_default_session_data
+from .session_state import SessionState
+from .records import save_tournament
+from .test_records import MATCH_RESULTS
 from common.constants import MAX_ATTEMPTS, JWT_SECRET
 from common.fakes import (
     fake_decorators,
@@ -13,7 +20,13 @@ from common.fakes import (
 )
 
 with fake_decorators():
-    from .views import GameView, SessionView
+    from .views import (
+        GameView,
+        GameExportView,
+        GameStatsView,
+        LeaderboardView,
+        SessionView,
+    )
 
 
 class GameViewTestCase(TestCase):
@@ -34,7 +47,7 @@ class GameViewTestCase(TestCase):
         self.assertIn("games", data)
         self.assertIn("page", data)
 
-    @patch("game.views.Game.objects.create")
+    @patch("game.views.game_result_sink.save")
     async def test_post_game(self, mock_game):
         fake_game = {
             "player1Nick": "player1",
@@ -64,16 +77,175 @@ class GameViewTestCase(TestCase):
         self.assertEqual(data["id"], 234)
 
 
+class GameCursorPaginationTestCase(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        cache.clear()
+        user = User.objects.create(**FAKE_USER)
+        Game.objects.bulk_create(
+            Game(
+                user=user,
+                player1_nick="p1",
+                player2_nick="p2",
+                player1_score=i,
+                player2_score=0,
+                mode="1on1",
+            )
+            for i in range(5)
+        )
+        # 같은 시각에 끝난 게임은 id로 순서를 정한다
+        Game.objects.update(created_at=datetime(2024, 7, 1))
+
+    async def get_page(self, query):
+        response = await GameView().get(self.factory.get(f"/game/?{query}"))
+        return response.status_code, json.loads(response.content)
+
+    async def test_pages_follow_cursor(self):
+        ids = []
+        cursor = ""
+        while True:
+            status, data = await self.get_page(f"size=2&cursor={cursor}")
+            self.assertEqual(status, 200)
+            ids.extend(game["id"] for game in data["games"])
+            if not data["page"]["has_next"]:
+                break
+            cursor = data["page"]["next_cursor"]
+
+        expected = [game.id async for game in Game.objects.order_by("-id")]
+        self.assertEqual(ids, expected)
+
+    async def test_invalid_size_is_rejected(self):
+        for query in ("cursor=&size=0", "cursor=&size=-1", "size=abc", "page=0"):
+            status, data = await self.get_page(query)
+            self.assertEqual(status, 400, query)
+            self.assertIn("error", data)
+
+    async def test_total_is_returned_on_request(self):
+        status, data = await self.get_page("size=2&cursor=&total=true")
+        self.assertEqual(data["page"]["total_items"], 5)
+
+    async def test_invalid_cursor(self):
+        status, data = await self.get_page("cursor=invalid")
+        self.assertEqual(status, 400)
+
+
+class GameHistoryCacheTestCase(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.user = User.objects.create(**FAKE_USER)
+        cache.clear()
+
+    def get_total(self):
+        response = async_to_sync(GameView().get)(self.factory.get("/game/?page=1"))
+        return json.loads(response.content)["page"]["total_items"]
+
+    def test_page_is_served_from_cache(self):
+        self.assertEqual(self.get_total(), 0)
+        # version을 올리지 않고 저장하면 캐시된 페이지가 그대로 반환된다
+        Game.objects.create(
+            user=self.user,
+            player1_nick="p1",
+            player2_nick="p2",
+            player1_score=1,
+            player2_score=5,
+            mode="1on1",
+        )
+        self.assertEqual(self.get_total(), 0)
+
+    def test_saved_game_invalidates_page(self):
+        self.assertEqual(self.get_total(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            save_tournament(self.user.id, MATCH_RESULTS)
+        self.assertEqual(self.get_total(), 3)
+
+
+class GameExportViewTestCase(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        user = User.objects.create(**FAKE_USER)
+        save_tournament(user.id, MATCH_RESULTS)
+
+    async def export(self, query):
+        response = await GameExportView().get(self.factory.get(f"/export?{query}"))
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        return response, content.decode()
+
+    async def test_export_ndjson(self):
+        response, content = await self.export("format=ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row["player1Nick"] for row in rows}, {"p1", "p3"})
+
+    async def test_export_csv(self):
+        response, content = await self.export("format=csv")
+
+        lines = content.splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "player1Nick", "player2Nick"])
+        self.assertEqual(len(lines), 4)
+
+    async def test_invalid_format(self):
+        response = await GameExportView().get(self.factory.get("/export?format=xml"))
+        self.assertEqual(response.status_code, 400)
+
+
+class GameStatsViewTestCase(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    async def test_get_stats(self):
+        user = await User.objects.acreate(**FAKE_USER)
+        await UserGameStats.objects.acreate(user=user, games_played=4, wins=3, losses=1)
+
+        response = await GameStatsView().get(self.factory.get("/stats"))
+        data = json.loads(response.content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["gamesPlayed"], 4)
+        self.assertEqual(data["wins"], 3)
+
+    async def test_get_stats_without_games(self):
+        response = await GameStatsView().get(self.factory.get("/stats"))
+        data = json.loads(response.content)
+        self.assertEqual(data["gamesPlayed"], 0)
+
+
+class LeaderboardViewTestCase(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    async def test_get_leaderboard(self):
+        user = await User.objects.acreate(**FAKE_USER)
+        await LeaderboardEntry.objects.acreate(user=user, mode="all", games=2, wins=1, win_rate=0.5)
+
+        response = await LeaderboardView().get(self.factory.get("/leaderboard?mode=all"))
+        data = json.loads(response.content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["entries"][0]["login"], FAKE_USER["login"])
+        self.assertEqual(data["myRank"], 1)
+
+    async def test_invalid_sort(self):
+        response = await LeaderboardView().get(self.factory.get("/leaderboard?sort=losses"))
+        self.assertEqual(response.status_code, 400)
+
+    async def test_invalid_page_or_size(self):
+        for query in ("page=0", "size=-1", "page=abc", "size=0"):
+            response = await LeaderboardView().get(self.factory.get(f"/leaderboard?{query}"))
+            self.assertEqual(response.status_code, 400, query)
+
+
 class SessionViewTestCase(TestCase):
     def setUp(self):
         self.factory = AsyncRequestFactory()
         self.user = FAKE_USER
         self.normal_session_data = get_default_session_data(self.user["id"], "Normal")
         self.tournament_session_data = get_default_session_data(self.user["id"], "Tournament")
+        self.normal_session_state = SessionState.from_dict(self.normal_session_data)
+        self.tournament_session_state = SessionState.from_dict(self.tournament_session_data)
 
-    @patch('game.views.cache.aget')
-    async def test_get_normal_session(self, mock_cache_aget):
-        mock_cache_aget.return_value = self.normal_session_data
+    @patch('game.views.session_store.get')
+    async def test_get_normal_session(self, mock_store_get):
+        mock_store_get.return_value = self.normal_session_state
 
         request = self.factory.get('/session/?mode=normal')
         view = SessionView()
@@ -86,9 +258,9 @@ class SessionViewTestCase(TestCase):
         self.assertEqual(data["left_score"], self.normal_session_data["left_score"])
         self.assertEqual(data["right_score"], self.normal_session_data["right_score"])
 
-    @patch('game.views.cache.aget')
-    async def test_get_tournament_session(self, mock_cache_aget):
-        mock_cache_aget.return_value = self.tournament_session_data
+    @patch('game.views.session_store.get')
+    async def test_get_tournament_session(self, mock_store_get):
+        mock_store_get.return_value = self.tournament_session_state
 
         request = self.factory.get('/session/?mode=tournament')
         view = SessionView()
@@ -101,8 +273,8 @@ class SessionViewTestCase(TestCase):
         self.assertEqual(data["left_score"], self.tournament_session_data["left_score"])
         self.assertEqual(data["right_score"], self.tournament_session_data["right_score"])
 
-    @patch('game.views.cache.set')
-    async def test_post_session(self, mock_cache_set):
+    @patch('game.views.session_store.set')
+    async def test_post_session(self, mock_store_set):
         players_data = {
             'players_name': ['p1', 'p2', 'p3', 'p4']
         }
@@ -114,8 +286,8 @@ class SessionViewTestCase(TestCase):
         data = json.loads(response.content)
         self.assertEqual(data['message'], 'Set session success')
 
-    @patch('game.views.cache.delete')
-    async def test_delete_session(self, mock_cache_delete):
+    @patch('game.views.session_store.delete')
+    async def test_delete_session(self, mock_store_delete):
         request = self.factory.delete('/session/', json.dumps({'mode': 'normal'}), content_type='application/json')
         view = SessionView()
         response = await view.delete(request)
@@ -0,0 +1,56 @@
+from django.test import SimpleTestCase
+from unittest.mock import AsyncMock
+import asyncio
+
+from .workers import GameWorkerPool
+from .pong_game import NormalPongGame
+from .utils import get_default_session_data
+
+
+class GameWorkerPoolTest(SimpleTestCase):
+    def setUp(self):
+        self.pool = GameWorkerPool(workers=2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def create_game(self, user_id):
+        return NormalPongGame(AsyncMock(), get_default_session_data(user_id, "normal"))
+
+    async def wait_for_frame(self, game, count=1):
+        for _ in range(500):
+            if game.send_callback.await_count >= count:
+                return game.send_callback.await_args.args[0]
+            await asyncio.sleep(0.01)
+        self.fail("no frame received from worker")
+
+    async def test_frames_are_relayed_to_game(self):
+        game = self.create_game(1)
+        self.pool.add(game)
+        self.pool.ensure_running()
+
+        state = await self.wait_for_frame(game)
+        self.assertEqual(state["type"], "state")
+        self.assertGreater(state["ball_pos"][2], 0)
+
+    async def test_matches_are_spread_across_workers(self):
+        games = [self.create_game(i) for i in range(4)]
+        for game in games:
+            self.pool.add(game)
+        self.assertEqual(self.pool.load, [2, 2])
+
+        self.pool.remove(games[0])
+        self.assertEqual(sorted(self.pool.load), [1, 2])
+        self.assertEqual(len(self.pool), 3)
+
+    async def test_key_input_is_forwarded(self):
+        game = self.create_game(1)
+        self.pool.add(game)
+        self.pool.ensure_running()
+        self.pool.process_key_input(game, {"KeyW": True, "ArrowDown": True})
+
+        count = game.send_callback.await_count
+        await self.wait_for_frame(game, count + 5)
+        state = game.send_callback.await_args.args[0]
+        self.assertGreater(state["panel1"][1], 0)
+        self.assertLess(state["panel2"][1], 0)
@@ -2,6 +2,9 @@ from django.urls import path, re_path
 from .consumers import GameConsumer
 from .views import (
     GameView,
+    GameExportView,
+    GameStatsView,
+    LeaderboardView,
     SessionView,
 )
 
@@ -9,6 +12,9 @@ from .views import (
 # BASEURL + /api/game-management/
 urlpatterns = [
     path("game", GameView.as_view(), name="game"),
+    path("stats", GameStatsView.as_view(), name="game_stats"),
+    path("export", GameExportView.as_view(), name="game_export"),
+    path("leaderboard", LeaderboardView.as_view(), name="leaderboard"),
     path("session", SessionView.as_view(), name="session"),
 ]
 
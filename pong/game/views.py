@@ -1,17 +1,34 @@
 from asgiref.sync import sync_to_async
-from django.http import JsonResponse
-from django.core.cache import cache
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views import View
+import csv
 import json
 import logging
 
-from .utils import get_default_session_data
-from .models import Game, Tournament
+from .session_state import SessionState
+from .session_store import session_store
+from .models import Game, Tournament, UserGameStats
+from .records import game_result_sink
+from .pagination import keyset_page, cached_count, InvalidCursor
+from .leaderboard import leaderboard_page, get_rank
+from .history import get_history_version, history_page_key, get_cached_page, set_cached_page
 from auth.decorators import login_required
 
 
 logger = logging.getLogger(__name__)
 
+EXPORT_CHUNK_SIZE = 500
+EXPORT_CSV_FIELDS = [
+    "id",
+    "player1Nick",
+    "player2Nick",
+    "player1Score",
+    "player2Score",
+    "mode",
+    "tournament_id",
+    "created_at",
+]
+
 
 def validate_game(data, mode):
     errors = {}
@@ -24,50 +41,113 @@ def validate_game(data, mode):
     return errors
 
 
+def game_to_dict(game):
+    return {
+        "id": game.id,
+        "player1Nick": game.player1_nick,
+        "player2Nick": game.player2_nick,
+        "player1Score": game.player1_score,
+        "player2Score": game.player2_score,
+        "mode": game.mode,
+        "tournament_id": game.tournament_id,
+        "created_at": game.created_at.isoformat(),
+    }
+
+
+def parse_positive_int(value):
+    """양의 정수가 아니면 None"""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
 class GameView(View):
     @login_required
     async def get(self, request, decoded_jwt):
+        """
+        게임 기록 조회
+        cursor 파라미터가 있으면(첫 페이지는 빈 값) cursor 기반으로, 없으면 page 번호로 조회한다
+
+        :query page: 페이지 번호
+        :query size: 페이지 크기
+        :query cursor: 이전 응답의 next_cursor
+        :query total: cursor 조회에서 true면 캐시된 전체 개수를 함께 반환
+        """
         user_id = decoded_jwt.get("user_id")
-        page_number = int(request.GET.get("page", 1))
-        page_size = int(request.GET.get("size", 10))
+        page_number = parse_positive_int(request.GET.get("page", "1"))
+        page_size = parse_positive_int(request.GET.get("size", "10"))
+        if page_number is None or page_size is None:
+            return JsonResponse({"error": "page and size must be positive integers"}, status=400)
+
+        # 게임이 저장될 때마다 version이 바뀌므로 캐시된 페이지는 항상 최신 기록이다
+        version = await get_history_version(user_id)
+        cache_key = history_page_key(user_id, version, request.GET)
+        response_data = await get_cached_page(cache_key)
+        if response_data is not None:
+            return JsonResponse(response_data)
 
+        if "cursor" in request.GET:
+            try:
+                response_data = await self.get_by_cursor(request, user_id, page_size, version)
+            except InvalidCursor:
+                return JsonResponse({"error": "Invalid cursor"}, status=400)
+        else:
+            response_data = await self.get_by_page(user_id, page_number, page_size)
+        await set_cached_page(cache_key, response_data)
+        return JsonResponse(response_data)
+
+    async def get_by_page(self, user_id, page_number, page_size):
         total_games = await sync_to_async(Game.objects.filter(user_id=user_id).count)()
         start = (page_number - 1) * page_size
         end = start + page_size
         games = await sync_to_async(list)(
-            Game.objects.filter(user_id=user_id).order_by("-created_at")[start:end]
+            Game.objects.filter(user_id=user_id).order_by("-created_at", "-id")[start:end]
         )
-        response_data = self.objects_to_dict(games)
 
         total_pages = (total_games + page_size - 1) // page_size
         has_next = page_number < total_pages
         has_previous = page_number > 1
 
-        return JsonResponse(
-            {
-                "games": response_data,
-                "page": {
-                    "current": page_number,
-                    "has_next": has_next,
-                    "has_previous": has_previous,
-                    "total_pages": total_pages,
-                    "total_items": total_games,
-                },
+        return {
+            "games": self.objects_to_dict(games),
+            "page": {
+                "current": page_number,
+                "has_next": has_next,
+                "has_previous": has_previous,
+                "total_pages": total_pages,
+                "total_items": total_games,
             },
+        }
+
+    async def get_by_cursor(self, request, user_id, page_size, version):
+        queryset = Game.objects.filter(user_id=user_id)
+        games, next_cursor = await sync_to_async(keyset_page)(
+            queryset, request.GET["cursor"], page_size
         )
+        page = {"has_next": next_cursor is not None, "next_cursor": next_cursor}
+        if request.GET.get("total") == "true":
+            page["total_items"] = await sync_to_async(cached_count)(
+                queryset, f"game_count_{user_id}_{version}"
+            )
+        return {"games": self.objects_to_dict(games), "page": page}
 
     @login_required
     async def post(self, request, decoded_jwt):
         user_id = decoded_jwt.get("user_id")
         try:
             data = json.loads(request.body)
-            game = await sync_to_async(Game.objects.create)(
-                user_id=user_id,
-                player1_nick=data["player1Nick"],
-                player2_nick=data["player2Nick"],
-                player1_score=data["player1Score"],
-                player2_score=data["player2Score"],
-                mode=data["mode"],
+            # 같은 시점에 들어온 요청들과 한 번에 저장된다
+            game = await game_result_sink.save(
+                Game(
+                    user_id=user_id,
+                    player1_nick=data["player1Nick"],
+                    player2_nick=data["player2Nick"],
+                    player1_score=data["player1Score"],
+                    player2_score=data["player2Score"],
+                    mode=data["mode"],
+                )
             )
             return JsonResponse({"status": "Game created successfully", "id": game.id}, status=201)
         except KeyError as e:
@@ -78,26 +158,115 @@ class GameView(View):
             return JsonResponse({"error": str(e)}, status=500)
 
     def objects_to_dict(self, game_list):
-        return [
+        return [game_to_dict(game) for game in game_list]
+
+
+class EchoBuffer:
+    """csv.writer가 쓴 한 줄을 그대로 반환해서 스트리밍에 사용"""
+
+    def write(self, value):
+        return value
+
+
+class GameExportView(View):
+    @login_required
+    async def get(self, request, decoded_jwt):
+        """
+        유저의 전체 게임 기록을 NDJSON 또는 CSV로 스트리밍
+        aiterator로 EXPORT_CHUNK_SIZE개씩 읽어서 바로 전송하므로 기록 수와 관계없이 메모리 사용량이 일정하다
+
+        :query format: ndjson(기본값) 또는 csv
+        :cookie jwt: 인증을 위한 JWT
+        """
+        user_id = decoded_jwt.get("user_id")
+        export_format = request.GET.get("format", "ndjson")
+        if export_format not in ("ndjson", "csv"):
+            return JsonResponse({"error": "format must be 'ndjson' or 'csv'"}, status=400)
+        games = Game.objects.filter(user_id=user_id).order_by("-created_at", "-id")
+        if export_format == "csv":
+            rows, content_type = self.csv_rows(games), "text/csv"
+        else:
+            rows, content_type = self.ndjson_rows(games), "application/x-ndjson"
+        response = StreamingHttpResponse(rows, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="games.{export_format}"'
+        return response
+
+    async def ndjson_rows(self, games):
+        async for game in games.aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield json.dumps(game_to_dict(game)) + "\n"
+
+    async def csv_rows(self, games):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(EXPORT_CSV_FIELDS)
+        async for game in games.aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+            row = game_to_dict(game)
+            yield writer.writerow([row[field] for field in EXPORT_CSV_FIELDS])
+
+
+class GameStatsView(View):
+    @login_required
+    async def get(self, request, decoded_jwt):
+        """
+        유저의 게임 통계 반환
+        게임이 저장될 때 갱신되는 UserGameStats를 조회하므로 게임 수와 관계없이 한 번만 읽는다
+
+        :cookie jwt: 인증을 위한 JWT
+        """
+        user_id = decoded_jwt.get("user_id")
+        stats = await UserGameStats.objects.filter(user_id=user_id).afirst()
+        if stats is None:
+            stats = UserGameStats(user_id=user_id)
+        return JsonResponse(
+            {
+                "gamesPlayed": stats.games_played,
+                "wins": stats.wins,
+                "losses": stats.losses,
+                "goalsFor": stats.goals_for,
+                "goalsAgainst": stats.goals_against,
+                "normalGames": stats.normal_games,
+                "tournamentGames": stats.tournament_games,
+            }
+        )
+
+
+class LeaderboardView(View):
+    @login_required
+    async def get(self, request, decoded_jwt):
+        """
+        랭킹 조회, 요청한 유저의 순위를 함께 반환
+
+        :query mode: all(기본값), normal, tournament
+        :query sort: wins(기본값), win_rate
+        :query page: 페이지 번호
+        :query size: 페이지 크기
+        :cookie jwt: 인증을 위한 JWT
+        """
+        user_id = decoded_jwt.get("user_id")
+        mode = request.GET.get("mode", "all")
+        sort = request.GET.get("sort", "wins")
+        if mode not in ("all", "normal", "tournament") or sort not in ("wins", "win_rate"):
+            return JsonResponse({"error": "Invalid mode or sort"}, status=400)
+        page_number = parse_positive_int(request.GET.get("page", "1"))
+        page_size = parse_positive_int(request.GET.get("size", "10"))
+        if page_number is None or page_size is None:
+            return JsonResponse({"error": "page and size must be positive integers"}, status=400)
+
+        entries = await sync_to_async(leaderboard_page)(mode, sort, page_number, page_size)
+        my_rank = await sync_to_async(get_rank)(user_id, mode, sort)
+        return JsonResponse(
             {
-                "id": game.id,
-                "player1Nick": game.player1_nick,
-                "player2Nick": game.player2_nick,
-                "player1Score": game.player1_score,
-                "player2Score": game.player2_score,
-                "mode": game.mode,
-                "tournament_id": game.tournament_id,
-                "created_at": game.created_at.isoformat(),
+                "entries": entries,
+                "myRank": my_rank,
+                "page": {"current": page_number, "has_next": len(entries) == page_size},
             }
-            for game in game_list
-        ]
+        )
 
 
 class SessionView(View):
     @login_required
     async def get(self, request, decoded_jwt):
         """
-        캐시에 저장된 세션 정보 반환
+        session_store에 저장된 세션 정보 반환
 
         :query mode: 게임 모드 토너먼트 및 일반
         :cookie jwt: 인증을 위한 JWT
@@ -106,14 +275,13 @@ class SessionView(View):
         mode = request.GET.get("mode")
         if mode != "tournament":
             mode = "normal"
-        default_data = get_default_session_data(user_id, mode)
-        session_data = await cache.aget(f"session_data_{mode}_{user_id}", default_data)
-        return JsonResponse(session_data)
+        session_state = await session_store.get(mode, user_id)
+        return JsonResponse(session_state.to_dict())
 
     @login_required
     async def post(self, request, decoded_jwt):
         """
-        tournament 플레이어 이름을 cache에 저장한 뒤
+        tournament 플레이어 이름을 session_store에 저장한 뒤
         불러와서 사용
 
         :body players_name: 사용자 이름 리스트
@@ -125,10 +293,9 @@ class SessionView(View):
             return JsonResponse({"error": "Invalid JSON"}, status=400)
 
         user_id = decoded_jwt.get("user_id")
-        session_data = get_default_session_data(user_id, "tournament")
-        players_name = body.get("players_name", session_data.get("players_name"))
-        session_data["players_name"] = players_name
-        cache.set(f"session_data_tournament_{user_id}", session_data, 500)
+        session_state = SessionState.default(user_id, "tournament")
+        session_state.players_name = body.get("players_name", session_state.players_name)
+        await session_store.set("tournament", user_id, session_state)
         return JsonResponse({"message": "Set session success"})
 
     @login_required
@@ -148,5 +315,5 @@ class SessionView(View):
         mode = body.get("mode")
         if mode != "tournament":
             mode = "normal"
-        cache.delete(f"session_data_{mode}_{user_id}")
+        await session_store.delete(mode, user_id)
         return JsonResponse({"message": "Delete session success"})
@@ -0,0 +1,227 @@
+import multiprocessing
+import itertools
+import asyncio
+import logging
+import os
+
+from .clock import GameClock
+from .physics import ScalarPhysics
+from common.constants import GAME_TICK_RATE, MAX_CATCH_UP_STEPS, GAME_WORKERS
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerMatch:
+    __slots__ = ("physics", "key_state", "paused")
+
+    def __init__(self, key_state):
+        self.physics = ScalarPhysics()
+        self.key_state = key_state
+        self.paused = False
+
+
+def run_worker(conn, tick_rate, max_catch_up):
+    """
+    워커 프로세스의 메인 루프
+    부모 프로세스로부터 add/remove/keys/pause 명령을 받고
+    틱마다 담당하는 모든 경기를 진행시킨 뒤 프레임을 한 번에 돌려준다
+
+    프레임 형식: [(match_id, state 12개의 float, [득점한 플레이어...]), ...]
+    """
+    matches = {}
+    clock = GameClock(tick_rate=tick_rate, max_catch_up=max_catch_up)
+    while True:
+        timeout = clock.time_until_next_tick() if matches else None
+        if conn.poll(timeout):
+            try:
+                command, match_id, *args = conn.recv()
+            except EOFError:
+                return
+            if command == "close":
+                return
+            if command == "add":
+                if not matches:
+                    clock.reset()
+                matches[match_id] = WorkerMatch(*args)
+            elif command == "remove":
+                matches.pop(match_id, None)
+            elif match_id in matches and command == "keys":
+                matches[match_id].key_state = args[0]
+            elif match_id in matches and command == "pause":
+                matches[match_id].paused = args[0]
+            if clock.time_until_next_tick() > 0:
+                continue
+
+        steps = clock.advance()
+        frames = []
+        for match_id, match in matches.items():
+            if match.paused:
+                continue
+            physics = match.physics
+            events = []
+            for _ in range(steps):
+                physics.move_panels(match.key_state)
+                scoring_player = physics.step()
+                if scoring_player:
+                    events.append(scoring_player)
+            state = (
+                physics.bx, physics.by, physics.bz,
+                physics.p1x, physics.p1y, physics.p1z,
+                physics.p2x, physics.p2y, physics.p2z,
+                physics.rx, physics.ry, physics.rz,
+            )  # fmt: skip
+            frames.append((match_id, state, events))
+        if frames:
+            conn.send(frames)
+
+
+class GameWorkerPool:
+    """
+    게임 물리 연산을 워커 프로세스(기본값: 코어 수)에서 실행한다
+    Consumer는 키 입력을 워커로 전달하고 워커가 돌려준 프레임을 클라이언트로 중계한다
+    득점 처리 및 게임 종료(DB, cache 저장)는 기존처럼 부모 프로세스의 PongGame에서 수행
+
+    BatchPongEngine과 같은 add/remove/set_paused/process_key_input 인터페이스를 제공
+    """
+
+    def __init__(self, workers=GAME_WORKERS):
+        self.size = workers or os.cpu_count() or 1
+        self.workers = []  # [(process, connection)]
+        self.load = []  # 워커별 담당 경기 수
+        self.games = {}  # match_id -> PongGame
+        self.placement = {}  # match_id -> worker index
+        self.match_ids = {}  # id(PongGame) -> match_id
+        self.counter = itertools.count(1)
+        self.loop = None
+        self.frames = None
+        self.dispatcher = None
+
+    def __len__(self):
+        return len(self.games)
+
+    def start(self):
+        if self.workers:
+            return
+        context = multiprocessing.get_context("spawn")
+        for _ in range(self.size):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=run_worker,
+                args=(child_conn, GAME_TICK_RATE, MAX_CATCH_UP_STEPS),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self.workers.append((process, parent_conn))
+            self.load.append(0)
+
+    def close(self):
+        self._unbind_loop()
+        for process, conn in self.workers:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+        self.workers = []
+        self.load = []
+        self.games.clear()
+        self.placement.clear()
+        self.match_ids.clear()
+
+    def ensure_running(self):
+        self.start()
+        loop = asyncio.get_running_loop()
+        if self.loop is loop and not self.dispatcher.done():
+            return
+        self._unbind_loop()
+        self.loop = loop
+        self.frames = asyncio.Queue()
+        for _, conn in self.workers:
+            loop.add_reader(conn.fileno(), self._on_readable, conn)
+        self.dispatcher = loop.create_task(self._dispatch())
+
+    def _unbind_loop(self):
+        if self.loop is None:
+            return
+        if not self.loop.is_closed():
+            for _, conn in self.workers:
+                self.loop.remove_reader(conn.fileno())
+        if self.dispatcher:
+            self.dispatcher.cancel()
+        self.loop = None
+
+    def _on_readable(self, conn):
+        try:
+            self.frames.put_nowait(conn.recv())
+        except EOFError:
+            self.loop.remove_reader(conn.fileno())
+            logger.error("game worker exited unexpectedly")
+
+    async def _dispatch(self):
+        """워커가 보낸 프레임을 순서대로 각 게임에 전달"""
+        while True:
+            frames = await self.frames.get()
+            for match_id, state, events in frames:
+                game = self.games.get(match_id)
+                if not game:
+                    continue
+                try:
+                    for scoring_player in events:
+                        await game.update_score_and_check_win(scoring_player)
+                    await game.send_callback(
+                        {
+                            "type": "state",
+                            "ball_pos": list(state[0:3]),
+                            "panel1": list(state[3:6]),
+                            "panel2": list(state[6:9]),
+                            "ball_rot": list(state[9:12]),
+                        }
+                    )
+                except Exception:
+                    logger.exception(f"failed to deliver frame of match {match_id}")
+
+    def _send(self, match_id, *message):
+        worker = self.placement.get(match_id)
+        if worker is not None:
+            self.workers[worker][1].send(message)
+
+    def add(self, game):
+        """가장 적은 경기를 담당하는 워커에 경기를 배치"""
+        if id(game) in self.match_ids:
+            return self.match_ids[id(game)]
+        self.start()
+        match_id = next(self.counter)
+        worker = self.load.index(min(self.load))
+        self.load[worker] += 1
+        self.games[match_id] = game
+        self.placement[match_id] = worker
+        self.match_ids[id(game)] = match_id
+        self._send(match_id, "add", match_id, list(game.key_state))
+        return match_id
+
+    def remove(self, game):
+        match_id = self.match_ids.pop(id(game), None)
+        if match_id is None:
+            return
+        self._send(match_id, "remove", match_id)
+        self.load[self.placement.pop(match_id)] -= 1
+        del self.games[match_id]
+
+    def set_paused(self, game, paused):
+        match_id = self.match_ids.get(id(game))
+        if match_id is not None:
+            self._send(match_id, "pause", match_id, paused)
+
+    def process_key_input(self, game, key_input):
+        game.process_key_input(key_input)
+        match_id = self.match_ids.get(id(game))
+        if match_id is not None:
+            self._send(match_id, "keys", match_id, list(game.key_state))
+
+
+worker_pool = GameWorkerPool()
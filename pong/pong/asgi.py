@@ -17,10 +17,14 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pong.settings.prod")
 django_asgi_app = get_asgi_application()
 
 from game.urls import websocket_urlpatterns
+from game.lifespan import lifespan, install_reactor_hooks
 
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
+        "lifespan": lifespan,
         "websocket": SessionMiddlewareStack(URLRouter(websocket_urlpatterns)),
     }
 )
+
+install_reactor_hooks()
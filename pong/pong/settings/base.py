@@ -42,3 +42,14 @@ ASGI_APPLICATION = "pong.asgi.application"
 
 TIME_ZONE = "Asia/Seoul"
 USE_TZ = False
+
+# 기본값은 프로세스 내부 channel layer, 여러 노드에서 경기를 shard로 나누는 경우
+# channels_redis를 설치하고 CHANNEL_REDIS_URL을 지정한다
+CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+if getenv("CHANNEL_REDIS_URL"):
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [getenv("CHANNEL_REDIS_URL")]},
+        }
+    }
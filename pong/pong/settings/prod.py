@@ -57,5 +57,15 @@ CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
         "LOCATION": "/app/pong/pong_cache",
-    }
+    },
+    # 게임 session data의 공유 저장소, 여러 노드가 공유하려면 CACHE_REDIS_URL을 지정한다
+    "sessions": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/app/pong/pong_cache/sessions",
+    },
 }
+if getenv("CACHE_REDIS_URL"):
+    CACHES["sessions"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": getenv("CACHE_REDIS_URL"),
+    }